@@ -102,6 +102,11 @@ class EvalConfig:
         default_factory=lambda: os.environ.get("EXCLUDE_PROFILE", "0") == "1"
     )
 
+    # Two-phase vector search: "binary" = binary-quantized prefilter index + halfvec rerank
+    vector_prefilter: str | None = field(
+        default_factory=lambda: os.environ.get("VECTOR_PREFILTER") or None
+    )
+
     # Extraction mode: "per_message" (default) or "window" (sliding window)
     extraction_mode: str = field(
         default_factory=lambda: os.environ.get("EXTRACTION_MODE", "per_message")
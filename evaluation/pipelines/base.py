@@ -56,9 +56,28 @@ def create_nm(cfg: EvalConfig) -> NeuroMemory:
         extraction_mode=cfg.extraction_mode,
         window_char_threshold=cfg.window_char_threshold,
         pool_size=20,
+        vector_prefilter=cfg.vector_prefilter,
+        # The pipelines bound concurrency and retry rate limits themselves
+        # (_retry_on_rate_limit); scheduler retries would multiply attempts.
+        llm_max_concurrency=0,
+        llm_max_retries=0,
     )
 
 
+async def log_vector_index_stats(cfg: EvalConfig) -> None:
+    """Log the size of each memories vector index (compare VECTOR_PREFILTER modes)."""
+    nm = create_nm(cfg)
+    await nm.init()
+    try:
+        for idx in await nm._db.vector_index_stats():
+            logger.info(
+                "Vector index %s: %.1f MB (%s)",
+                idx["name"], idx["bytes"] / 1024 / 1024, idx["definition"],
+            )
+    finally:
+        await nm.close()
+
+
 def create_judge_llm(cfg: EvalConfig) -> OpenAILLM:
     """Create LLM instance for judge evaluation."""
     return OpenAILLM(
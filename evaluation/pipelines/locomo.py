@@ -19,6 +19,7 @@ from evaluation.pipelines.base import (
     create_judge_llm,
     create_nm,
     load_checkpoint,
+    log_vector_index_stats,
     save_checkpoint,
     set_embedding_timestamps,
     set_timestamps,
@@ -33,7 +34,11 @@ _BASE_DELAY = 5.0  # seconds
 
 
 async def _retry_on_rate_limit(coro_fn, *args, **kwargs):
-    """Retry an async call with exponential backoff on rate-limit errors."""
+    """Retry an async call with exponential backoff on rate-limit errors.
+
+    The only retry loop for these calls: create_nm() disables the NeuroMemory
+    LLM scheduler's own retries.
+    """
     for attempt in range(_MAX_RETRIES):
         try:
             return await coro_fn(*args, **kwargs)
@@ -101,6 +106,7 @@ async def _ingest(cfg: EvalConfig, conversations: list[LoCoMoConversation]) -> N
     tasks = [asyncio.create_task(_ingest_one(c)) for c in conversations]
     await asyncio.gather(*tasks)
     logger.info("Ingest phase complete: %d conversations", len(conversations))
+    await log_vector_index_stats(cfg)
 
 
 async def _ingest_conversation(
@@ -233,17 +239,13 @@ async def _query(cfg: EvalConfig, conversations: list[LoCoMoConversation]) -> No
             t0 = time.time()
 
             decay_rate = cfg.decay_rate_days * 86400
-            # Recall from both speakers concurrently
-            recall_a, recall_b = await asyncio.gather(
-                _retry_on_rate_limit(
-                    nm.recall, user_a, qa.question,
-                    limit=cfg.recall_limit, decay_rate=decay_rate,
-                ),
-                _retry_on_rate_limit(
-                    nm.recall, user_b, qa.question,
-                    limit=cfg.recall_limit, decay_rate=decay_rate,
-                ),
+            # Recall for both speakers in one multi-user search
+            multi = await _retry_on_rate_limit(
+                nm.recall_multi, [user_a, user_b], qa.question,
+                limit=cfg.recall_limit, decay_rate=decay_rate,
             )
+            recall_a = multi["users"].get(user_a, {})
+            recall_b = multi["users"].get(user_b, {})
 
             memories_a = recall_a.get("merged", [])
             memories_b = recall_b.get("merged", [])
@@ -19,6 +19,7 @@ from evaluation.pipelines.base import (
     create_judge_llm,
     create_nm,
     load_checkpoint,
+    log_vector_index_stats,
     save_checkpoint,
     set_timestamps,
 )
@@ -32,7 +33,11 @@ _BASE_DELAY = 5.0  # seconds
 
 
 async def _retry_on_rate_limit(coro_fn, *args, **kwargs):
-    """Retry an async call with exponential backoff on rate-limit errors."""
+    """Retry an async call with exponential backoff on rate-limit errors.
+
+    The only retry loop for these calls: create_nm() disables the NeuroMemory
+    LLM scheduler's own retries.
+    """
     for attempt in range(_MAX_RETRIES):
         try:
             return await coro_fn(*args, **kwargs)
@@ -145,6 +150,7 @@ async def _ingest(cfg: EvalConfig, questions: list[LongMemEvalQuestion]) -> None
     tasks = [asyncio.create_task(_ingest_one(q, i)) for i, q in enumerate(questions)]
     await asyncio.gather(*tasks)
     logger.info("Ingest phase complete: %d questions", len(questions))
+    await log_vector_index_stats(cfg)
 
 
 # ---------------------------------------------------------------------------
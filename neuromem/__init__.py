@@ -2,7 +2,7 @@
 
 __version__ = "0.10.0"
 
-from neuromem._core import ExtractionStrategy, NeuroMemory
+from neuromem._core import ExtractionStrategy, NeuroMemory, RecallEvent
 from neuromem.db import Database
 from neuromem.models.graph import EdgeType, NodeType
 from neuromem.providers.embedding import EmbeddingProvider
@@ -15,6 +15,11 @@ try:
     from neuromem.providers.sentence_transformer import SentenceTransformerEmbedding
 except ImportError:
     SentenceTransformerEmbedding = None
+
+try:
+    from neuromem.services.rerank import NumpyReranker, Reranker, RerankWeights
+except ImportError:
+    NumpyReranker = Reranker = RerankWeights = None
 from neuromem.services.graph_memory import GraphMemoryService
 from neuromem.services.reflection import ReflectionService
 from neuromem.storage.base import ObjectStorage
@@ -23,6 +28,7 @@ from neuromem.storage.s3 import S3Storage
 __all__ = [
     "ExtractionStrategy",
     "NeuroMemory",
+    "RecallEvent",
     "Database",
     "EmbeddingProvider",
     "LLMProvider",
@@ -30,6 +36,9 @@ __all__ = [
     "OpenAIEmbedding",
     "OpenAILLM",
     "SentenceTransformerEmbedding",
+    "Reranker",
+    "NumpyReranker",
+    "RerankWeights",
     "ObjectStorage",
     "S3Storage",
     "NodeType",
@@ -4,15 +4,21 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import time
 from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Callable, Optional
 
-from neuromem.db import Database
+from neuromem.db import Database, mark_user_written, statement_deadline
+from neuromem.providers.batching import BatchingEmbedding, current_batch
 from neuromem.providers.embedding import EmbeddingProvider
 from neuromem.providers.llm import LLMProvider
+from neuromem.providers.scheduler import LLMScheduler, llm_priority
+from neuromem.services.pattern_matcher import compiled_matcher
+from neuromem.services.recall_trace import RecallTrace, current_trace, tracing
 from neuromem.storage.base import ObjectStorage
 
 logger = logging.getLogger(__name__)
@@ -21,11 +27,12 @@ logger = logging.getLogger(__name__)
 # -- Instrumented provider proxies (for on_llm_call / on_embedding_call) --
 
 class _InstrumentedLLM(LLMProvider):
-    """Proxy that fires on_llm_call callback after each LLM call."""
+    """Proxy that schedules LLM calls and fires on_llm_call callback after each one."""
 
-    def __init__(self, inner: LLMProvider, get_callback):
+    def __init__(self, inner: LLMProvider, get_callback, scheduler: LLMScheduler | None = None):
         self._inner = inner
         self._get_callback = get_callback
+        self._scheduler = scheduler
         # Forward model attribute if present
         if hasattr(inner, "model"):
             self.model = inner.model
@@ -33,14 +40,22 @@ class _InstrumentedLLM(LLMProvider):
     async def chat(self, messages, temperature=0.1, max_tokens=2048) -> str:
         t0 = time.monotonic()
         success = True
+        info: dict[str, Any] = {}
         try:
-            result = await self._inner.chat(messages, temperature, max_tokens)
+            if self._scheduler is None:
+                result = await self._inner.chat(messages, temperature, max_tokens)
+            else:
+                result = await self._scheduler.run(
+                    lambda: self._inner.chat(messages, temperature, max_tokens),
+                    messages, max_tokens, info,
+                )
             return result
         except Exception:
             success = False
             raise
         finally:
-            duration_ms = (time.monotonic() - t0) * 1000
+            # Time spent queued or backing off is reported as queue_ms, not duration
+            duration_ms = (time.monotonic() - t0) * 1000 - info.get("queue_ms", 0.0)
             cb = self._get_callback()
             if cb:
                 try:
@@ -50,12 +65,19 @@ class _InstrumentedLLM(LLMProvider):
                         "max_tokens": max_tokens,
                         "temperature": temperature,
                         "success": success,
+                        **info,
                     })
                     if asyncio.iscoroutine(_r):
                         await _r
                 except Exception as e:
                     logger.warning("on_llm_call callback error: %s", e)
 
+    async def aclose(self) -> None:
+        # Providers predating aclose() may not define it
+        close = getattr(self._inner, "aclose", None)
+        if close is not None:
+            await close()
+
 
 class _InstrumentedEmbedding(EmbeddingProvider):
     """Proxy that fires on_embedding_call callback after each embedding call."""
@@ -70,6 +92,12 @@ class _InstrumentedEmbedding(EmbeddingProvider):
     def dims(self) -> int:
         return self._inner.dims
 
+    async def aclose(self) -> None:
+        # Providers predating aclose() may not define it
+        close = getattr(self._inner, "aclose", None)
+        if close is not None:
+            await close()
+
     async def embed(self, text: str) -> list[float]:
         t0 = time.monotonic()
         success = True
@@ -114,6 +142,8 @@ class _InstrumentedEmbedding(EmbeddingProvider):
                         "duration_ms": round(duration_ms, 1),
                         "model": getattr(self._inner, "model", "unknown"),
                         "success": success,
+                        # Set when BatchingEmbedding coalesced embed() calls
+                        **(current_batch() or {}),
                     })
                     if asyncio.iscoroutine(_r):
                         await _r
@@ -157,6 +187,67 @@ class ExtractionStrategy:
     on_shutdown: bool = True
 
 
+@dataclass
+class RecallEvent:
+    """One stage of a streaming recall, yielded by NeuroMemory.recall_stream().
+
+    Attributes:
+        type: Stage name:
+            - "vector": extracted memories (list[dict], as recall()["vector_results"])
+            - "linked": Zettelkasten-linked memories (list[dict], source="linked")
+            - "graph": graph triples (list[dict], as recall()["graph_results"])
+            - "conversations": raw conversation fragments (list[dict]),
+              only when include_conversations=True
+            - "profile": user profile (dict, as profile_view())
+            - "final": the complete recall() result dict
+        data: Stage payload. A failed stage yields an empty payload.
+    """
+
+    type: str
+    data: Any
+
+
+class _StageBudget:
+    """Time budget of one recall: an overall deadline plus optional per-stage caps.
+
+    ``run()`` bounds a stage by the smaller of its cap and the time left,
+    cancels it on expiry (with a matching server-side statement_timeout)
+    and records the stage in ``degraded``. Under explain mode each stage's
+    wall-clock time is recorded on the current trace.
+    """
+
+    def __init__(self, deadline_ms: float | None, stage_timeouts_ms: dict[str, float] | None):
+        self._deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms is not None else None
+        self._stage_timeouts = stage_timeouts_ms or {}
+        self.degraded: list[str] = []
+
+    def timeout(self, stage: str) -> float | None:
+        budgets = []
+        if self._deadline is not None:
+            budgets.append(self._deadline - time.monotonic())
+        if stage in self._stage_timeouts:
+            budgets.append(self._stage_timeouts[stage] / 1000)
+        return max(0.0, min(budgets)) if budgets else None
+
+    async def run(self, stage: str, coro):
+        trace = current_trace()
+        if trace is None:
+            return await self._run(stage, coro)
+        with trace.stage(stage):
+            return await self._run(stage, coro)
+
+    async def _run(self, stage: str, coro):
+        timeout = self.timeout(stage)
+        if timeout is None:
+            return await coro
+        with statement_deadline(timeout):
+            try:
+                return await asyncio.wait_for(coro, timeout)
+            except TimeoutError:
+                self.degraded.append(stage)
+                raise
+
+
 from neuromem.facades import FilesFacade, GraphFacade, KVFacade  # noqa: E402
 
 
@@ -252,6 +343,7 @@ class ConversationsFacade:
         try:
             embedding_vector = await self._embedding.embed(msg.content)
             async with self._db.session() as session:
+                mark_user_written(session, msg.user_id)
                 await session.execute(
                     update(Conversation)
                     .where(Conversation.id == msg.id)
@@ -446,6 +538,28 @@ class NeuroMemory:
         extraction_mode: str = "per_message",
         window_char_threshold: int = 500,
         encryption=None,
+        recall_cache_size: int = 0,
+        recall_cache_ttl: float = 60.0,
+        access_flush_interval: float = 5.0,
+        access_buffer_size: int = 1000,
+        partitions: int = 0,
+        explain_plan_sample_rate: float = 0.0,
+        reranker=None,
+        vector_prefilter: str | None = None,
+        link_hops: int = 1,
+        link_fanout: int = 3,
+        graph_spread_hops: int = 0,
+        graph_spread_decay: float = 0.5,
+        graph_spread_fanout: int = 5,
+        graph_spread_nodes: int = 20,
+        embedding_batch_size: int = 32,
+        embedding_batch_wait_ms: float = 2.0,
+        embedding_max_in_flight: int = 4,
+        persistent_embedding_cache: int = 0,
+        llm_requests_per_minute: float = 0,
+        llm_tokens_per_minute: float = 0,
+        llm_max_concurrency: int = 8,
+        llm_max_retries: int = 3,
     ):
         """
         Args:
@@ -461,25 +575,132 @@ class NeuroMemory:
                 episodes_extracted, triples_extracted, messages_processed.
                 Can be sync or async.
             on_llm_call: Optional callback invoked after each internal LLM call.
-                Receives a dict with keys: duration_ms, model, max_tokens, temperature, success.
-                Can be sync or async.
+                Receives a dict with keys: duration_ms, model, max_tokens, temperature, success,
+                priority, queue_ms (time waiting for the scheduler, including retry
+                backoff) and retries. Can be sync or async.
             on_embedding_call: Optional callback invoked after each internal embedding call.
-                Receives a dict with keys: text_count, duration_ms, model, success.
-                Can be sync or async.
+                Receives a dict with keys: text_count, duration_ms, model, success
+                (plus coalesced, queue_ms for coalesced batches, see
+                ``embedding_batch_size``). Can be sync or async.
+            recall_cache_size: Max number of recall() results cached in-process
+                (0 = disabled, default). Entries are keyed on user, normalized
+                query and filters, invalidated by any committed write for the
+                user, and concurrent identical recalls share one computation.
+            recall_cache_ttl: Seconds a cached recall result stays valid even
+                without writes (recency scores drift with time). 0 = no TTL.
+            access_flush_interval: Seconds between batched flushes of recall
+                access counts (access_count / last_accessed_at). Recall itself
+                never writes; increments are buffered in-process and also
+                flushed on close(). 0 = flush only on overflow and close.
+            access_buffer_size: Distinct memories buffered before an early flush.
+            partitions: Hash-partition ``memories`` and ``conversations`` by
+                user_id into this many partitions (0 = regular tables, default).
+                init() migrates existing regular tables in place; each
+                partition gets its own HNSW/BM25 index. The
+                ``documents.embedding_id`` foreign key to ``memories`` is
+                dropped (it cannot reference the partitioned primary key).
+            explain_plan_sample_rate: Fraction (0-1) of ``recall(explain=True)``
+                calls that also capture ``EXPLAIN (ANALYZE, BUFFERS)`` plans of
+                their search SQL. Capturing executes each search a second
+                time, so keep it low in production. 0 = never (default).
+            reranker: Optional Reranker (e.g. ``NumpyReranker``, requires
+                numpy). When set, recall (including recall_many() and
+                recall_multi()) fetches unscored candidate sets and scores
+                them in Python; the default weights reproduce the SQL
+                ranking. None (default) scores in SQL.
+            vector_prefilter: ``"binary"`` enables two-phase memory search:
+                init() builds a binary-quantized HNSW index instead of the
+                halfvec one, recall scans it for a coarse candidate set and
+                reranks it by exact cosine distance. Cuts vector index memory
+                and build time at some recall cost. Requires pgvector >= 0.7.
+            link_hops: Zettelkasten expansion depth: recall adds memories
+                reachable within this many memory_links hops from the vector
+                hits (0 = disabled). The walk runs inside the vector search
+                statement.
+            link_fanout: Links followed per memory and hop (highest weight
+                first); at most ``link_fanout * link_hops`` linked memories
+                are added.
+            graph_spread_hops: Spreading-activation depth for graph recall
+                (0 = disabled). Activation starts at 1.0 on the entities
+                matched in the query and flows over active graph_edges,
+                multiplied by ``graph_spread_decay`` and the edge confidence
+                per hop. Facts of the activated entities join the graph
+                results, scored by their activation.
+            graph_spread_decay: Activation kept per hop (0-1).
+            graph_spread_fanout: Edges followed per entity and hop (most
+                confident first); also caps the facts fetched per activated
+                entity.
+            graph_spread_nodes: Activated entities kept (strongest first).
+            embedding_batch_size: Concurrent ``embed()`` calls (from ingest,
+                recall, trait and conflict checks) are coalesced into one
+                ``embed_batch()`` request of up to this many texts. 1 =
+                one request per call. ``on_embedding_call`` then also
+                receives ``coalesced`` (calls served) and ``queue_ms``
+                (longest wait before the request was sent).
+            embedding_batch_wait_ms: How long a queued call waits for others
+                to join its batch.
+            embedding_max_in_flight: Concurrent requests to the embedding
+                provider (0 = unlimited).
+            persistent_embedding_cache: Max entries of the shared
+                ``embedding_cache`` table (0 = disabled). When enabled every
+                embedding request is first looked up by (model, dims,
+                sha256 of the text); only misses reach the provider, so
+                identical content is embedded once across restarts and
+                workers. Least recently used entries are evicted. The
+                embedding provider must expose its model name as ``model``
+                (the built-in providers do); ValueError otherwise.
+            llm_requests_per_minute: Request budget shared by all internal LLM
+                calls (0 = unlimited). Calls are queued by priority:
+                extraction first, then reflect()/digest(), then maintenance
+                (background digests, contradiction resolution).
+            llm_tokens_per_minute: Token budget (prompt estimated at ~4
+                characters per token, plus max_tokens; unused completion
+                tokens are refunded). 0 = unlimited.
+            llm_max_concurrency: Concurrent LLM calls (0 = unlimited).
+                Defaults to 8; internal LLM calls used to be unbounded.
+            llm_max_retries: Retries of calls failing with 429, 5xx or a
+                timeout, with jittered exponential backoff. A 429 pauses the
+                whole queue. See ``llm_scheduler_stats()``. Defaults to 3;
+                internal LLM calls used not to be retried, so callers that
+                wrap ingest()/digest() in their own retry loop should pass 0
+                (or drop their loop) to avoid multiplying attempts.
         """
         # Set embedding dimensions before any model import
         import neuromem.models as _models
         _models._embedding_dims = embedding.dims
 
-        self._db = Database(database_url, pool_size=pool_size, echo=echo)
+        self._db = Database(
+            database_url, pool_size=pool_size, echo=echo, partitions=partitions,
+            vector_prefilter=vector_prefilter,
+        )
         self._encryption = encryption
         if encryption:
             self._db.setup_encryption(encryption)
         self._on_llm_call = on_llm_call
         self._on_embedding_call = on_embedding_call
         # Wrap providers with instrumented proxies (callbacks read dynamically)
-        self._embedding = _InstrumentedEmbedding(embedding, lambda: self._on_embedding_call)
-        self._llm = _InstrumentedLLM(llm, lambda: self._on_llm_call)
+        provider: EmbeddingProvider = _InstrumentedEmbedding(embedding, lambda: self._on_embedding_call)
+        self._persistent_embedding_cache = None
+        if persistent_embedding_cache > 0:
+            from neuromem.services.embedding_cache import PersistentEmbeddingCache
+            # Namespace by the real model name, not the instrumentation proxy
+            provider = self._persistent_embedding_cache = PersistentEmbeddingCache(
+                provider, self._db, max_entries=persistent_embedding_cache,
+                model=getattr(embedding, "model", None),
+            )
+        self._embedding = BatchingEmbedding(
+            provider,
+            max_batch_size=embedding_batch_size,
+            max_wait_ms=embedding_batch_wait_ms,
+            max_in_flight=embedding_max_in_flight,
+        )
+        self._llm_scheduler = LLMScheduler(
+            requests_per_minute=llm_requests_per_minute,
+            tokens_per_minute=llm_tokens_per_minute,
+            max_concurrency=llm_max_concurrency,
+            max_retries=llm_max_retries,
+        )
+        self._llm = _InstrumentedLLM(llm, lambda: self._on_llm_call, self._llm_scheduler)
         self._storage = storage
         self._extraction = extraction
         self._auto_extract = auto_extract
@@ -503,6 +724,26 @@ class NeuroMemory:
         self._embedding_cache: OrderedDict[str, list[float]] = OrderedDict()
         self._embedding_cache_max_size = 100  # True LRU
 
+        # Deferred access tracking: recall buffers access counts, flushed in batches
+        from neuromem.services.access_tracker import AccessTracker
+        self._access_tracker = AccessTracker(
+            self._db, flush_interval=access_flush_interval, max_buffer_size=access_buffer_size,
+        )
+
+        # Recall result cache (opt-in), invalidated via per-user write generations
+        self._recall_cache = None
+        if recall_cache_size > 0:
+            from neuromem.services.recall_cache import RecallCache
+            self._recall_cache = RecallCache(max_size=recall_cache_size, ttl=recall_cache_ttl)
+        self._explain_plan_sample_rate = explain_plan_sample_rate
+        self._reranker = reranker
+        self._link_hops = link_hops
+        self._link_fanout = link_fanout
+        self._graph_spread_hops = graph_spread_hops
+        self._graph_spread_decay = graph_spread_decay
+        self._graph_spread_fanout = graph_spread_fanout
+        self._graph_spread_nodes = graph_spread_nodes
+
         # Context inference service (lazy prototype initialization)
         from neuromem.services.context import ContextService
         self._context_service = ContextService(self._embedding)
@@ -929,6 +1170,16 @@ Return JSON only:
             await asyncio.gather(*all_tasks, return_exceptions=True)
         self._user_tasks.clear()
 
+        # Flush coalesced embeddings, then release provider connection pools
+        for provider in (self._embedding, self._llm):
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning("Failed to close provider %s: %s", type(provider).__name__, e)
+
+        # Write out buffered access counts
+        await self._access_tracker.close()
+
         await self._db.close()
 
     async def __aenter__(self) -> "NeuroMemory":
@@ -969,11 +1220,48 @@ Return JSON only:
         logger.debug(f"Cached embedding for text length {len(text)}")
         return embedding
 
+    async def _cached_embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Cache-aware embedding of several texts with one embed_batch() call for the misses."""
+        missing = [t for t in dict.fromkeys(texts) if t not in self._embedding_cache]
+        if missing:
+            for t, embedding in zip(missing, await self._embedding.embed_batch(missing)):
+                self._embedding_cache[t] = embedding
+        embeddings = []
+        for t in texts:
+            self._embedding_cache.move_to_end(t)
+            embeddings.append(self._embedding_cache[t])
+        while len(self._embedding_cache) > self._embedding_cache_max_size:
+            self._embedding_cache.popitem(last=False)
+        return embeddings
+
     def clear_embedding_cache(self) -> None:
         """Clear the embedding cache. Useful for testing or memory management."""
         self._embedding_cache.clear()
         logger.info("Embedding cache cleared")
 
+    def embedding_cache_stats(self) -> dict | None:
+        """Persistent embedding cache counters (hits/misses/writes/evictions/errors),
+        or None if disabled."""
+        if self._persistent_embedding_cache is None:
+            return None
+        return self._persistent_embedding_cache.stats()
+
+    def llm_scheduler_stats(self) -> dict:
+        """LLM scheduler metrics: queue depth, running calls, wait times per
+        priority, retries and rate-limit hits."""
+        return self._llm_scheduler.stats()
+
+    def recall_cache_stats(self) -> dict | None:
+        """Recall cache counters (hits/misses/coalesced/evictions/size), or None if disabled."""
+        if self._recall_cache is None:
+            return None
+        return self._recall_cache.stats()
+
+    def clear_recall_cache(self, user_id: str | None = None) -> None:
+        """Drop cached recall results for one user, or all users when user_id is None."""
+        if self._recall_cache is not None:
+            self._recall_cache.invalidate(user_id)
+
     def _decrypt_content(self, content: str) -> str:
         """Decrypt content if encryption is enabled and value is encrypted."""
         if not self._encryption:
@@ -1263,6 +1551,10 @@ Return JSON only:
         include_conversations: bool = False,
         as_of: datetime | None = None,
         current_emotion: dict | None = None,
+        deadline_ms: float | None = None,
+        stage_timeouts_ms: dict[str, float] | None = None,
+        explain: bool = False,
+        rerank_weights=None,
     ) -> dict:
         """Hybrid recall: memories + graph, merged and deduplicated.
 
@@ -1284,6 +1576,21 @@ Return JSON only:
             as_of: Time-travel query — recall memories valid at this point
                 in time. When None (default), only returns currently valid
                 memories. Must be a timezone-aware datetime.
+            deadline_ms: Overall time budget in milliseconds. Stages still
+                running when it expires are cancelled (their SQL is bounded
+                by statement_timeout) and listed in ``degraded``; the result
+                contains whatever finished. None (default) waits for all.
+            stage_timeouts_ms: Optional per-stage caps in milliseconds, keyed
+                by stage name ("embedding", "vector", "profile",
+                "conversations", "graph"). Linked memories are fetched by the
+                vector stage.
+            explain: If True, bypass the recall cache and add an ``explain``
+                dict with per-stage wall-clock timings, vector/BM25 candidate
+                counts of each search, and (sampled by
+                ``explain_plan_sample_rate``) their query plans.
+            rerank_weights: Optional RerankWeights profile for this call. The
+                candidates are then scored in Python (with the configured
+                reranker, or NumpyReranker) using these weights.
 
         Returns:
             {
@@ -1291,30 +1598,414 @@ Return JSON only:
                 "conversation_results": [...], # raw conversations (only if include_conversations=True)
                 "graph_results": [...],        # graph entities
                 "merged": [...],               # deduplicated merge
+                "degraded": [...],             # stages skipped by the deadline
+                "explain": {...},              # only if explain=True
             }
         """
+        if explain:
+            trace = RecallTrace(capture_plans=random.random() < self._explain_plan_sample_rate)
+            with tracing(trace):
+                result = await self._recall_uncached(
+                    user_id, query, limit, decay_rate, memory_type,
+                    created_after, created_before, event_after, event_before,
+                    include_conversations, as_of, current_emotion,
+                    deadline_ms, stage_timeouts_ms, rerank_weights,
+                )
+            result["explain"] = trace.to_dict()
+            return result
+
+        if self._recall_cache is None:
+            return await self._recall_uncached(
+                user_id, query, limit, decay_rate, memory_type,
+                created_after, created_before, event_after, event_before,
+                include_conversations, as_of, current_emotion,
+                deadline_ms, stage_timeouts_ms, rerank_weights,
+            )
+
+        from neuromem.services.recall_cache import normalize_query
+
+        key = (
+            normalize_query(query), limit, decay_rate, memory_type,
+            created_after, created_before, event_after, event_before,
+            include_conversations, as_of, self._graph_enabled,
+            tuple(sorted(current_emotion.items())) if current_emotion else None,
+            deadline_ms,
+            tuple(sorted(stage_timeouts_ms.items())) if stage_timeouts_ms else None,
+            repr(rerank_weights) if rerank_weights is not None else None,
+        )
+        return await self._recall_cache.get_or_compute(
+            user_id, key, self._db.write_generation(user_id),
+            lambda: self._recall_uncached(
+                user_id, query, limit, decay_rate, memory_type,
+                created_after, created_before, event_after, event_before,
+                include_conversations, as_of, current_emotion,
+                deadline_ms, stage_timeouts_ms, rerank_weights,
+            ),
+        )
+
+    async def recall_stream(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        decay_rate: float | None = None,
+        memory_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        event_after: datetime | None = None,
+        event_before: datetime | None = None,
+        include_conversations: bool = False,
+        as_of: datetime | None = None,
+        current_emotion: dict | None = None,
+    ):
+        """Streaming recall: yield each source as soon as it is ready.
+
+        Runs the same fetches as recall() concurrently and yields a
+        RecallEvent per stage: "vector" first, then "graph", "linked",
+        "conversations" and "profile" in completion order (the linked-memory
+        expansion starts as soon as the vector hits are known), and finally
+        "final" carrying the same dict recall() would return. Prompt assembly
+        can start on the vector hits while slower sources are in flight.
+        Results bypass the recall cache. Closing the generator early cancels
+        the fetches still running.
+
+        Args: see recall().
+
+        Yields:
+            RecallEvent
+        """
+        (
+            query_embedding, _event_after, _event_before, _decay,
+            inferred_context, context_confidence,
+        ) = await self._prepare_recall(query, decay_rate, event_after, event_before)
+
+        vector_task = asyncio.create_task(self._fetch_vector_memories(
+            user_id, query, limit, query_embedding, _event_after, _event_before, _decay,
+            as_of=as_of,
+            memory_type=memory_type,
+            created_after=created_after,
+            created_before=created_before,
+            current_emotion=current_emotion,
+            query_context=inferred_context,
+            context_confidence=context_confidence,
+        ))
+        stages: dict[asyncio.Task, str] = {
+            asyncio.create_task(self.profile_view(user_id)): "profile",
+        }
+        if include_conversations:
+            stages[asyncio.create_task(
+                self._search_conversations(user_id, query, limit, query_embedding=query_embedding)
+            )] = "conversations"
+        if self._graph_enabled:
+            stages[asyncio.create_task(
+                self._fetch_graph_memories(user_id, query, limit, as_of=as_of)
+            )] = "graph"
+        _empty = {
+            "profile": {"facts": {}, "traits": [], "recent_mood": None},
+            "conversations": [],
+            "graph": [],
+            "linked": [],
+        }
+        collected: dict[str, Any] = dict(_empty)
+        pending = set(stages)
+
+        try:
+            try:
+                vector_results = await vector_task
+            except Exception as e:
+                logger.warning("recall_stream vector fetch failed: %s", e)
+                vector_results = []
+            yield RecallEvent("vector", vector_results)
+
+            linked_task = asyncio.create_task(self._fetch_linked_memories(user_id, vector_results))
+            stages[linked_task] = "linked"
+            pending.add(linked_task)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = stages[task]
+                    if task.exception() is not None:
+                        logger.warning("recall_stream %s fetch failed: %s", stage, task.exception())
+                    else:
+                        collected[stage] = task.result()
+                    yield RecallEvent(stage, collected[stage])
+
+            yield RecallEvent("final", await self._assemble_recall(
+                user_id, limit, vector_results, collected["profile"],
+                collected["conversations"], collected["graph"],
+                include_conversations, inferred_context, context_confidence,
+                linked_results=collected["linked"],
+            ))
+        finally:
+            for task in [vector_task, *stages]:
+                if not task.done():
+                    task.cancel()
+
+    async def recall_many(
+        self,
+        user_id: str,
+        queries: list[str],
+        limit: int = 20,
+        decay_rate: float | None = None,
+        memory_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        include_conversations: bool = False,
+        as_of: datetime | None = None,
+        current_emotion: dict | None = None,
+    ) -> list[dict]:
+        """Recall for several queries of one user in a single round trip.
+
+        All query embeddings are computed with one embed_batch() call, the
+        vector + BM25 search for every query runs as one SQL statement and
+        profile_view() is loaded once and shared. Queries whose text implies
+        an event-time range (e.g. "上周") are searched individually like
+        recall() does (event-range filter, and the episodic/fact split unless
+        memory_type is given). Results bypass the recall cache.
+
+        Args:
+            queries: Natural language queries.
+            Other arguments: see recall().
+
+        Returns:
+            One recall()-shaped dict per query, in input order.
+        """
         from neuromem.services.search import DEFAULT_DECAY_RATE
         from neuromem.services.temporal import TemporalExtractor
 
-        # Compute query embedding once, reuse for all parallel searches
-        query_embedding = await self._cached_embed(query)
-
-        # Auto-extract time range from query, then let explicit args override
-        temporal = TemporalExtractor()
-        auto_after, auto_before = temporal.extract_time_range(query)
-        _event_after = event_after if event_after is not None else auto_after
-        _event_before = event_before if event_before is not None else auto_before
+        if not queries:
+            return []
         _decay = decay_rate or DEFAULT_DECAY_RATE
+        embeddings = await self._cached_embed_many(queries)
 
-        # Infer context from query (zero extra latency - reuses query_embedding)
         await self._context_service.ensure_prototypes()
-        inferred_context, context_confidence = self._context_service.infer_context(
-            query_embedding, query_text=query
+        temporal = TemporalExtractor()
+        contexts: list[tuple[str, float]] = []
+        time_ranges: list[tuple] = []
+        for query, embedding in zip(queries, embeddings):
+            contexts.append(self._context_service.infer_context(embedding, query_text=query))
+            time_ranges.append(temporal.extract_time_range(query))
+
+        # scored_search_many() takes no event range
+        batched = [i for i, (after, before) in enumerate(time_ranges) if after is None and before is None]
+
+        async def _batched_vector_search() -> list[list[dict]]:
+            if not batched:
+                return []
+            async with self._db.session() as session:
+                svc = self._search_service(session)
+                return await svc.scored_search_many(
+                    user_id, [queries[i] for i in batched], limit,
+                    memory_type=memory_type,
+                    decay_rate=_decay,
+                    query_embeddings=[embeddings[i] for i in batched],
+                    as_of=as_of,
+                    created_after=created_after,
+                    created_before=created_before,
+                    current_emotion=current_emotion,
+                    query_contexts=[contexts[i] for i in batched],
+                )
+
+        coros: list = [_batched_vector_search(), self.profile_view(user_id)]
+        temporal_idx: dict[int, int] = {}
+        conv_idx: dict[int, int] = {}
+        graph_idx: dict[int, int] = {}
+        batched_set = set(batched)
+        for i, query in enumerate(queries):
+            if i not in batched_set:
+                temporal_idx[i] = len(coros)
+                coros.append(self._fetch_vector_memories(
+                    user_id, query, limit, embeddings[i], time_ranges[i][0], time_ranges[i][1], _decay,
+                    as_of=as_of,
+                    memory_type=memory_type,
+                    created_after=created_after,
+                    created_before=created_before,
+                    current_emotion=current_emotion,
+                    query_context=contexts[i][0],
+                    context_confidence=contexts[i][1],
+                ))
+            if include_conversations:
+                conv_idx[i] = len(coros)
+                coros.append(self._search_conversations(user_id, query, limit, query_embedding=embeddings[i]))
+            if self._graph_enabled:
+                graph_idx[i] = len(coros)
+                coros.append(self._fetch_graph_memories(user_id, query, limit, as_of=as_of))
+
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for i, r in enumerate(results):
+            if isinstance(r, Exception):
+                logger.warning("recall_many fetch[%d] failed: %s", i, r)
+
+        def _ok(idx: int | None, default):
+            if idx is None or isinstance(results[idx], Exception):
+                return default
+            return results[idx]
+
+        batched_hits = dict(zip(batched, _ok(0, [[] for _ in batched])))
+        user_profile = _ok(1, {"facts": {}, "traits": [], "recent_mood": None})
+
+        return [
+            await self._assemble_recall(
+                user_id, limit,
+                batched_hits.get(i, []) if i in batched_set else _ok(temporal_idx[i], []),
+                user_profile,
+                _ok(conv_idx.get(i), []),
+                _ok(graph_idx.get(i), []),
+                include_conversations, contexts[i][0], contexts[i][1],
+            )
+            for i in range(len(queries))
+        ]
+
+    async def recall_multi(
+        self,
+        user_ids: list[str],
+        query: str,
+        limit: int = 20,
+        decay_rate: float | None = None,
+        memory_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        event_after: datetime | None = None,
+        event_before: datetime | None = None,
+        include_conversations: bool = False,
+        as_of: datetime | None = None,
+        current_emotion: dict | None = None,
+    ) -> dict:
+        """Recall one query for several users (e.g. group chat participants).
+
+        The query embedding and context inference are computed once, memories
+        of all users are searched by a single statement with per-user
+        candidate pools, ranking and Zettelkasten link expansion, and
+        profiles, graph facts (and conversations, if requested) are loaded in
+        one batch each, so neither the connections nor the round trips used
+        grow with the number of users (except for the opt-in graph spreading
+        activation, which runs per user). Results bypass the recall cache.
+
+        Args:
+            user_ids: Users to recall for (duplicates are ignored).
+            query: Natural language query.
+            Other arguments: see recall().
+
+        Returns:
+            {
+                "users": {user_id: recall()-shaped dict, ...},
+                "merged": [...],  # every user's merged list in user_ids
+                                  # order, deduplicated by content, each entry
+                                  # tagged with "user_id"
+            }
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {"users": {}, "merged": []}
+
+        (
+            query_embedding, _event_after, _event_before, _decay,
+            inferred_context, context_confidence,
+        ) = await self._prepare_recall(query, decay_rate, event_after, event_before)
+
+        async def _empty() -> dict:
+            return {}
+
+        results = await asyncio.gather(
+            self._fetch_vector_memories_multi(
+                user_ids, query, limit, query_embedding, _event_after, _event_before, _decay,
+                as_of=as_of,
+                memory_type=memory_type,
+                created_after=created_after,
+                created_before=created_before,
+                current_emotion=current_emotion,
+                query_context=inferred_context,
+                context_confidence=context_confidence,
+                link_hops=self._link_hops,
+            ),
+            self._profile_views(user_ids),
+            (
+                self._search_conversations_multi(user_ids, query, limit, query_embedding=query_embedding)
+                if include_conversations else _empty()
+            ),
+            (
+                self._fetch_graph_memories_multi(user_ids, query, limit, as_of=as_of)
+                if self._graph_enabled else _empty()
+            ),
+            return_exceptions=True,
+        )
+        for i, r in enumerate(results):
+            if isinstance(r, Exception):
+                logger.warning("recall_multi fetch[%d] failed: %s", i, r)
+        vector_by_user, profiles, conversations_by_user, graph_by_user = (
+            {} if isinstance(r, Exception) else r for r in results
         )
 
-        # Parallel fetch: memories + profile (+ conversations + graph if enabled)
-        coros = [
-            self._fetch_vector_memories(
+        users: dict[str, dict] = {}
+        for uid in user_ids:
+            # Zettelkasten expansion was walked by the vector statement itself
+            rows = vector_by_user.get(uid, [])
+            users[uid] = await self._assemble_recall(
+                uid, limit,
+                [r for r in rows if r.get("source") != "linked"],
+                profiles.get(uid, {"facts": {}, "traits": [], "recent_mood": None}),
+                conversations_by_user.get(uid, []),
+                graph_by_user.get(uid, []),
+                include_conversations, inferred_context, context_confidence,
+                linked_results=[r for r in rows if r.get("source") == "linked"],
+            )
+
+        seen_contents: set[str] = set()
+        merged: list[dict] = []
+        for uid in user_ids:
+            for m in users[uid]["merged"]:
+                content = m.get("content", "")
+                if content and content not in seen_contents:
+                    seen_contents.add(content)
+                    merged.append({**m, "user_id": uid})
+
+        return {"users": users, "merged": merged}
+
+    async def _recall_uncached(
+        self,
+        user_id: str,
+        query: str,
+        limit: int,
+        decay_rate: float | None,
+        memory_type: str | None,
+        created_after: datetime | None,
+        created_before: datetime | None,
+        event_after: datetime | None,
+        event_before: datetime | None,
+        include_conversations: bool,
+        as_of: datetime | None,
+        current_emotion: dict | None,
+        deadline_ms: float | None = None,
+        stage_timeouts_ms: dict[str, float] | None = None,
+        rerank_weights=None,
+    ) -> dict:
+        """recall() implementation without the result cache."""
+        budget = _StageBudget(deadline_ms, stage_timeouts_ms)
+        try:
+            (
+                query_embedding, _event_after, _event_before, _decay,
+                inferred_context, context_confidence,
+            ) = await budget.run(
+                "embedding", self._prepare_recall(query, decay_rate, event_after, event_before),
+            )
+        except TimeoutError:
+            # Nothing can be searched without the query vector
+            skipped = ["vector", "profile"]
+            if include_conversations:
+                skipped.append("conversations")
+            if self._graph_enabled:
+                skipped.append("graph")
+            logger.warning("recall deadline expired during embedding; skipped %s", skipped)
+            return await self._assemble_recall(
+                user_id, limit, [], {"facts": {}, "traits": [], "recent_mood": None}, [], [],
+                include_conversations, None, 0.0,
+                linked_results=[], degraded=budget.degraded + skipped,
+            )
+
+        async def _vector_then_linked() -> tuple[list[dict], list[dict]]:
+            # Zettelkasten expansion is walked by the vector statement itself
+            rows = await budget.run("vector", self._fetch_vector_memories(
                 user_id, query, limit, query_embedding, _event_after, _event_before, _decay,
                 as_of=as_of,
                 memory_type=memory_type,
@@ -1323,43 +2014,119 @@ Return JSON only:
                 current_emotion=current_emotion,
                 query_context=inferred_context,
                 context_confidence=context_confidence,
-            ),
-            self.profile_view(user_id),
+                rerank_weights=rerank_weights,
+                link_hops=self._link_hops,
+            ))
+            vector_results = [r for r in rows if r.get("source") != "linked"]
+            linked = [r for r in rows if r.get("source") == "linked"]
+            return vector_results, linked
+
+        # Parallel fetch: memories + profile (+ conversations + graph if enabled)
+        stages = ["vector", "profile"]
+        coros = [
+            _vector_then_linked(),
+            budget.run("profile", self.profile_view(user_id)),
         ]
-        conv_idx: int | None = None
-        graph_idx: int | None = None
         if include_conversations:
-            conv_idx = len(coros)
-            coros.append(self._search_conversations(user_id, query, limit, query_embedding=query_embedding))
+            stages.append("conversations")
+            coros.append(budget.run("conversations", self._search_conversations(
+                user_id, query, limit, query_embedding=query_embedding,
+            )))
         if self._graph_enabled:
-            graph_idx = len(coros)
-            coros.append(self._fetch_graph_memories(user_id, query, limit, as_of=as_of))
+            stages.append("graph")
+            coros.append(budget.run("graph", self._fetch_graph_memories(user_id, query, limit, as_of=as_of)))
 
         results = await asyncio.gather(*coros, return_exceptions=True)
+        fetched: dict[str, Any] = {}
+        for stage, r in zip(stages, results):
+            if isinstance(r, TimeoutError):
+                logger.warning("recall %s stage exceeded its deadline, skipped", stage)
+            elif isinstance(r, Exception):
+                logger.warning("recall %s fetch failed: %s", stage, r)
+            else:
+                fetched[stage] = r
+
+        vector_results, linked_results = fetched.get("vector", ([], []))
+        trace = current_trace()
+        with trace.stage("merge") if trace is not None else nullcontext():
+            return await self._assemble_recall(
+                user_id, limit, vector_results,
+                fetched.get("profile", {"facts": {}, "traits": [], "recent_mood": None}),
+                fetched.get("conversations", []),
+                fetched.get("graph", []),
+                include_conversations, inferred_context, context_confidence,
+                linked_results=linked_results, degraded=budget.degraded,
+            )
+
+    async def _prepare_recall(
+        self,
+        query: str,
+        decay_rate: float | None,
+        event_after: datetime | None,
+        event_before: datetime | None,
+    ) -> tuple:
+        """Per-query recall inputs shared by the recall variants.
 
-        vector_results: list[dict] = results[0] if not isinstance(results[0], Exception) else []
-        user_profile: dict = results[1] if not isinstance(results[1], Exception) else {"facts": {}, "traits": [], "recent_mood": None}
-        conversation_results: list[dict] = (
-            results[conv_idx] if conv_idx is not None and not isinstance(results[conv_idx], Exception) else []
+        Returns:
+            (query_embedding, event_after, event_before, decay_rate,
+             inferred_context, context_confidence)
+        """
+        from neuromem.services.search import DEFAULT_DECAY_RATE
+        from neuromem.services.temporal import TemporalExtractor
+
+        # Compute query embedding once, reuse for all parallel searches
+        query_embedding = await self._cached_embed(query)
+
+        # Auto-extract time range from query, then let explicit args override
+        temporal = TemporalExtractor()
+        auto_after, auto_before = temporal.extract_time_range(query)
+        _event_after = event_after if event_after is not None else auto_after
+        _event_before = event_before if event_before is not None else auto_before
+        _decay = decay_rate or DEFAULT_DECAY_RATE
+
+        # Infer context from query (zero extra latency - reuses query_embedding)
+        trace = current_trace()
+        with trace.stage("context_inference") if trace is not None else nullcontext():
+            await self._context_service.ensure_prototypes()
+            inferred_context, context_confidence = self._context_service.infer_context(
+                query_embedding, query_text=query
+            )
+        return (
+            query_embedding, _event_after, _event_before, _decay,
+            inferred_context, context_confidence,
         )
-        graph_results: list[dict] = []
-        if self._graph_enabled and graph_idx is not None:
-            raw = results[graph_idx]
-            if isinstance(raw, Exception):
-                logger.warning(f"Graph search failed: {raw}")
-            else:
-                graph_results = raw
 
-        for i, r in enumerate(results):
-            if isinstance(r, Exception):
-                logger.warning("recall fetch[%d] failed: %s", i, r)
+    async def _assemble_recall(
+        self,
+        user_id: str,
+        limit: int,
+        vector_results: list[dict],
+        user_profile: dict,
+        conversation_results: list[dict],
+        graph_results: list[dict],
+        include_conversations: bool,
+        inferred_context: str,
+        context_confidence: float,
+        linked_results: list[dict] | None = None,
+        degraded: list[str] | None = None,
+    ) -> dict:
+        """Merge fetched recall sources into the recall() result dict.
 
-        # Build graph triples for coverage boost
+        Applies graph coverage boosts, Zettelkasten 1-hop expansion and the
+        unified ranking, and schedules recall-as-reinforcement for traits.
+        ``linked_results`` (from _fetch_linked_memories) is fetched here when
+        not supplied.
+        """
+        # Build graph triples for coverage boost (spread-activated triples
+        # count in proportion to their activation)
         graph_triples = [
-            (t.get("subject", "").lower(), t.get("relation", ""), t.get("object", "").lower())
+            (t.get("subject", "").lower(), t.get("object", "").lower(), float(t.get("activation", 1.0)))
             for t in graph_results
             if t.get("subject") and t.get("object")
         ]
+        triple_matcher = compiled_matcher(frozenset(
+            term for subj, obj, _weight in graph_triples for term in (subj, obj)
+        ))
 
         # Deduplicate by content
         seen_contents: set[str] = set()
@@ -1405,14 +2172,14 @@ Return JSON only:
                 # Graph triple coverage boost (additive)
                 if graph_triples:
                     boost = 0.0
-                    content_lower = content.lower()
-                    for subj, _rel, obj in graph_triples:
-                        subj_in = subj in content_lower
-                        obj_in = obj in content_lower
+                    present = triple_matcher.find(content.lower())
+                    for subj, obj, weight in graph_triples:
+                        subj_in = subj in present
+                        obj_in = obj in present
                         if subj_in and obj_in:
-                            boost += 0.10
+                            boost += 0.10 * weight
                         elif subj_in or obj_in:
-                            boost += 0.04
+                            boost += 0.04 * weight
                     boost = min(boost, 0.20)
                     if r.get("score") is not None:
                         entry["score"] = round(r["score"] + boost, 4)
@@ -1421,46 +2188,12 @@ Return JSON only:
                 merged.append(entry)
 
         # Zettelkasten: 1-hop related memory expansion
-        related_ids_to_fetch: list[str] = []
-        existing_ids = {r.get("id") for r in merged if r.get("id")}
-        for r in list(merged):
-            related = (r.get("metadata") or {}).get("related_memories", [])
-            for link in related[:3]:
-                linked_id = link.get("id")
-                if linked_id and linked_id not in existing_ids:
-                    related_ids_to_fetch.append(linked_id)
-                    existing_ids.add(linked_id)
-
-        if related_ids_to_fetch:
-            related_ids_to_fetch = related_ids_to_fetch[:3]
-            try:
-                async with self._db.session() as sess:
-                    from sqlalchemy import text as _sql_text
-                    placeholders = ", ".join(f":rid_{i}" for i in range(len(related_ids_to_fetch)))
-                    params = {f"rid_{i}": rid for i, rid in enumerate(related_ids_to_fetch)}
-                    params["user_id"] = user_id
-                    result = await sess.execute(
-                        _sql_text(
-                            f"SELECT id, content, memory_type, metadata, created_at, extracted_timestamp "
-                            f"FROM memories WHERE id IN ({placeholders}) AND user_id = :user_id"
-                        ),
-                        params,
-                    )
-                    for row in result.fetchall():
-                        content = row.content
-                        if content not in seen_contents:
-                            seen_contents.add(content)
-                            merged.append({
-                                "id": str(row.id),
-                                "content": content,
-                                "memory_type": row.memory_type,
-                                "metadata": row.metadata,
-                                "created_at": row.created_at,
-                                "score": 0.03,
-                                "source": "linked",
-                            })
-            except Exception as e:
-                logger.warning("Zettelkasten expansion failed: %s", e)
+        if linked_results is None:
+            linked_results = await self._fetch_linked_memories(user_id, vector_results)
+        for entry in linked_results:
+            if entry["content"] not in seen_contents:
+                seen_contents.add(entry["content"])
+                merged.append(entry)
 
         # Merge conversation results when explicitly requested
         if include_conversations:
@@ -1475,7 +2208,8 @@ Return JSON only:
 
         # Graph triples participate in unified ranking
         # Scale confidence by 0.85 to preserve ranking differentiation
-        # while keeping graph_fact scores below top vector results
+        # while keeping graph_fact scores below top vector results;
+        # spread-activated triples are further scaled by their activation
         for triple in graph_results:
             subj = triple.get("subject", "")
             rel = triple.get("relation", "")
@@ -1484,7 +2218,7 @@ Return JSON only:
             if triple_content not in seen_contents:
                 seen_contents.add(triple_content)
                 confidence = float(triple.get("confidence", 0.5))
-                base_score = confidence * 0.85
+                base_score = confidence * 0.85 * float(triple.get("activation", 1.0))
                 merged.append({
                     "content": triple_content,
                     "score": round(base_score, 4),
@@ -1511,7 +2245,9 @@ Return JSON only:
             async def _reinforce_recalled_traits():
                 try:
                     from neuromem.services.trait_engine import TraitEngine
-                    async with self._db.session() as sess:
+                    # Micro-reinforcement must not invalidate the recall cache
+                    # entry that triggered it
+                    async with self._db.session(track_writes=False) as sess:
                         engine = TraitEngine(sess, self._embedding)
                         for tid in trait_ids_in_results:
                             await engine.reinforce_trait(
@@ -1543,8 +2279,37 @@ Return JSON only:
             "merged": merged[:limit],
             "inferred_context": inferred_context,
             "context_confidence": context_confidence,
+            "degraded": list(degraded or []),
         }
 
+    async def _fetch_linked_memories(self, user_id: str, vector_results: list[dict]) -> list[dict]:
+        """Zettelkasten expansion of already-fetched vector hits over memory_links.
+
+        recall() folds the walk into the vector statement; this separate
+        round trip serves recall_stream() and other callers that only have
+        the hits.
+        """
+        if not self._link_hops:
+            return []
+        seen_contents: set[str] = set()
+        seed_ids: list[str] = []
+        for r in vector_results:
+            content = r.get("content", "")
+            if content not in seen_contents:
+                seen_contents.add(content)
+                if r.get("id"):
+                    seed_ids.append(r["id"])
+        if not seed_ids:
+            return []
+        try:
+            async with self._db.session() as session:
+                return await self._search_service(session).linked_memories(
+                    user_id, seed_ids, self._link_hops, self._link_fanout,
+                )
+        except Exception as e:
+            logger.warning("Zettelkasten expansion failed: %s", e)
+            return []
+
     async def _search_conversations(
         self,
         user_id: str,
@@ -1560,8 +2325,22 @@ Return JSON only:
         Args:
             query_embedding: Optional pre-computed embedding to avoid recomputation
         """
-        from sqlalchemy import text
+        results = await self._search_conversations_multi([user_id], query, limit, query_embedding)
+        return results.get(user_id, [])
+
+    async def _search_conversations_multi(
+        self,
+        user_ids: list[str],
+        query: str,
+        limit: int = 10,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list[dict]]:
+        """Conversation fragment search for several users in one statement.
 
+        Vector + BM25 hybrid fused by RRF (SearchService.search_conversations);
+        each user gets its own top-``limit`` fragments.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
         try:
             if query_embedding is None:
                 query_embedding = await self._cached_embed(query)
@@ -1569,47 +2348,31 @@ Return JSON only:
                 logger.debug("Using provided query_embedding, skipping embed call")
         except Exception as e:
             logger.warning(f"Failed to generate query embedding for conversations: {e}")
-            return []
-
-        # Convert query_embedding to pgvector string format
-        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in query_embedding):
-            logger.warning("Invalid vector data: must contain only numeric values")
-            return []
-
-        vector_str = f"[{','.join(str(float(v)) for v in query_embedding)}]"
+            return {}
 
         async with self._db.session() as session:
-            # Vector similarity search on conversations using raw SQL
-            sql = text(
-                """
-                SELECT id, content, role, session_id, created_at, metadata,
-                       1 - (embedding <=> CAST(:query_vec AS vector)) AS similarity
-                FROM conversations
-                WHERE user_id = :user_id
-                  AND embedding IS NOT NULL
-                ORDER BY embedding <=> CAST(:query_vec AS vector)
-                LIMIT :limit
-            """
-            )
-
-            result = await session.execute(sql, {"user_id": user_id, "limit": limit, "query_vec": vector_str})
-            rows = result.fetchall()
+            try:
+                return await self._search_service(session).search_conversations(
+                    user_ids, query, limit, query_embedding=query_embedding,
+                )
+            except ValueError as e:
+                logger.warning("%s", e)
+                return {}
 
-            conversations = []
-            for row in rows:
-                conversations.append({
-                    "id": str(row.id),
-                    "content": self._decrypt_content(row.content),
-                    "role": row.role,
-                    "session_id": row.session_id,
-                    "created_at": row.created_at,
-                    "metadata": row.metadata or {},
-                    "similarity": round(float(row.similarity), 4),
-                })
+    # -- Parallel recall helpers --
 
-            return conversations
+    def _search_service(self, session):
+        """SearchService configured for recall (BM25 backend, encryption,
+        deferred access tracking, per-query HNSW tuning)."""
+        from neuromem.services.search import SearchService
 
-    # -- Parallel recall helpers --
+        return SearchService(
+            session, self._embedding, self._db.pg_search_available,
+            encryption=self._encryption, access_tracker=self._access_tracker,
+            pgvector_version=self._db.pgvector_version,
+            reranker=self._reranker,
+            vector_prefilter=self._db.vector_prefilter,
+        )
 
     async def _fetch_vector_memories(
         self,
@@ -1627,15 +2390,17 @@ Return JSON only:
         current_emotion: dict | None = None,
         query_context: str | None = None,
         context_confidence: float = 0.0,
+        rerank_weights=None,
+        link_hops: int = 0,
     ) -> list[dict]:
         """Search extracted memories (vector + BM25 hybrid).
 
         When memory_type is specified, skips the episodic/fact split and
         searches with that type directly. Otherwise, for temporal queries,
-        runs episodic and fact searches in parallel.
+        runs episodic and fact searches in parallel. With ``link_hops`` > 0
+        the linked memories of the hits follow them in the returned list
+        (``"source": "linked"``).
         """
-        from neuromem.services.search import SearchService
-
         common_kwargs = dict(
             decay_rate=decay_rate,
             query_embedding=query_embedding,
@@ -1645,12 +2410,15 @@ Return JSON only:
             current_emotion=current_emotion,
             query_context=query_context,
             context_confidence=context_confidence,
+            weights=rerank_weights,
+            link_hops=link_hops,
+            link_fanout=self._link_fanout,
         )
 
         # User explicitly specified memory_type → single search
         if memory_type:
             async with self._db.session() as session:
-                svc = SearchService(session, self._embedding, self._db.pg_search_available, encryption=self._encryption)
+                svc = self._search_service(session)
                 return await svc.scored_search(
                     user_id, query, limit,
                     memory_type=memory_type,
@@ -1663,7 +2431,7 @@ Return JSON only:
             # Two sub-searches in parallel using separate sessions
             async def _episodic():
                 async with self._db.session() as s:
-                    svc = SearchService(s, self._embedding, self._db.pg_search_available, encryption=self._encryption)
+                    svc = self._search_service(s)
                     return await svc.scored_search(
                         user_id, query, limit,
                         memory_type="episodic",
@@ -1674,7 +2442,7 @@ Return JSON only:
 
             async def _facts():
                 async with self._db.session() as s:
-                    svc = SearchService(s, self._embedding, self._db.pg_search_available, encryption=self._encryption)
+                    svc = self._search_service(s)
                     return await svc.scored_search(
                         user_id, query, limit,
                         exclude_types=["episodic"],
@@ -1682,21 +2450,113 @@ Return JSON only:
                     )
 
             episodic_results, fact_results = await asyncio.gather(_episodic(), _facts())
-            seen_ids = {r["id"] for r in episodic_results}
-            merged = list(episodic_results)
+            seen_ids = {r["id"] for r in episodic_results if r.get("source") != "linked"}
+            merged = [r for r in episodic_results if r.get("source") != "linked"]
             for r in fact_results:
-                if r["id"] not in seen_ids:
+                if r.get("source") != "linked" and r["id"] not in seen_ids:
+                    seen_ids.add(r["id"])
+                    merged.append(r)
+            merged = merged[:limit]
+            seen_ids = {r["id"] for r in merged}
+            for r in episodic_results + fact_results:
+                if r.get("source") == "linked" and r["id"] not in seen_ids:
                     seen_ids.add(r["id"])
                     merged.append(r)
-            return merged[:limit]
+            return merged
         else:
             async with self._db.session() as session:
-                svc = SearchService(session, self._embedding, self._db.pg_search_available, encryption=self._encryption)
+                svc = self._search_service(session)
                 return await svc.scored_search(
                     user_id, query, limit,
                     **common_kwargs,
                 )
 
+    async def _fetch_vector_memories_multi(
+        self,
+        user_ids: list[str],
+        query: str,
+        limit: int,
+        query_embedding: list[float],
+        event_after,
+        event_before,
+        decay_rate: float,
+        as_of: datetime | None = None,
+        memory_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        current_emotion: dict | None = None,
+        query_context: str | None = None,
+        context_confidence: float = 0.0,
+        link_hops: int = 0,
+    ) -> dict[str, list[dict]]:
+        """_fetch_vector_memories() for several users, one statement per sub-search.
+
+        With ``link_hops`` > 0 each user's linked memories follow its hits
+        (``"source": "linked"``), walked by the same statements.
+        """
+        common_kwargs = dict(
+            decay_rate=decay_rate,
+            query_embedding=query_embedding,
+            as_of=as_of,
+            created_after=created_after,
+            created_before=created_before,
+            current_emotion=current_emotion,
+            query_context=query_context,
+            context_confidence=context_confidence,
+            link_hops=link_hops,
+            link_fanout=self._link_fanout,
+        )
+
+        if memory_type or not (event_after or event_before):
+            async with self._db.session() as session:
+                svc = self._search_service(session)
+                return await svc.scored_search_users(
+                    user_ids, query, limit,
+                    memory_type=memory_type,
+                    event_after=event_after if memory_type else None,
+                    event_before=event_before if memory_type else None,
+                    **common_kwargs,
+                )
+
+        async def _episodic():
+            async with self._db.session() as s:
+                svc = self._search_service(s)
+                return await svc.scored_search_users(
+                    user_ids, query, limit,
+                    memory_type="episodic",
+                    event_after=event_after,
+                    event_before=event_before,
+                    **common_kwargs,
+                )
+
+        async def _facts():
+            async with self._db.session() as s:
+                svc = self._search_service(s)
+                return await svc.scored_search_users(
+                    user_ids, query, limit,
+                    exclude_types=["episodic"],
+                    **common_kwargs,
+                )
+
+        episodic_by_user, facts_by_user = await asyncio.gather(_episodic(), _facts())
+        merged_by_user: dict[str, list[dict]] = {}
+        for uid, episodic_results in episodic_by_user.items():
+            fact_results = facts_by_user.get(uid, [])
+            merged = [r for r in episodic_results if r.get("source") != "linked"]
+            seen_ids = {r["id"] for r in merged}
+            for r in fact_results:
+                if r.get("source") != "linked" and r["id"] not in seen_ids:
+                    seen_ids.add(r["id"])
+                    merged.append(r)
+            merged = merged[:limit]
+            seen_ids = {r["id"] for r in merged}
+            for r in episodic_results + fact_results:
+                if r.get("source") == "linked" and r["id"] not in seen_ids:
+                    seen_ids.add(r["id"])
+                    merged.append(r)
+            merged_by_user[uid] = merged
+        return merged_by_user
+
     async def profile_view(self, user_id: str) -> dict:
         """获取用户画像视图。
 
@@ -1715,20 +2575,30 @@ Return JSON only:
                 "recent_mood": {valence_avg, arousal_avg, sample_count, period} | None,
             }
         """
+        return (await self._profile_views([user_id]))[user_id]
+
+    async def _profile_views(self, user_ids: list[str]) -> dict[str, dict]:
+        """批量组装多个用户的画像视图（查询数与用户数无关）。
+
+        Returns:
+            {user_id: profile_view() 结构}
+        """
         from sqlalchemy import text as sql_text
 
-        async def _fetch_facts() -> dict:
+        user_ids = list(dict.fromkeys(user_ids))
+
+        async def _fetch_facts() -> dict[str, dict]:
             """从 memories 表查询 fact 类型记忆，按 category 分组取最新。"""
             async with self._db.session() as session:
                 result = await session.execute(
                     sql_text(
-                        "SELECT content, metadata->>'category' AS category, created_at "
+                        "SELECT user_id, content, metadata->>'category' AS category, created_at "
                         "FROM memories "
-                        "WHERE user_id = :uid AND memory_type = 'fact' "
+                        "WHERE user_id = ANY(CAST(:uids AS text[])) AND memory_type = 'fact' "
                         "AND valid_until IS NULL "
                         "ORDER BY created_at DESC"
                     ),
-                    {"uid": user_id},
+                    {"uids": user_ids},
                 )
                 rows = result.fetchall()
 
@@ -1736,10 +2606,11 @@ Return JSON only:
             # 单值 category（identity, occupation, location）取最新一条
             # 列表 category（hobby, skill, relationship, work, personal, values 等）取最新若干条
             single_categories = {"identity", "occupation", "location"}
-            facts: dict = {}
-            list_seen: dict[str, set] = {}
+            facts_by_user: dict[str, dict] = {uid: {} for uid in user_ids}
+            list_seen: dict[tuple[str, str], set] = {}
 
             for row in rows:
+                facts = facts_by_user[row.user_id]
                 cat = row.category or "general"
                 content = row.content
 
@@ -1747,33 +2618,38 @@ Return JSON only:
                     if cat not in facts:
                         facts[cat] = content
                 else:
+                    seen = list_seen.setdefault((row.user_id, cat), set())
                     if cat not in facts:
                         facts[cat] = []
-                        list_seen[cat] = set()
                     content_lower = content.lower()
-                    if content_lower not in list_seen.get(cat, set()):
-                        list_seen.setdefault(cat, set()).add(content_lower)
+                    if content_lower not in seen:
+                        seen.add(content_lower)
                         facts[cat].append(content)
 
-            return facts
+            return facts_by_user
 
-        async def _fetch_traits() -> list[dict]:
-            """从 memories 表查询活跃 trait（emerging 及以上阶段）。"""
+        async def _fetch_traits() -> dict[str, list[dict]]:
+            """从 memories 表查询活跃 trait（emerging 及以上阶段），每个用户最多 30 条。"""
             async with self._db.session() as session:
                 result = await session.execute(
                     sql_text(
-                        "SELECT content, trait_subtype, trait_stage, trait_confidence, trait_context, "
-                        "trait_reinforcement_count, trait_first_observed, trait_last_reinforced, trait_contradiction_count "
-                        "FROM memories "
-                        "WHERE user_id = :uid AND memory_type = 'trait' "
-                        "AND trait_stage NOT IN ('trend', 'dissolved') "
-                        "ORDER BY trait_confidence DESC NULLS LAST "
-                        "LIMIT 30"
+                        "SELECT * FROM ("
+                        "  SELECT user_id, content, trait_subtype, trait_stage, trait_confidence, trait_context, "
+                        "  trait_reinforcement_count, trait_first_observed, trait_last_reinforced, "
+                        "  trait_contradiction_count, "
+                        "  ROW_NUMBER() OVER (PARTITION BY user_id "
+                        "                     ORDER BY trait_confidence DESC NULLS LAST) AS rn "
+                        "  FROM memories "
+                        "  WHERE user_id = ANY(CAST(:uids AS text[])) AND memory_type = 'trait' "
+                        "  AND trait_stage NOT IN ('trend', 'dissolved')"
+                        ") t WHERE rn <= 30 "
+                        "ORDER BY user_id, rn"
                     ),
-                    {"uid": user_id},
+                    {"uids": user_ids},
                 )
-                return [
-                    {
+                traits_by_user: dict[str, list[dict]] = {uid: [] for uid in user_ids}
+                for r in result.fetchall():
+                    traits_by_user[r.user_id].append({
                         "content": r.content,
                         "subtype": r.trait_subtype,
                         "stage": r.trait_stage,
@@ -1783,42 +2659,44 @@ Return JSON only:
                         "first_observed": r.trait_first_observed.isoformat() if r.trait_first_observed else None,
                         "last_reinforced": r.trait_last_reinforced.isoformat() if r.trait_last_reinforced else None,
                         "contradiction_count": r.trait_contradiction_count or 0,
-                    }
-                    for r in result.fetchall()
-                ]
+                    })
+                return traits_by_user
 
-        async def _fetch_recent_mood() -> dict | None:
+        async def _fetch_recent_mood() -> dict[str, dict | None]:
             """从近期 episodic 记忆的 emotion metadata 实时聚合情绪状态。"""
             async with self._db.session() as session:
                 result = await session.execute(
                     sql_text(
-                        "SELECT "
+                        "SELECT user_id, "
                         "  AVG((metadata->'emotion'->>'valence')::float) AS valence_avg, "
                         "  AVG((metadata->'emotion'->>'arousal')::float) AS arousal_avg, "
                         "  COUNT(*) AS sample_count "
                         "FROM memories "
-                        "WHERE user_id = :uid "
+                        "WHERE user_id = ANY(CAST(:uids AS text[])) "
                         "  AND memory_type = 'episodic' "
                         "  AND metadata->'emotion' IS NOT NULL "
                         "  AND (metadata->'emotion'->>'valence') IS NOT NULL "
                         "  AND (metadata->'emotion'->>'valence') ~ '^-?[0-9]*\\.?[0-9]+$' "
                         "  AND ((metadata->'emotion'->>'arousal') IS NULL "
                         "       OR (metadata->'emotion'->>'arousal') ~ '^-?[0-9]*\\.?[0-9]+$') "
-                        "  AND created_at > NOW() - INTERVAL '14 days'"
+                        "  AND created_at > NOW() - INTERVAL '14 days' "
+                        "GROUP BY user_id"
                     ),
-                    {"uid": user_id},
+                    {"uids": user_ids},
                 )
-                row = result.first()
-
-            if not row or not row.sample_count or row.sample_count == 0:
-                return None
+                rows = result.fetchall()
 
-            return {
-                "valence_avg": round(float(row.valence_avg), 3) if row.valence_avg is not None else 0.0,
-                "arousal_avg": round(float(row.arousal_avg), 3) if row.arousal_avg is not None else 0.0,
-                "sample_count": row.sample_count,
-                "period": "last_14_days",
-            }
+            mood_by_user: dict[str, dict | None] = {uid: None for uid in user_ids}
+            for row in rows:
+                if not row.sample_count:
+                    continue
+                mood_by_user[row.user_id] = {
+                    "valence_avg": round(float(row.valence_avg), 3) if row.valence_avg is not None else 0.0,
+                    "arousal_avg": round(float(row.arousal_avg), 3) if row.arousal_avg is not None else 0.0,
+                    "sample_count": row.sample_count,
+                    "period": "last_14_days",
+                }
+            return mood_by_user
 
         try:
             facts, traits, mood = await asyncio.gather(
@@ -1832,56 +2710,161 @@ Return JSON only:
                 facts = {}
             if isinstance(traits, Exception):
                 logger.warning("profile_view traits query failed: %s", traits)
-                traits = []
+                traits = {}
             if isinstance(mood, Exception):
                 logger.warning("profile_view mood query failed: %s", mood)
-                mood = None
+                mood = {}
 
             return {
-                "facts": facts,
-                "traits": traits,
-                "recent_mood": mood,
+                uid: {
+                    "facts": facts.get(uid, {}),
+                    "traits": traits.get(uid, []),
+                    "recent_mood": mood.get(uid),
+                }
+                for uid in user_ids
             }
         except Exception as e:
             logger.warning("profile_view failed: %s", e)
-            return {"facts": {}, "traits": [], "recent_mood": None}
+            return {uid: {"facts": {}, "traits": [], "recent_mood": None} for uid in user_ids}
 
     async def _fetch_graph_memories(
         self, user_id: str, query: str, limit: int,
         as_of: datetime | None = None,
     ) -> list[dict]:
-        """Graph entity recall with SQL-pushed substring matching."""
+        """Graph entity recall: match known entities in the query, then fetch their facts.
+
+        Entity matching runs against the per-user entity dictionary (loaded
+        from graph_nodes on first use); the facts of all matched entities
+        and the user node are fetched with one batched query. With
+        ``graph_spread_hops`` > 0 a spreading-activation pass from the
+        matched entities adds the facts of entities reachable over several
+        hops, each tagged with its ``activation`` (0-1).
+        """
         from sqlalchemy import text as sql_text
+        from neuromem.services.entity_dictionary import match_entities
         from neuromem.services.graph_memory import GraphMemoryService
 
         query_lower = query.lower()
+        entities = self._db.entity_dictionary
+        matched = entities.match(user_id, query_lower)
         async with self._db.session() as session:
-            result = await session.execute(
-                sql_text(
-                    "SELECT DISTINCT node_id FROM graph_nodes "
-                    "WHERE user_id = :uid "
-                    "  AND node_id != 'user' "
-                    "  AND length(node_id) > 1 "
-                    "  AND strpos(:ql, node_id) > 0"
-                ),
-                {"uid": user_id, "ql": query_lower},
-            )
-            matched_entities = [row.node_id for row in result.fetchall()]
+            if matched is None:
+                epoch = entities.epoch(user_id)
+                result = await session.execute(
+                    sql_text("SELECT DISTINCT node_id FROM graph_nodes WHERE user_id = :uid"),
+                    {"uid": user_id},
+                )
+                node_ids = [row.node_id for row in result.fetchall()]
+                entities.load(user_id, node_ids, epoch)
+                matched = entities.match(user_id, query_lower)
+                if matched is None:  # caching disabled or a write raced the load
+                    matched = match_entities(node_ids, query_lower)
+
+            matched_entities = sorted(matched)
+            matched_entities.append(user_id)
+            logger.debug("Graph entity match: query=%s matched=%s", query[:50], matched_entities)
+
+            graph_svc = GraphMemoryService(session)
+            facts = await graph_svc.find_entities_facts(user_id, matched_entities, limit, as_of=as_of)
+            if self._graph_spread_hops > 0 and matched:
+                facts += await self._fetch_spread_facts(
+                    graph_svc, user_id, sorted(matched), facts, as_of,
+                )
+            return facts
 
-        matched_entities.append(user_id)
-        logger.debug("Graph entity match: query=%s matched=%s", query[:50], matched_entities)
+    async def _fetch_graph_memories_multi(
+        self, user_ids: list[str], query: str, limit: int,
+        as_of: datetime | None = None,
+    ) -> dict[str, list[dict]]:
+        """_fetch_graph_memories() for several users on one connection.
+
+        Entity sets missing from the entity dictionary are loaded for all
+        users with one query, and the facts of every user's matched entities
+        are fetched with one batched statement. Only the opt-in spreading
+        activation (``graph_spread_hops`` > 0) still runs per user.
+        """
+        from sqlalchemy import text as sql_text
+        from neuromem.services.entity_dictionary import match_entities
+        from neuromem.services.graph_memory import GraphMemoryService
 
+        user_ids = list(dict.fromkeys(user_ids))
+        query_lower = query.lower()
+        entities = self._db.entity_dictionary
+        matched_by_user = {uid: entities.match(uid, query_lower) for uid in user_ids}
         async with self._db.session() as session:
+            missing = [uid for uid, matched in matched_by_user.items() if matched is None]
+            if missing:
+                epochs = {uid: entities.epoch(uid) for uid in missing}
+                result = await session.execute(
+                    sql_text(
+                        "SELECT DISTINCT user_id, node_id FROM graph_nodes"
+                        " WHERE user_id = ANY(CAST(:uids AS text[]))"
+                    ),
+                    {"uids": missing},
+                )
+                node_ids: dict[str, list[str]] = {uid: [] for uid in missing}
+                for row in result.fetchall():
+                    node_ids[row.user_id].append(row.node_id)
+                for uid in missing:
+                    entities.load(uid, node_ids[uid], epochs[uid])
+                    matched = entities.match(uid, query_lower)
+                    if matched is None:  # caching disabled or a write raced the load
+                        matched = match_entities(node_ids[uid], query_lower)
+                    matched_by_user[uid] = matched
+
             graph_svc = GraphMemoryService(session)
-            seen_triples: set[str] = set()
-            graph_results: list[dict] = []
-            for entity in matched_entities:
-                for f in await graph_svc.find_entity_facts(user_id, entity, limit, as_of=as_of):
-                    key = f"{f.get('subject')}|{f.get('relation')}|{f.get('object')}"
-                    if key not in seen_triples:
-                        seen_triples.add(key)
-                        graph_results.append(f)
-        return graph_results
+            facts_by_user = await graph_svc.find_users_entities_facts(
+                {uid: sorted(matched) + [uid] for uid, matched in matched_by_user.items()},
+                limit, as_of=as_of,
+            )
+            if self._graph_spread_hops > 0:
+                for uid, matched in matched_by_user.items():
+                    if matched:
+                        facts_by_user[uid] += await self._fetch_spread_facts(
+                            graph_svc, uid, sorted(matched), facts_by_user[uid], as_of,
+                        )
+            return facts_by_user
+
+    async def _fetch_spread_facts(
+        self, graph_svc, user_id: str, seeds: list[str], facts: list[dict],
+        as_of: datetime | None = None,
+    ) -> list[dict]:
+        """Facts of entities activated from ``seeds`` that are not in ``facts``.
+
+        Each fact carries ``activation``: the stronger activation of its two
+        endpoints (seed endpoints count as 1.0), capped at 1.0.
+        """
+        from neuromem.services.graph_memory import _normalize_node_id
+
+        activation = await graph_svc.spread_activation(
+            user_id, seeds,
+            hops=self._graph_spread_hops,
+            decay=self._graph_spread_decay,
+            fanout=self._graph_spread_fanout,
+            max_nodes=self._graph_spread_nodes,
+            as_of=as_of,
+        )
+        if not activation:
+            return []
+        logger.debug("Graph spread: seeds=%s activated=%s", seeds, activation)
+
+        seen = {(f["subject"], f["relation"], f["object"]) for f in facts}
+        spread_facts = await graph_svc.find_entities_facts(
+            user_id, list(activation), self._graph_spread_fanout, as_of=as_of,
+        )
+        weights = {**activation, **dict.fromkeys(seeds, 1.0)}
+        results: list[dict] = []
+        for fact in spread_facts:
+            key = (fact["subject"], fact["relation"], fact["object"])
+            if key in seen:
+                continue
+            seen.add(key)
+            strength = max(
+                weights.get(_normalize_node_id(fact["subject"]), 0.0),
+                weights.get(_normalize_node_id(fact["object"]), 0.0),
+            )
+            results.append({**fact, "activation": round(min(strength, 1.0), 4)})
+        return results
 
     async def _check_memory_conflict(
         self, session, user_id: str, content: str, new_record,
@@ -1968,13 +2951,16 @@ Return JSON only:
         if background:
             async def _safe_digest():
                 try:
-                    await self._digest_impl(user_id, batch_size)
+                    # Background digests yield the LLM to extraction and explicit reflection
+                    with llm_priority("maintenance"):
+                        await self._digest_impl(user_id, batch_size)
                 except Exception as e:
                     logger.error("Background digest failed: user=%s error=%s", user_id, e)
             task = asyncio.create_task(_safe_digest())
             self._track_user_task(user_id, task)
             return None
-        return await self._digest_impl(user_id, batch_size)
+        with llm_priority("reflection"):
+            return await self._digest_impl(user_id, batch_size)
 
     async def _digest_impl(
         self,
@@ -2162,7 +3148,8 @@ Return JSON only:
 
         async with self._db.session() as session:
             svc = ReflectionService(session, self._embedding, self._llm)
-            return await svc.reflect(user_id, force=force, session_ended=session_ended)
+            with llm_priority("reflection"):
+                return await svc.reflect(user_id, force=force, session_ended=session_ended)
 
     async def get_user_traits(
         self,
@@ -2421,6 +3408,8 @@ Return JSON only:
             if not new_ids:
                 return {"rolled_back": 0, "reactivated": 0}
 
+            mark_user_written(session, user_id)
+
             # Invalidate these memories
             placeholders = ", ".join(f":id_{i}" for i in range(len(new_ids)))
             id_params = {f"id_{i}": nid for i, nid in enumerate(new_ids)}
@@ -2449,17 +3438,12 @@ Return JSON only:
             # Also rollback graph edges created after to_time
             await session.execute(
                 sql_text("""
-                    UPDATE graph_edges
-                    SET properties = jsonb_set(
-                        COALESCE(properties, '{}'::jsonb),
-                        '{valid_until}',
-                        to_jsonb(CAST(:now AS text))
-                    )
+                    UPDATE graph_edges SET valid_until = :now
                     WHERE user_id = :uid
-                      AND CAST(properties->>'valid_from' AS timestamptz) > :to_time
-                      AND (properties->>'valid_until') IS NULL
+                      AND valid_from > :to_time
+                      AND valid_until IS NULL
                 """),
-                {"uid": user_id, "to_time": to_time, "now": now.isoformat()},
+                {"uid": user_id, "to_time": to_time, "now": now},
             )
 
             await session.commit()
@@ -2488,6 +3472,7 @@ Return JSON only:
 
         tables = [
             ("memories", "user_id"),
+            ("memory_links", "user_id"),
             ("graph_edges", "user_id"),
             ("graph_nodes", "user_id"),
             ("conversations", "user_id"),
@@ -2499,6 +3484,7 @@ Return JSON only:
 
         deleted: dict[str, int] = {}
         async with self._db.session() as session:
+            mark_user_written(session, user_id)
             for table, id_col in tables:
                 result = await session.execute(
                     sql_text(f"DELETE FROM {table} WHERE {id_col} = :uid"),
@@ -2507,6 +3493,7 @@ Return JSON only:
                 deleted[table] = result.rowcount
             await session.commit()
 
+        self._db.entity_dictionary.invalidate(user_id)
         logger.info("delete_user_data[%s]: %s (cancelled %d tasks)", user_id, deleted, tasks_cancelled)
         return {"deleted": deleted, "tasks_cancelled": tasks_cancelled}
 
@@ -2525,6 +3512,8 @@ Return JSON only:
         """
         from sqlalchemy import text as sql_text
 
+        await self._access_tracker.flush()  # include buffered access counts
+
         result: dict = {}
         async with self._db.session() as session:
             # Memories
@@ -2581,7 +3570,8 @@ Return JSON only:
             # Graph edges
             rows = (await session.execute(
                 sql_text(
-                    "SELECT source_type, source_id, edge_type, target_type, target_id, properties "
+                    "SELECT source_type, source_id, edge_type, target_type, target_id, properties, "
+                    "valid_from, valid_until, confidence "
                     "FROM graph_edges WHERE user_id = :uid"
                 ),
                 {"uid": user_id},
@@ -2592,6 +3582,9 @@ Return JSON only:
                     "edge_type": r.edge_type,
                     "target_type": r.target_type, "target_id": r.target_id,
                     "properties": r.properties,
+                    "valid_from": r.valid_from.isoformat() if r.valid_from else None,
+                    "valid_until": r.valid_until.isoformat() if r.valid_until else None,
+                    "confidence": r.confidence,
                 }
                 for r in rows
             ]
@@ -2727,6 +3720,8 @@ Return JSON only:
         """
         from sqlalchemy import text as sql_text
 
+        await self._access_tracker.flush()  # include buffered access counts
+
         async with self._db.session() as session:
             rows = (await session.execute(
                 sql_text("""
@@ -4,13 +4,68 @@ from __future__ import annotations
 
 import json
 import logging
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
 from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from neuromem.services.entity_dictionary import EntityDictionary
 
 logger = logging.getLogger(__name__)
 
+# Tables whose rows are visible to recall(); writes to them invalidate recall caches
+_RECALL_VISIBLE_TABLES = frozenset({"memories", "graph_nodes", "graph_edges", "conversations"})
+_PENDING_WRITES_KEY = "neuromem_written_users"
+_UNTRACKED_KEY = "neuromem_untracked_writes"
+# (user_id, node_id) of graph nodes added / user_ids whose nodes changed, applied on commit
+_PENDING_NODES_KEY = "neuromem_added_graph_nodes"
+_PENDING_NODE_RESETS_KEY = "neuromem_changed_graph_users"
+
+# time.monotonic() deadline for statements of sessions opened in the current context
+_statement_deadline: ContextVar[float | None] = ContextVar("neuromem_statement_deadline", default=None)
+
+# Backfill typed ranking-signal columns from metadata (idempotent: only rows whose
+# column is still unset / out of sync). Regex guards keep one malformed LLM value
+# from aborting init. importance is written and compared as REAL (the column
+# type): against a float8 value 0.7::real would never match and every init
+# would rewrite the table.
+_NUMERIC_RE = r"'^\s*-?[0-9]+(\.[0-9]+)?\s*$'"
+_UUID_RE = r"'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'"
+SIGNAL_BACKFILL_SQLS = [
+    f"""UPDATE memories SET importance = ((metadata->>'importance')::float / 10.0)::real
+        WHERE metadata->>'importance' ~ {_NUMERIC_RE}
+          AND importance IS DISTINCT FROM CASE
+              WHEN metadata->>'importance' ~ {_NUMERIC_RE}
+              THEN ((metadata->>'importance')::float / 10.0)::real
+          END""",
+    """UPDATE memories SET event_time = (metadata->>'event_time')::timestamptz
+        WHERE event_time IS NULL
+          AND metadata->>'event_time' ~ '^\\d{4}-\\d{2}-\\d{2}'""",
+    f"""UPDATE memories SET arousal = (metadata->'emotion'->>'arousal')::float
+        WHERE arousal IS NULL AND metadata->'emotion'->>'arousal' ~ {_NUMERIC_RE}""",
+    f"""UPDATE memories SET valence = (metadata->'emotion'->>'valence')::float
+        WHERE valence IS NULL AND metadata->'emotion'->>'valence' ~ {_NUMERIC_RE}""",
+    """UPDATE memories SET temporality = LEFT(metadata->>'temporality', 20)
+        WHERE temporality IS NULL AND metadata->>'temporality' IS NOT NULL""",
+]
+
+# Backfill typed graph edge validity/confidence columns from properties (rows
+# written before the columns existed; idempotent: only rows with all unset)
+_TIMESTAMP_RE = r"'^\d{4}-\d{2}-\d{2}'"
+GRAPH_EDGE_BACKFILL_SQL = f"""
+    UPDATE graph_edges SET
+        valid_from = CASE WHEN properties->>'valid_from' ~ {_TIMESTAMP_RE}
+                          THEN (properties->>'valid_from')::timestamptz END,
+        valid_until = CASE WHEN properties->>'valid_until' ~ {_TIMESTAMP_RE}
+                           THEN (properties->>'valid_until')::timestamptz END,
+        confidence = CASE WHEN properties->>'confidence' ~ {_NUMERIC_RE}
+                          THEN (properties->>'confidence')::float END
+    WHERE valid_from IS NULL AND valid_until IS NULL AND confidence IS NULL
+      AND properties ?| array['valid_from', 'valid_until', 'confidence']"""
+
 
 def _is_encrypted(value) -> bool:
     """Check if a string value is an encrypted envelope (JSON with encrypted_dek)."""
@@ -23,24 +78,160 @@ def _is_encrypted(value) -> bool:
         return False
 
 
+def mark_user_written(session, user_id: str | None) -> None:
+    """Record that this session wrote recall-visible data for ``user_id``.
+
+    ORM inserts/updates/deletes are detected automatically on flush; raw SQL
+    writes (``text()`` UPDATE/DELETE) must call this so the user's write
+    generation is bumped when the transaction commits.
+    """
+    if user_id and not session.info.get(_UNTRACKED_KEY):
+        session.info.setdefault(_PENDING_WRITES_KEY, set()).add(user_id)
+
+
+@contextmanager
+def statement_deadline(timeout: float):
+    """Bound the server-side run time of statements issued in this context.
+
+    Sessions opened via Database.session() inside the block (including in
+    tasks spawned from it) start with ``SET LOCAL statement_timeout`` set to
+    the time remaining, so work abandoned by a caller-side timeout is also
+    stopped in PostgreSQL.
+    """
+    token = _statement_deadline.set(time.monotonic() + timeout)
+    try:
+        yield
+    finally:
+        _statement_deadline.reset(token)
+
+
+# Tables that can be hash-partitioned by user_id (per-tenant index locality)
+PARTITIONED_TABLES = ("memories", "conversations")
+
+# Accepted Database(vector_prefilter=...) modes
+VECTOR_PREFILTERS = frozenset({None, "binary"})
+
+
 class Database:
-    """Async database manager with connection pooling."""
+    """Async database manager with connection pooling.
+
+    Args:
+        url: SQLAlchemy async database URL.
+        pool_size: Connection pool size.
+        echo: Log SQL statements.
+        partitions: When > 0, ``init()`` creates (or migrates) ``memories`` and
+            ``conversations`` as tables hash-partitioned on ``user_id`` with
+            this many partitions. Per-user queries are pruned to a single
+            partition, so vector/BM25 searches only walk that partition's
+            HNSW/BM25 index. 0 (default) keeps regular tables. Foreign keys
+            referencing these tables (``documents.embedding_id``) are dropped:
+            they cannot target the ``(id, user_id)`` primary key.
+        vector_prefilter: Two-phase memory vector search. ``"binary"`` makes
+            ``init()`` build an HNSW index on the binary-quantized embedding
+            (``binary_quantize(embedding)::bit(dims)``, Hamming distance;
+            requires pgvector >= 0.7) instead of the full halfvec HNSW index;
+            searches scan it for a coarse candidate set and rerank that set by
+            exact halfvec cosine distance. None (default) uses the halfvec
+            index directly.
+    """
 
     pg_search_available: bool = False
-
-    def __init__(self, url: str, pool_size: int = 10, echo: bool = False):
+    # (major, minor) of the installed pgvector extension, set by init()
+    pgvector_version: tuple[int, int] | None = None
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 10,
+        echo: bool = False,
+        partitions: int = 0,
+        vector_prefilter: str | None = None,
+    ):
+        if partitions < 0:
+            raise ValueError(f"partitions must be >= 0, got {partitions}")
+        if vector_prefilter not in VECTOR_PREFILTERS:
+            raise ValueError(
+                f"vector_prefilter must be one of {sorted(VECTOR_PREFILTERS - {None})} or None, "
+                f"got {vector_prefilter!r}"
+            )
+        self.partitions = partitions
+        self.vector_prefilter = vector_prefilter
         self.engine = create_async_engine(url, pool_size=pool_size, echo=echo)
+        # Per-instance sync session class so write-tracking hooks stay scoped
+        # to this Database (several NeuroMemory instances may share a process).
+        self._sync_session_class = type("_NeuroMemorySession", (Session,), {})
         self.session_factory = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
+            sync_session_class=self._sync_session_class,
             expire_on_commit=False,
             autoflush=False,  # 禁用自动flush，由代码显式控制事务提交时机
         )
+        # user_id -> monotonically increasing write generation (bumped on commit)
+        self._write_generations: dict[str, int] = {}
+        # Graph entity ids per user for recall's entity matching, kept current
+        # from committed graph_nodes writes
+        self.entity_dictionary = EntityDictionary()
+        self._setup_write_tracking()
+
+    def write_generation(self, user_id: str) -> int:
+        """Current write generation for a user.
+
+        Incremented after every committed transaction that wrote memories,
+        graph data or conversations for the user. Used by recall caches to
+        detect stale entries without scanning.
+        """
+        return self._write_generations.get(user_id, 0)
+
+    def _setup_write_tracking(self) -> None:
+        """Register session hooks that bump per-user write generations on commit."""
+
+        @event.listens_for(self._sync_session_class, "before_flush")
+        def _collect_written_users(session, flush_context, instances):
+            for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+                if getattr(obj, "__tablename__", None) in _RECALL_VISIBLE_TABLES:
+                    mark_user_written(session, getattr(obj, "user_id", None))
+            for obj in session.new:
+                if getattr(obj, "__tablename__", None) == "graph_nodes" and obj.user_id:
+                    session.info.setdefault(_PENDING_NODES_KEY, set()).add((obj.user_id, obj.node_id))
+            for obj in list(session.dirty) + list(session.deleted):
+                if getattr(obj, "__tablename__", None) == "graph_nodes" and obj.user_id:
+                    session.info.setdefault(_PENDING_NODE_RESETS_KEY, set()).add(obj.user_id)
+
+        @event.listens_for(self._sync_session_class, "after_commit")
+        def _bump_generations(session):
+            for user_id in session.info.pop(_PENDING_WRITES_KEY, ()):
+                self._write_generations[user_id] = self._write_generations.get(user_id, 0) + 1
+            added: dict[str, list[str]] = {}
+            for user_id, node_id in session.info.pop(_PENDING_NODES_KEY, ()):
+                added.setdefault(user_id, []).append(node_id)
+            for user_id, node_ids in added.items():
+                self.entity_dictionary.add(user_id, node_ids)
+            for user_id in session.info.pop(_PENDING_NODE_RESETS_KEY, ()):
+                self.entity_dictionary.invalidate(user_id)
+
+        @event.listens_for(self._sync_session_class, "after_rollback")
+        def _discard_pending(session):
+            session.info.pop(_PENDING_WRITES_KEY, None)
+            session.info.pop(_PENDING_NODES_KEY, None)
+            session.info.pop(_PENDING_NODE_RESETS_KEY, None)
 
     @asynccontextmanager
-    async def session(self):
-        """Context manager that yields a session with auto-commit/rollback."""
+    async def session(self, track_writes: bool = True):
+        """Context manager that yields a session with auto-commit/rollback.
+
+        Args:
+            track_writes: When False, writes made in this session do not bump
+                the users' write generations (for bookkeeping updates that
+                should not invalidate recall caches).
+        """
         async with self.session_factory() as s:
+            if not track_writes:
+                s.info[_UNTRACKED_KEY] = True
+            deadline = _statement_deadline.get()
+            if deadline is not None:
+                remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+                await s.execute(text(f"SET LOCAL statement_timeout = {remaining_ms}"))
             try:
                 yield s
                 await s.commit()
@@ -70,6 +261,8 @@ class Database:
         import neuromem.models.memory_history  # noqa: F401
         import neuromem.models.reflection_cycle  # noqa: F401
         import neuromem.models.memory_source  # noqa: F401
+        import neuromem.models.memory_link  # noqa: F401
+        import neuromem.models.embedding_cache  # noqa: F401
 
         # Fix vector column dimensions: __declare_last__ runs at import time
         # with the default 1024, but _embedding_dims may have been updated
@@ -96,6 +289,7 @@ class Database:
                     table.schema = None
 
     async def _run_init(self, schema: str | None) -> None:
+        import neuromem.models as _models
         from neuromem.models.base import Base
 
         async with self.engine.begin() as conn:
@@ -145,6 +339,11 @@ class Database:
                 "ALTER TABLE memories ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32)",
                 # importance
                 "ALTER TABLE memories ADD COLUMN IF NOT EXISTS importance REAL DEFAULT 0.5",
+                # Typed ranking signals (promoted from metadata)
+                "ALTER TABLE memories ADD COLUMN IF NOT EXISTS event_time TIMESTAMPTZ",
+                "ALTER TABLE memories ADD COLUMN IF NOT EXISTS arousal REAL",
+                "ALTER TABLE memories ADD COLUMN IF NOT EXISTS valence REAL",
+                "ALTER TABLE memories ADD COLUMN IF NOT EXISTS temporality VARCHAR(20)",
                 # trait columns (12)
                 "ALTER TABLE memories ADD COLUMN IF NOT EXISTS trait_subtype VARCHAR(20)",
                 "ALTER TABLE memories ADD COLUMN IF NOT EXISTS trait_stage VARCHAR(20)",
@@ -197,6 +396,14 @@ class Database:
                 END $$;
             """))
 
+            # Step 4d: graph_edges typed temporal columns
+            for col_sql in [
+                "ALTER TABLE graph_edges ADD COLUMN IF NOT EXISTS valid_from TIMESTAMPTZ",
+                "ALTER TABLE graph_edges ADD COLUMN IF NOT EXISTS valid_until TIMESTAMPTZ",
+                "ALTER TABLE graph_edges ADD COLUMN IF NOT EXISTS confidence REAL",
+            ]:
+                await conn.execute(text(col_sql))
+
             # Step 5: conversation_sessions add column
             await conn.execute(text(
                 "ALTER TABLE conversation_sessions ADD COLUMN IF NOT EXISTS last_reflected_at TIMESTAMPTZ"
@@ -224,8 +431,29 @@ class Database:
             await conn.execute(text(
                 "UPDATE memories SET valid_at = COALESCE(valid_from, created_at) WHERE valid_at IS NULL"
             ))
+            # metadata ranking signals -> typed columns
+            for backfill_sql in SIGNAL_BACKFILL_SQLS:
+                await conn.execute(text(backfill_sql))
+            # graph edge properties validity -> typed columns
+            await conn.execute(text(GRAPH_EDGE_BACKFILL_SQL))
+            # metadata.related_memories -> memory_links, then drop the array
+            await conn.execute(text(f"""
+                INSERT INTO memory_links (source_id, target_id, user_id, relation, weight)
+                SELECT m.id, (l->>'id')::uuid, m.user_id,
+                       LEFT(COALESCE(l->>'relation', 'related'), 50), 1.0
+                FROM memories m
+                CROSS JOIN LATERAL jsonb_array_elements(m.metadata->'related_memories') AS l
+                WHERE jsonb_typeof(m.metadata->'related_memories') = 'array'
+                  AND l->>'id' ~* {_UUID_RE}
+                ON CONFLICT (source_id, target_id) DO NOTHING
+            """))
+            await conn.execute(text(
+                "UPDATE memories SET metadata = metadata - 'related_memories' "
+                "WHERE metadata ? 'related_memories'"
+            ))
 
             # Step 7: halfvec migration
+            dims = _models._embedding_dims
             pgvector_version = (await conn.execute(text(
                 "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
             ))).scalar()
@@ -234,7 +462,8 @@ class Database:
             col_type_was_vector = False
             if pgvector_version:
                 parts = pgvector_version.split('.')[:2]
-                can_halfvec = (int(parts[0]), int(parts[1])) >= (0, 7)
+                self.pgvector_version = (int(parts[0]), int(parts[1]))
+                can_halfvec = self.pgvector_version >= (0, 7)
 
             if can_halfvec:
                 col_type = (await conn.execute(text("""
@@ -250,6 +479,32 @@ class Database:
                     ))
                     logger.info("Migrated embedding column to halfvec(%d)", dims)
 
+                # Conversations: same migration; legacy vector indexes (e.g. the
+                # ivfflat index from migrations/002) are dropped with the old type
+                conv_col_type = (await conn.execute(text("""
+                    SELECT udt_name FROM information_schema.columns
+                    WHERE table_name = 'conversations' AND column_name = 'embedding'
+                """))).scalar()
+                if conv_col_type == 'vector':
+                    old_indexes = (await conn.execute(text("""
+                        SELECT indexname FROM pg_indexes
+                        WHERE tablename = 'conversations'
+                          AND schemaname = current_schema()
+                          AND indexdef LIKE '%vector_%_ops%'
+                    """))).fetchall()
+                    for idx in old_indexes:
+                        await conn.execute(text(f"DROP INDEX IF EXISTS {idx.indexname}"))
+                    await conn.execute(text(
+                        f"ALTER TABLE conversations ALTER COLUMN embedding "
+                        f"TYPE halfvec({dims}) USING embedding::halfvec({dims})"
+                    ))
+                    logger.info("Migrated conversations embedding column to halfvec(%d)", dims)
+
+            # Step 7b: hash-partition memories/conversations by user_id (opt-in)
+            if self.partitions:
+                for table_name in PARTITIONED_TABLES:
+                    await self._ensure_hash_partitioned(conn, table_name)
+
             # Step 8: Index updates
             index_sqls = [
                 # Trait indexes
@@ -270,10 +525,49 @@ class Database:
                 # valid_at index
                 """CREATE INDEX IF NOT EXISTS ix_mem_user_valid_at
                    ON memories (user_id, valid_at, invalid_at)""",
+                # Active graph edges: entity fact lookups (both directions),
+                # conflict resolution and rollback by valid_from
+                """CREATE INDEX IF NOT EXISTS ix_graph_edges_active_source
+                   ON graph_edges (user_id, source_id, edge_type) WHERE valid_until IS NULL""",
+                """CREATE INDEX IF NOT EXISTS ix_graph_edges_active_target
+                   ON graph_edges (user_id, target_id) WHERE valid_until IS NULL""",
+                """CREATE INDEX IF NOT EXISTS ix_graph_edges_active_from
+                   ON graph_edges (user_id, valid_from) WHERE valid_until IS NULL""",
+                # Time-travel (as_of) lookups by source entity; ix_graph_edges_lookup
+                # leads with source_type and cannot serve them
+                """CREATE INDEX IF NOT EXISTS ix_graph_edges_source_validity
+                   ON graph_edges (user_id, source_id, valid_from)""",
             ]
             for idx_sql in index_sqls:
                 await conn.execute(text(idx_sql))
 
+            # Binary-quantized prefilter index (replaces the full halfvec HNSW)
+            if self.vector_prefilter == "binary" and can_halfvec:
+                t0 = time.monotonic()
+                await conn.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS idx_memories_embedding_bq
+                    ON memories USING hnsw ((binary_quantize(embedding)::bit({dims})) bit_hamming_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """))
+                logger.info("Binary-quantized HNSW index ready in %.1fs", time.monotonic() - t0)
+
+            # Partitioned layout: HNSW on the parent cascades to one index per partition
+            if self.partitions and can_halfvec and not self.vector_prefilter:
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_memories_hnsw
+                    ON memories USING hnsw (embedding halfvec_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """))
+
+            # Conversation recall: HNSW on the halfvec column (cascades to
+            # partitions in the partitioned layout)
+            if can_halfvec:
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_conversations_hnsw
+                    ON conversations USING hnsw (embedding halfvec_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """))
+
             # Step 9: Rebuild vector indexes after halfvec migration
             if can_halfvec and col_type_was_vector:
                 old_indexes = (await conn.execute(text("""
@@ -285,11 +579,12 @@ class Database:
                 for idx in old_indexes:
                     await conn.execute(text(f"DROP INDEX IF EXISTS {idx.indexname}"))
 
-                await conn.execute(text(f"""
-                    CREATE INDEX IF NOT EXISTS idx_memories_hnsw
-                    ON memories USING hnsw (embedding halfvec_cosine_ops)
-                    WITH (m = 16, ef_construction = 64)
-                """))
+                if not self.vector_prefilter:
+                    await conn.execute(text("""
+                        CREATE INDEX IF NOT EXISTS idx_memories_hnsw
+                        ON memories USING hnsw (embedding halfvec_cosine_ops)
+                        WITH (m = 16, ef_construction = 64)
+                    """))
 
             # v0.6.3: extraction status tracking columns (idempotent)
             for col_sql in [
@@ -318,29 +613,137 @@ class Database:
             self.pg_search_available = False
             logger.info("pg_search not available, using tsvector fallback: %s", e)
 
-        # Create BM25 index if pg_search is available
+        # Create BM25 indexes if pg_search is available
         # ParadeDB limits one BM25 index per table; check existence first
-        if self.pg_search_available:
-            try:
-                async with self.engine.begin() as conn:
-                    result = await conn.execute(text(
-                        "SELECT 1 FROM pg_indexes"
-                        " WHERE indexname = 'idx_memories_bm25'"
-                        " AND schemaname = current_schema()"
+        for table_name in PARTITIONED_TABLES:
+            if self.pg_search_available and self.partitions:
+                await self._create_partition_bm25_indexes(table_name)
+            elif self.pg_search_available:
+                await self._create_bm25_index(table_name, f"idx_{table_name}_bm25")
+
+
+    async def vector_index_stats(self) -> list[dict]:
+        """Size of each vector index on ``memories`` (partitions summed).
+
+        Used by the benchmark suite to compare the halfvec HNSW index with
+        the binary-quantized prefilter index.
+
+        Returns:
+            [{"name": str, "bytes": int, "definition": str}, ...]
+        """
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(text("""
+                SELECT i.indexrelid::regclass::text AS name,
+                       pg_get_indexdef(i.indexrelid) AS definition,
+                       pg_relation_size(i.indexrelid)
+                       + COALESCE((
+                           SELECT SUM(pg_relation_size(inh.inhrelid))
+                           FROM pg_inherits inh WHERE inh.inhparent = i.indexrelid
+                       ), 0) AS bytes
+                FROM pg_index i
+                JOIN pg_class am_rel ON am_rel.oid = i.indexrelid
+                JOIN pg_am am ON am.oid = am_rel.relam
+                WHERE i.indrelid = to_regclass('memories')
+                  AND am.amname IN ('hnsw', 'ivfflat')
+                ORDER BY name
+            """))).fetchall()
+        return [{"name": r.name, "bytes": int(r.bytes), "definition": r.definition} for r in rows]
+
+    async def _ensure_hash_partitioned(self, conn, table_name: str) -> None:
+        """Convert ``table_name`` into a HASH(user_id) partitioned table (idempotent).
+
+        Fresh installs go through the same path: create_all has just created an
+        empty regular table, which is swapped for the partitioned layout. For
+        existing deployments rows are copied into the new partitions inside the
+        init transaction, so the migration is atomic (but takes a full-table
+        copy; run it in a maintenance window for large tables).
+        """
+        from neuromem.models.base import Base
+
+        relkind = (await conn.execute(text(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"
+        ), {"t": table_name})).scalar()
+        if relkind is None:
+            return
+        if relkind == "p":
+            existing = (await conn.execute(text(
+                "SELECT COUNT(*) FROM pg_inherits WHERE inhparent = to_regclass(:t)"
+            ), {"t": table_name})).scalar()
+            if existing != self.partitions:
+                logger.warning(
+                    "%s already has %d hash partitions (requested %d); "
+                    "changing the partition count requires a manual re-partition",
+                    table_name, existing, self.partitions,
+                )
+            return
+
+        # Foreign keys into the table (documents.embedding_id -> memories.id)
+        # would block the DROP below and cannot reference the (id, user_id) key
+        referencing = (await conn.execute(text(
+            "SELECT conrelid::regclass::text AS tbl, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = to_regclass(:t)"
+        ), {"t": table_name})).fetchall()
+        for row in referencing:
+            await conn.execute(text(f'ALTER TABLE {row.tbl} DROP CONSTRAINT "{row.conname}"'))
+            logger.info("Dropped foreign key %s.%s referencing %s", row.tbl, row.conname, table_name)
+
+        legacy = f"{table_name}_unpartitioned"
+        await conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+        await conn.execute(text(
+            f"CREATE TABLE {table_name} "
+            f"(LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY HASH (user_id)"
+        ))
+        for i in range(self.partitions):
+            await conn.execute(text(
+                f"CREATE TABLE {table_name}_p{i} PARTITION OF {table_name} "
+                f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {i})"
+            ))
+        copied = (await conn.execute(text(
+            f"INSERT INTO {table_name} SELECT * FROM {legacy}"
+        ))).rowcount
+        # Drop the legacy table first: it still owns the {table}_pkey and index names
+        await conn.execute(text(f"DROP TABLE {legacy}"))
+        # Unique constraints on partitioned tables must include the partition key
+        await conn.execute(text(
+            f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (id, user_id)"
+        ))
+
+        table = next(t for t in Base.metadata.tables.values() if t.name == table_name)
+
+        def _create_model_indexes(sync_conn):
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+        await conn.run_sync(_create_model_indexes)
+        logger.info(
+            "Partitioned %s by HASH(user_id) into %d partitions (%d rows migrated)",
+            table_name, self.partitions, copied,
+        )
+
+    async def _create_bm25_index(self, table_name: str, index_name: str) -> None:
+        """Create a pg_search BM25 index on ``table_name`` unless it exists."""
+        try:
+            async with self.engine.begin() as conn:
+                exists = (await conn.execute(text(
+                    "SELECT 1 FROM pg_indexes"
+                    " WHERE indexname = :name AND schemaname = current_schema()"
+                ), {"name": index_name})).first()
+                if exists is None:
+                    await conn.execute(text(
+                        f"CREATE INDEX {index_name} ON {table_name} "
+                        f"USING bm25 (id, content) WITH (key_field='id')"
                     ))
-                    if result.first() is None:
-                        await conn.execute(text("""
-                            CREATE INDEX idx_memories_bm25
-                            ON memories
-                            USING bm25 (id, content)
-                            WITH (key_field='id')
-                        """))
-                        logger.info("BM25 index created on memories")
-                    else:
-                        logger.debug("BM25 index already exists, skipping creation")
-            except Exception as e:
-                logger.warning("Failed to create BM25 index: %s", e)
+                    logger.info("BM25 index created on %s", table_name)
+                else:
+                    logger.debug("BM25 index %s already exists, skipping creation", index_name)
+        except Exception as e:
+            logger.warning("Failed to create BM25 index on %s: %s", table_name, e)
 
+    async def _create_partition_bm25_indexes(self, table_name: str = "memories") -> None:
+        """Create one pg_search BM25 index per partition of ``table_name``."""
+        for i in range(self.partitions):
+            await self._create_bm25_index(f"{table_name}_p{i}", f"idx_{table_name}_p{i}_bm25")
 
     def setup_encryption(self, enc_service) -> None:
         """Register SQLAlchemy event hooks for transparent content encryption.
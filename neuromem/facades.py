@@ -145,3 +145,9 @@ class GraphFacade:
         async with self._db.session() as session:
             svc = GraphService(session)
             return await svc.find_path(source_type, source_id, target_type, target_id, max_depth, user_id)
+
+    async def k_hop_neighbors(self, user_id: str, node_type, node_id: str, k: int = 2, edge_types=None, limit: int = 100):
+        from neuromem.services.graph import GraphService
+        async with self._db.session() as session:
+            svc = GraphService(session)
+            return await svc.k_hop_neighbors(node_type, node_id, k, edge_types, limit, user_id)
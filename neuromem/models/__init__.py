@@ -16,6 +16,8 @@ from neuromem.models.trait_evidence import TraitEvidence
 from neuromem.models.memory_history import MemoryHistory
 from neuromem.models.reflection_cycle import ReflectionCycle
 from neuromem.models.memory_source import MemorySource
+from neuromem.models.memory_link import MemoryLink
+from neuromem.models.embedding_cache import EmbeddingCacheEntry
 
 __all__ = [
     "Base",
@@ -26,6 +28,8 @@ __all__ = [
     "MemoryHistory",
     "ReflectionCycle",
     "MemorySource",
+    "MemoryLink",
+    "EmbeddingCacheEntry",
     "KeyValue",
     "Conversation",
     "ConversationSession",
@@ -0,0 +1,38 @@
+"""Embedding cache model - provider vectors keyed by model and content hash."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import REAL, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from neuromem.models.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """One cached embedding, shared by every process using the database.
+
+    Vectors are stored as ``real[]`` rather than a pgvector column so that
+    providers with different dimensions can share the table.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String(255), primary_key=True)
+    dims: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # sha256 hex digest of the UTF-8 text
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(ARRAY(REAL), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        # LRU eviction scans from the least recently used end
+        Index("idx_embedding_cache_last_used", "last_used_at"),
+    )
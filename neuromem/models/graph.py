@@ -1,9 +1,10 @@
 """Graph data models (relational tables for nodes and edges)."""
 
 import uuid
+from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Index, String, Text
+from sqlalchemy import DateTime, Float, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -85,6 +86,10 @@ class GraphEdge(Base, TimestampMixin):
     target_type: Mapped[str] = mapped_column(String(50), nullable=False)
     target_id: Mapped[str] = mapped_column(String(255), nullable=False)
     properties: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Temporal model: active edges have valid_until IS NULL (partial indexes in Database.init)
+    valid_from: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    valid_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     __table_args__ = (
         # 修复：索引包含 user_id 以确保用户隔离和性能
@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from pgvector.sqlalchemy import HALFVEC
-from sqlalchemy import CheckConstraint, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy import REAL, CheckConstraint, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -57,8 +57,13 @@ class Memory(Base, TimestampMixin):
     invalid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     expired_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    # Importance
-    importance: Mapped[float] = mapped_column(Float, default=0.5, server_default="0.5", nullable=False)
+    # Ranking signals (typed copies of metadata keys, read natively by scored_search)
+    # importance is normalized to 0.1-1.0 (metadata importance 1-10 / 10)
+    importance: Mapped[float] = mapped_column(REAL, default=0.5, server_default="0.5", nullable=False)
+    event_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    arousal: Mapped[float | None] = mapped_column(REAL, nullable=True)
+    valence: Mapped[float | None] = mapped_column(REAL, nullable=True)
+    temporality: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     # Deduplication
     content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
@@ -98,5 +103,45 @@ class Memory(Base, TimestampMixin):
         cls.__table__.c.embedding.type = HALFVEC(_models._embedding_dims)
 
 
+def _to_float(value) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(value) -> datetime | None:
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def signal_columns(metadata: dict | None) -> dict:
+    """Typed ranking-signal column values derived from a memory's metadata.
+
+    Returns kwargs for Memory(...) / UPDATE: importance (0.1-1.0, default 0.5),
+    event_time, arousal, valence and temporality. Unparseable values map to
+    None so one bad LLM field cannot break ranking SQL.
+    """
+    meta = metadata or {}
+    importance = _to_float(meta.get("importance"))
+    emotion = meta.get("emotion") if isinstance(meta.get("emotion"), dict) else {}
+    temporality = meta.get("temporality")
+    return {
+        "importance": importance / 10.0 if importance is not None else 0.5,
+        "event_time": _to_datetime(meta.get("event_time")),
+        "arousal": _to_float(emotion.get("arousal")),
+        "valence": _to_float(emotion.get("valence")),
+        "temporality": temporality[:20] if isinstance(temporality, str) and temporality else None,
+    }
+
+
 # Backward compatibility alias
 Embedding = Memory
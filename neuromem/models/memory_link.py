@@ -0,0 +1,38 @@
+"""Memory link model - Zettelkasten links between memories."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from neuromem.models.base import Base
+
+
+class MemoryLink(Base):
+    """Directed link source -> target; reflection writes both directions."""
+
+    __tablename__ = "memory_links"
+
+    source_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    target_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    relation: Mapped[str] = mapped_column(String(50), nullable=False, default="related")
+    weight: Mapped[float] = mapped_column(Float, nullable=False, default=1.0, server_default="1.0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        # (source_id, weight) serves the fan-out limited walk in recall
+        Index("idx_memory_links_source_weight", "source_id", "weight"),
+        Index("idx_memory_links_target", "target_id"),
+        Index("idx_memory_links_user", "user_id"),
+    )
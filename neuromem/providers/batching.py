@@ -0,0 +1,151 @@
+"""Embedding micro-batching: coalesce concurrent embed() calls into embed_batch()."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+
+from neuromem.providers.embedding import EmbeddingProvider
+
+# Set while a coalesced embed_batch() runs: {"coalesced": n, "queue_ms": ms}
+_current_batch: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "neuromem_embedding_batch", default=None,
+)
+
+
+def current_batch() -> dict | None:
+    """Coalescing stats of the embed_batch() call running in this context.
+
+    Returns None outside a coalesced batch. Instrumentation wrapped by
+    BatchingEmbedding reads this to report batch size and queueing delay.
+    """
+    return _current_batch.get()
+
+
+class _Pending:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str, future: asyncio.Future):
+        self.text = text
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class BatchingEmbedding(EmbeddingProvider):
+    """Proxy that coalesces concurrent ``embed()`` calls into ``embed_batch()``.
+
+    Calls arriving within ``max_wait_ms`` of the first queued one are sent
+    as one ``embed_batch()`` request (split at ``max_batch_size``); each
+    caller gets its own vector, or the batch's exception. Identical texts
+    in a batch are embedded once. At most ``max_in_flight`` requests to the
+    inner provider run at once; direct ``embed_batch()`` calls count too,
+    and batches wait for a free slot (the wait shows up as queueing delay).
+
+    Args:
+        inner: The provider to call.
+        max_batch_size: Texts per request. 1 disables coalescing.
+        max_wait_ms: How long the first queued call waits for company.
+        max_in_flight: Concurrent requests to ``inner`` (0 = unlimited).
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingProvider,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_in_flight: int = 4,
+    ):
+        self._inner = inner
+        if hasattr(inner, "model"):
+            self.model = inner.model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self._queue: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def dims(self) -> int:
+        return self._inner.dims
+
+    async def embed(self, text: str) -> list[float]:
+        if self.max_batch_size == 1:
+            return (await self.embed_batch([text]))[0]
+        loop = asyncio.get_running_loop()
+        pending = _Pending(text, loop.create_future())
+        self._queue.append(pending)
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await pending.future
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if self._slots is None:
+            return await self._inner.embed_batch(texts)
+        async with self._slots:
+            return await self._inner.embed_batch(texts)
+
+    async def aclose(self) -> None:
+        await self.drain()
+        await self._inner.aclose()
+
+    async def drain(self) -> None:
+        """Send queued calls now and wait for all running batches."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[_Pending]) -> None:
+        batch = [p for p in batch if not p.future.done()]  # drop cancelled callers
+        if not batch:
+            return
+        texts = list(dict.fromkeys(p.text for p in batch))
+        try:
+            if self._slots is None:
+                vectors = await self._embed_coalesced(texts, batch)
+            else:
+                async with self._slots:
+                    vectors = await self._embed_coalesced(texts, batch)
+            if len(vectors) != len(texts):
+                raise ValueError(
+                    f"embed_batch returned {len(vectors)} vectors for {len(texts)} texts"
+                )
+        except asyncio.CancelledError:
+            for p in batch:
+                p.future.cancel()
+            raise
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+            return
+        by_text = dict(zip(texts, vectors))
+        for p in batch:
+            if not p.future.done():
+                p.future.set_result(by_text[p.text])
+
+    async def _embed_coalesced(self, texts: list[str], batch: list[_Pending]) -> list[list[float]]:
+        started = time.monotonic()
+        token = _current_batch.set({
+            "coalesced": len(batch),
+            "queue_ms": round(max(started - p.enqueued_at for p in batch) * 1000, 1),
+        })
+        try:
+            return await self._inner.embed_batch(texts)
+        finally:
+            _current_batch.reset(token)
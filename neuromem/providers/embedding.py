@@ -15,6 +15,9 @@ class EmbeddingProvider(ABC):
         """Generate embeddings for multiple texts. Default: sequential calls."""
         return [await self.embed(t) for t in texts]
 
+    async def aclose(self) -> None:
+        """Release resources such as pooled connections. Default: nothing to do."""
+
     @property
     @abstractmethod
     def dims(self) -> int:
@@ -0,0 +1,65 @@
+"""Long-lived pooled HTTP client shared by the HTTP API providers."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+
+class PooledHTTPClient:
+    """Lazily created ``httpx.AsyncClient`` reused across calls.
+
+    Keeps connections alive between requests (no TCP/TLS setup per call)
+    and bounds the sockets opened under bursts. The client is bound to the
+    event loop that created it: on another loop (e.g. a second
+    ``asyncio.run()``) a fresh client is created. ``aclose()`` releases the
+    connections; the next request opens a new client.
+
+    Args:
+        timeout: Request timeout in seconds.
+        max_connections: Max concurrent connections (requests beyond it wait
+            for a free connection).
+        max_keepalive_connections: Idle connections kept open.
+        keepalive_expiry: Seconds an idle connection is kept.
+        http2: Negotiate HTTP/2 (requires ``pip install neuromem[http2]``).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        """The client for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client from a finished loop cannot be closed from this one; drop it
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, http2=self.http2,
+            )
+            self._loop = loop
+        return self._client
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.get().post(url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close pooled connections (only if owned by the running loop)."""
+        client, self._client = self._client, None
+        if client is not None and not client.is_closed and self._loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._loop = None
@@ -15,3 +15,6 @@ class LLMProvider(ABC):
     ) -> str:
         """Send chat messages and return the response text."""
         ...
+
+    async def aclose(self) -> None:
+        """Release resources such as pooled connections. Default: nothing to do."""
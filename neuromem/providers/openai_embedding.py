@@ -1,12 +1,16 @@
 """OpenAI-compatible embedding provider."""
 
-import httpx
-
 from neuromem.providers.embedding import EmbeddingProvider
+from neuromem.providers.http import PooledHTTPClient
 
 
 class OpenAIEmbedding(EmbeddingProvider):
-    """OpenAI embedding provider (text-embedding-3-small/large)."""
+    """OpenAI embedding provider (text-embedding-3-small/large).
+
+    Requests share one pooled keep-alive client (see PooledHTTPClient for
+    ``max_connections``, ``max_keepalive_connections``, ``keepalive_expiry``
+    and ``http2``); call ``aclose()`` to release its connections.
+    """
 
     def __init__(
         self,
@@ -14,11 +18,26 @@ class OpenAIEmbedding(EmbeddingProvider):
         model: str = "text-embedding-3-small",
         base_url: str = "https://api.openai.com/v1",
         dimensions: int = 1536,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
     ):
         self._api_key = api_key
         self._model = model
         self._base_url = base_url
         self._dims = dimensions
+        self._http = PooledHTTPClient(
+            timeout=30.0,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
+
+    @property
+    def model(self) -> str:
+        return self._model
 
     @property
     def dims(self) -> int:
@@ -29,20 +48,22 @@ class OpenAIEmbedding(EmbeddingProvider):
         return result[0]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                f"{self._base_url}/embeddings",
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self._model,
-                    "input": texts,
-                    "dimensions": self._dims,
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            sorted_data = sorted(data["data"], key=lambda x: x["index"])
-            return [item["embedding"] for item in sorted_data]
+        resp = await self._http.post(
+            f"{self._base_url}/embeddings",
+            headers={
+                "Authorization": f"Bearer {self._api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self._model,
+                "input": texts,
+                "dimensions": self._dims,
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        sorted_data = sorted(data["data"], key=lambda x: x["index"])
+        return [item["embedding"] for item in sorted_data]
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
@@ -1,22 +1,37 @@
 """OpenAI-compatible LLM provider (works with OpenAI, DeepSeek, etc.)."""
 
-import httpx
-
+from neuromem.providers.http import PooledHTTPClient
 from neuromem.providers.llm import LLMProvider
 
 
 class OpenAILLM(LLMProvider):
-    """OpenAI-compatible LLM provider for memory classification."""
+    """OpenAI-compatible LLM provider for memory classification.
+
+    Requests share one pooled keep-alive client (see PooledHTTPClient for
+    ``max_connections``, ``max_keepalive_connections``, ``keepalive_expiry``
+    and ``http2``); call ``aclose()`` to release its connections.
+    """
 
     def __init__(
         self,
         api_key: str,
         model: str = "gpt-4o-mini",
         base_url: str = "https://api.openai.com/v1",
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
     ):
         self._api_key = api_key
         self._model = model
         self._base_url = base_url
+        self._http = PooledHTTPClient(
+            timeout=120.0,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
 
     async def chat(
         self,
@@ -49,23 +64,25 @@ class OpenAILLM(LLMProvider):
             body["max_tokens"] = max_tokens
             body["temperature"] = temperature
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{self._base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=body,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            msg = data["choices"][0]["message"]
-            content = msg.get("content") or ""
-            # Reasoner models may put the answer in reasoning_content
-            if is_reasoner and not content.strip():
-                reasoning = msg.get("reasoning_content") or ""
-                # Extract last paragraph as the answer
-                lines = [l.strip() for l in reasoning.strip().split("\n") if l.strip()]
-                content = lines[-1] if lines else ""
-            return content
+        resp = await self._http.post(
+            f"{self._base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self._api_key}",
+                "Content-Type": "application/json",
+            },
+            json=body,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        msg = data["choices"][0]["message"]
+        content = msg.get("content") or ""
+        # Reasoner models may put the answer in reasoning_content
+        if is_reasoner and not content.strip():
+            reasoning = msg.get("reasoning_content") or ""
+            # Extract last paragraph as the answer
+            lines = [l.strip() for l in reasoning.strip().split("\n") if l.strip()]
+            content = lines[-1] if lines else ""
+        return content
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
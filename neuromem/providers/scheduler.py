@@ -0,0 +1,277 @@
+"""LLM call scheduling: shared rate limit, bounded concurrency, priorities and retry."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+PRIORITIES = {"extraction": 0, "reflection": 1, "maintenance": 2}
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "neuromem_llm_priority", default="extraction",
+)
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_MARKERS = ("429", "rate limit", "too many requests", "overloaded", "502", "503")
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run the LLM calls made inside the block with this priority class.
+
+    Tasks created inside the block inherit it. Calls outside any block are
+    scheduled as ``"extraction"``.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {priority!r}, expected one of {list(PRIORITIES)}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    """Priority class of LLM calls made in this context."""
+    return _current_priority.get()
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """Rough token cost of a chat call: ~4 characters per prompt token plus max_tokens."""
+    chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return chars // 4 + max_tokens
+
+
+def _retry_hint(exc: Exception) -> tuple[bool, bool, float | None]:
+    """Classify an LLM error as (retryable, rate_limited, retry_after_seconds)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        retry_after = None
+        if status == 429:
+            try:
+                retry_after = float(exc.response.headers.get("retry-after", ""))
+            except ValueError:
+                pass
+        return status in _RETRYABLE_STATUS, status == 429, retry_after
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True, False, None
+    message = str(exc).lower()
+    rate_limited = "429" in message or "rate limit" in message or "too many requests" in message
+    return rate_limited or any(m in message for m in _RETRYABLE_MARKERS), rate_limited, None
+
+
+class LLMScheduler:
+    """Admission control shared by every LLM call of a NeuroMemory instance.
+
+    Calls wait in a priority queue (``extraction`` before ``reflection``
+    before ``maintenance``, FIFO within a class) until a concurrency slot
+    is free and both token buckets can pay for them: one request from the
+    requests-per-minute bucket and the estimated prompt plus ``max_tokens``
+    from the tokens-per-minute bucket. Unused completion tokens are refunded
+    after the call. Retryable errors (429, 5xx, timeouts) are retried with
+    jittered exponential backoff; a 429 also pauses the whole queue for the
+    backoff delay (or the server's ``Retry-After``), so a rate-limited
+    provider is not hit by every queued call at once.
+
+    Args:
+        requests_per_minute: Request budget (0 = unlimited).
+        tokens_per_minute: Estimated token budget (0 = unlimited).
+        max_concurrency: Calls running at once (0 = unlimited).
+        max_retries: Retries per call after the first attempt.
+        retry_base_delay: Backoff of the first retry in seconds, doubled
+            per attempt and jittered between 50% and 100%.
+        retry_max_delay: Backoff cap in seconds.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self._request_level = float(requests_per_minute)
+        self._token_level = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._running = 0
+        self._waiters: list[tuple[int, int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self._granted = dict.fromkeys(PRIORITIES, 0)
+        self._wait_ms_total = dict.fromkeys(PRIORITIES, 0.0)
+        self._wait_ms_max = dict.fromkeys(PRIORITIES, 0.0)
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[str]],
+        messages: list[dict],
+        max_tokens: int,
+        info: dict[str, Any] | None = None,
+    ) -> str:
+        """Schedule ``call()`` under the current priority, retrying transient errors.
+
+        ``info`` (if given) receives priority, queue_ms (total time spent
+        waiting, including backoff) and retries, also when the call fails.
+        """
+        priority = current_priority()
+        cost = estimate_tokens(messages, max_tokens)
+        if self.tokens_per_minute > 0:
+            cost = min(cost, int(self.tokens_per_minute))
+        info = info if info is not None else {}
+        info.update(priority=priority, queue_ms=0.0, retries=0)
+        attempt = 0
+        while True:
+            info["queue_ms"] += await self._acquire(priority, cost)
+            try:
+                result = await call()
+            except Exception as e:
+                retryable, rate_limited, retry_after = _retry_hint(e)
+                if rate_limited:
+                    self.rate_limited += 1
+                if not retryable or attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt, retry_after)
+                if rate_limited:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                logger.warning(
+                    "LLM call failed (attempt %d/%d, priority=%s), retrying in %.1fs: %s",
+                    attempt + 1, self.max_retries + 1, priority, delay, str(e)[:120],
+                )
+            else:
+                self._refund(max_tokens - len(result or "") // 4)
+                return result
+            finally:
+                self._release()
+            attempt += 1
+            self.retries += 1
+            info["retries"] = attempt
+            started = time.monotonic()
+            await asyncio.sleep(delay)
+            info["queue_ms"] += (time.monotonic() - started) * 1000
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, running calls, wait times (ms) per priority and retry counters."""
+        queued = dict.fromkeys(PRIORITIES, 0)
+        names = {v: k for k, v in PRIORITIES.items()}
+        for rank, _, _, fut in self._waiters:
+            if not fut.done():
+                queued[names[rank]] += 1
+        return {
+            "queued": queued,
+            "running": self._running,
+            "granted": dict(self._granted),
+            "avg_wait_ms": {
+                p: round(self._wait_ms_total[p] / n, 1) if (n := self._granted[p]) else 0.0
+                for p in PRIORITIES
+            },
+            "max_wait_ms": {p: round(v, 1) for p, v in self._wait_ms_max.items()},
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+        }
+
+    async def _acquire(self, priority: str, cost: int) -> float:
+        """Wait for a slot and budget; returns the wait in milliseconds."""
+        started = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._seq), cost, fut))
+        self._pump()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release()  # granted, but the caller went away
+            else:
+                self._pump()  # a cancelled head may have blocked the queue
+            raise
+        waited = (time.monotonic() - started) * 1000
+        self._granted[priority] += 1
+        self._wait_ms_total[priority] += waited
+        self._wait_ms_max[priority] = max(self._wait_ms_max[priority], waited)
+        return round(waited, 1)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._pump()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.requests_per_minute > 0:
+            self._request_level = min(
+                self.requests_per_minute, self._request_level + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute > 0:
+            self._token_level = min(
+                self.tokens_per_minute, self._token_level + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _refund(self, tokens: int) -> None:
+        if self.tokens_per_minute > 0 and tokens > 0:
+            self._refill(time.monotonic())
+            self._token_level = min(self.tokens_per_minute, self._token_level + tokens)
+            self._pump()
+
+    def _pump(self) -> None:
+        """Grant queued calls in priority order while slots and budget allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters:
+            _, _, cost, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_concurrency > 0 and self._running >= self.max_concurrency:
+                return  # _release() pumps again
+            wait = self._paused_until - now
+            if self.requests_per_minute > 0 and self._request_level < 1:
+                wait = max(wait, (1 - self._request_level) * 60 / self.requests_per_minute)
+            if self.tokens_per_minute > 0 and self._token_level < cost:
+                wait = max(wait, (cost - self._token_level) * 60 / self.tokens_per_minute)
+            if wait > 0:
+                # Head of line waits for budget; lower priorities must not overtake it
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+            heapq.heappop(self._waiters)
+            if self.requests_per_minute > 0:
+                self._request_level -= 1
+            if self.tokens_per_minute > 0:
+                self._token_level -= cost
+            self._running += 1
+            fut.set_result(None)
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.retry_max_delay)
+        cap = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return cap * random.uniform(0.5, 1.0)
@@ -2,33 +2,244 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
 from neuromem.providers.embedding import EmbeddingProvider
 
+# Process-wide model registry: model name -> loaded SentenceTransformer
+_models: dict[str, Any] = {}
+_load_locks: dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def get_model(name: str, mmap: bool = False) -> Any:
+    """The process-wide SentenceTransformer for ``name``, loaded on first request.
+
+    Every provider instance (and any other caller) asking for the same model
+    shares one copy of its weights; concurrent first requests load it once.
+    Encoding from several threads is safe (inference only).
+
+    Args:
+        name: sentence-transformers model name or path.
+        mmap: Load safetensors weights memory-mapped (``low_cpu_mem_usage``)
+            instead of reading them into freshly allocated buffers first.
+            Only affects the first load of a model.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _registry_lock:
+        lock = _load_locks.setdefault(name, threading.Lock())
+    with lock:
+        model = _models.get(name)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+
+            kwargs = {}
+            if mmap:
+                kwargs["model_kwargs"] = {"low_cpu_mem_usage": True, "use_safetensors": True}
+            model = _models[name] = SentenceTransformer(name, **kwargs)
+    return model
+
+
+def loaded_models() -> list[str]:
+    """Names of the models currently held by the registry."""
+    return list(_models)
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: list[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
 
 class SentenceTransformerEmbedding(EmbeddingProvider):
     """Local embedding using sentence-transformers (no API calls).
 
+    The model is loaded lazily on first use from the process-wide registry
+    (``get_model()``), so instances of the same model share one copy of the
+    weights. Call ``warmup()`` at startup to load it ahead of the first
+    request. Inference runs on a dedicated worker thread, so the event loop keeps
+    serving other recalls and ingests during a forward pass. Requests
+    arriving while the worker is busy, or within ``max_wait_ms`` of each
+    other, are encoded together in one ``encode()`` call of up to
+    ``max_batch_size`` texts. Vectors are produced as float16;
+    ``embed_array()`` returns them as a NumPy array, ``embed()`` and
+    ``embed_batch()`` as lists (converted on the worker).
+
     Usage:
         embedding = SentenceTransformerEmbedding(model="all-MiniLM-L6-v2")
         # or for multilingual / higher quality:
         embedding = SentenceTransformerEmbedding(model="BAAI/bge-m3")
-    """
 
-    def __init__(self, model: str = "all-MiniLM-L6-v2"):
-        from sentence_transformers import SentenceTransformer
+    Args:
+        model: sentence-transformers model name or path.
+        max_batch_size: Texts per ``encode()`` call.
+        max_wait_ms: How long a request waits for others to join its batch
+            when the worker is idle.
+        num_threads: Intra-op threads used by torch (``torch.set_num_threads``,
+            which applies to the whole process). None keeps torch's default.
+        mmap: Memory-map the weights when this instance triggers the load
+            (see ``get_model()``).
+        dims: Embedding dimension, if known. Lets ``dims`` answer without
+            loading the model (NeuroMemory reads it at construction).
+    """
 
+    def __init__(
+        self,
+        model: str = "all-MiniLM-L6-v2",
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        num_threads: int | None = None,
+        mmap: bool = False,
+        dims: int | None = None,
+    ):
         self._model_name = model
-        self._model = SentenceTransformer(model)
-        self._dims = self._model.get_sentence_embedding_dimension()
+        self.mmap = mmap
+        self._dims = dims
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.num_threads = num_threads
+        self._executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: list[_Request] = []
+        self._queued_texts = 0
+        self._batch_full: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    @property
+    def model(self) -> str:
+        return self._model_name
 
     @property
     def dims(self) -> int:
+        if self._dims is None:
+            self._dims = self._get_model().get_sentence_embedding_dimension()
         return self._dims
 
+    async def warmup(self) -> None:
+        """Load the shared model and run one encode on the worker thread."""
+        await asyncio.get_running_loop().run_in_executor(self._worker(), self._encode, ["warmup"])
+
     async def embed(self, text: str) -> list[float]:
-        vec = self._model.encode(text, normalize_embeddings=True)
-        return vec.tolist()
+        return (await self._submit([text]))[1][0]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        vecs = self._model.encode(texts, normalize_embeddings=True)
-        return vecs.tolist()
+        if not texts:
+            return []
+        return (await self._submit(texts))[1]
+
+    async def embed_array(self, texts: list[str]) -> np.ndarray:
+        """Normalized embeddings as a float16 array of shape (len(texts), dims)."""
+        if not texts:
+            return np.empty((0, self.dims), dtype=np.float16)
+        return (await self._submit(texts))[0]
+
+    async def aclose(self) -> None:
+        """Finish queued requests and stop the worker thread (restarted on next use)."""
+        if self._dispatcher is not None and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _submit(self, texts: list[str]) -> tuple[np.ndarray, list[list[float]]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # State of a previous event loop cannot be awaited from this one
+            self._loop = loop
+            self._queue = []
+            self._queued_texts = 0
+            self._batch_full = asyncio.Event()
+            self._dispatcher = None
+        request = _Request(list(texts), loop.create_future())
+        self._queue.append(request)
+        self._queued_texts += len(request.texts)
+        if self._queued_texts >= self.max_batch_size:
+            self._batch_full.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        return await request.future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._queue:
+            wait = self.max_wait_ms / 1000 - (time.monotonic() - self._queue[0].enqueued_at)
+            if self._queued_texts < self.max_batch_size and wait > 0:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), wait)
+                except TimeoutError:
+                    pass
+            batch = self._take_batch()
+            if not batch:
+                continue
+            texts = [t for r in batch for t in r.texts]
+            try:
+                array, lists = await loop.run_in_executor(self._worker(), self._encode, texts)
+            except Exception as e:
+                for r in batch:
+                    if not r.future.done():
+                        r.future.set_exception(e)
+                continue
+            start = 0
+            for r in batch:
+                end = start + len(r.texts)
+                if not r.future.done():
+                    r.future.set_result((array[start:end], lists[start:end]))
+                start = end
+
+    def _take_batch(self) -> list[_Request]:
+        """Pop queued requests up to max_batch_size texts (at least one request)."""
+        batch: list[_Request] = []
+        size = 0
+        while self._queue:
+            request = self._queue[0]
+            if batch and size + len(request.texts) > self.max_batch_size:
+                break
+            self._queue.pop(0)
+            self._queued_texts -= len(request.texts)
+            if request.future.done():  # caller cancelled
+                continue
+            batch.append(request)
+            size += len(request.texts)
+        if self._queued_texts < self.max_batch_size:
+            self._batch_full.clear()
+        return batch
+
+    def _worker(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="neuromem-embedding",
+                initializer=self._init_worker,
+            )
+        return self._executor
+
+    def _init_worker(self) -> None:
+        if self.num_threads:
+            import torch
+
+            torch.set_num_threads(self.num_threads)
+
+    def _get_model(self) -> Any:
+        return get_model(self._model_name, mmap=self.mmap)
+
+    def _encode(self, texts: list[str]) -> tuple[np.ndarray, list[list[float]]]:
+        """Runs on the worker thread (loads the model on first use)."""
+        vecs = self._get_model().encode(
+            texts,
+            batch_size=self.max_batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        array = np.asarray(vecs, dtype=np.float16).reshape(len(texts), -1)
+        return array, array.tolist()
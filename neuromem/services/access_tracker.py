@@ -0,0 +1,143 @@
+"""Deferred access tracking - batch access_count/last_accessed_at updates."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_SQL = text("""
+    UPDATE memories AS m
+    SET access_count = COALESCE(m.access_count, 0) + u.cnt,
+        last_accessed_at = GREATEST(COALESCE(m.last_accessed_at, u.ts), u.ts)
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:user_ids AS text[]),
+        CAST(:counts AS int[]),
+        CAST(:ts AS timestamptz[])
+    ) AS u(id, user_id, cnt, ts)
+    WHERE m.id = u.id AND m.user_id = u.user_id
+""")
+
+
+class AccessTracker:
+    """Buffers memory access increments in-process and flushes them in batches.
+
+    Reads no longer turn into per-recall row-locking UPDATEs: ``record()`` only
+    touches a dict, and ``flush()`` applies all buffered increments with a
+    single set-based ``UPDATE ... FROM unnest(...)``.
+
+    A flush happens every ``flush_interval`` seconds (background task started
+    lazily on first ``record()``), as soon as the buffer holds
+    ``max_buffer_size`` distinct memories, and on ``close()``. Increments of
+    a failed flush stay buffered and are retried by the next one.
+
+    Args:
+        db: Database used to open flush sessions.
+        flush_interval: Seconds between periodic flushes (0 = only flush on
+            buffer overflow and close).
+        max_buffer_size: Distinct memory ids buffered before an early flush.
+    """
+
+    def __init__(self, db, flush_interval: float = 5.0, max_buffer_size: int = 1000):
+        self._db = db
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        # memory_id -> [user_id, count, last_accessed_at]
+        self._buffer: dict[str, list] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._overflow_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, user_id: str, ids: list[str]) -> None:
+        """Buffer one access for each memory id (no I/O)."""
+        if not ids:
+            return
+        now = datetime.now(timezone.utc)
+        for mid in ids:
+            entry = self._buffer.get(mid)
+            if entry is None:
+                self._buffer[mid] = [user_id, 1, now]
+            else:
+                entry[1] += 1
+                entry[2] = now
+
+        if self._closed:
+            return
+        self._ensure_flush_loop()
+        if len(self._buffer) >= self.max_buffer_size and (
+            self._overflow_task is None or self._overflow_task.done()
+        ):
+            self._overflow_task = asyncio.create_task(self.flush())
+
+    def _ensure_flush_loop(self) -> None:
+        if self.flush_interval <= 0:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # shield: cancelling the loop must not abort a flush mid-write
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> int:
+        """Write buffered increments to the database. Returns memories updated."""
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            pending, self._buffer = self._buffer, {}
+            ids, user_ids, counts, stamps = [], [], [], []
+            for mid, (user_id, count, ts) in pending.items():
+                ids.append(mid)
+                user_ids.append(user_id)
+                counts.append(count)
+                stamps.append(ts)
+            try:
+                # Access bookkeeping must not invalidate recall caches
+                async with self._db.session(track_writes=False) as session:
+                    await session.execute(
+                        _FLUSH_SQL,
+                        {"ids": ids, "user_ids": user_ids, "counts": counts, "ts": stamps},
+                    )
+            except Exception as e:
+                logger.warning("Failed to flush access tracking (%d memories): %s", len(ids), e)
+                self._requeue(pending)
+                return 0
+            logger.debug("Flushed access tracking for %d memories", len(ids))
+            return len(ids)
+
+    def _requeue(self, pending: dict[str, list]) -> None:
+        """Merge increments of a failed flush back into the buffer for the next one."""
+        for mid, (user_id, count, ts) in pending.items():
+            entry = self._buffer.get(mid)
+            if entry is None:
+                self._buffer[mid] = [user_id, count, ts]
+            else:
+                entry[1] += count
+                entry[2] = max(entry[2], ts)
+
+    async def close(self) -> None:
+        """Stop the periodic flush and write out everything still buffered."""
+        self._closed = True
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        if self._overflow_task is not None:
+            await asyncio.gather(self._overflow_task, return_exceptions=True)
+        self._flush_task = None
+        self._overflow_task = None
+        # Serialized by the lock, so this runs after any in-flight flush
+        await self.flush()
@@ -6,6 +6,7 @@ import logging
 import math
 
 from neuromem.providers.embedding import EmbeddingProvider
+from neuromem.services.pattern_matcher import PatternMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -159,6 +160,12 @@ CONTEXT_KEYWORDS: dict[str, set[str]] = {
                  "principle", "textbook"},
 }
 
+_KEYWORD_CONTEXTS: dict[str, list[str]] = {}
+for _ctx, _keywords in CONTEXT_KEYWORDS.items():
+    for _kw in _keywords:
+        _KEYWORD_CONTEXTS.setdefault(_kw, []).append(_ctx)
+_CONTEXT_KEYWORD_MATCHER = PatternMatcher(_KEYWORD_CONTEXTS, ignore_case=True)
+
 
 def cosine_similarity(a: list[float], b: list[float]) -> float:
     """Compute cosine similarity between two vectors (pure Python)."""
@@ -267,12 +274,10 @@ class ContextService:
         if not query_text:
             return None
 
-        query_lower = query_text.lower()
         scores: dict[str, int] = {}
-        for ctx, keywords in CONTEXT_KEYWORDS.items():
-            count = sum(1 for kw in keywords if kw.lower() in query_lower)
-            if count > 0:
-                scores[ctx] = count
+        for kw in _CONTEXT_KEYWORD_MATCHER.find(query_text):
+            for ctx in _KEYWORD_CONTEXTS[kw]:
+                scores[ctx] = scores.get(ctx, 0) + 1
 
         if not scores:
             return None
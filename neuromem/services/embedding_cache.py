@@ -0,0 +1,178 @@
+"""Persistent embedding cache - provider vectors stored in Postgres, shared across processes."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+from neuromem.providers.embedding import EmbeddingProvider
+
+if TYPE_CHECKING:
+    from neuromem.db import Database
+
+logger = logging.getLogger(__name__)
+
+# Hits refresh last_used_at at most this often (seconds), to keep lookups
+# from writing on every call
+_TOUCH_INTERVAL = 3600
+
+
+def content_hash(text_: str) -> str:
+    """Cache key of a text: sha256 hex digest of its UTF-8 encoding."""
+    return hashlib.sha256(text_.encode("utf-8")).hexdigest()
+
+
+class PersistentEmbeddingCache(EmbeddingProvider):
+    """Proxy that serves embeddings from the ``embedding_cache`` table.
+
+    Entries are keyed by (model, dims, sha256 of the text), so identical
+    content is embedded once across restarts, workers and re-extraction
+    runs. Each ``embed_batch()`` costs one lookup statement; only the
+    misses reach the provider, and their vectors are written back in one
+    INSERT. When the table grows past ``max_entries`` the least recently
+    used entries are deleted (checked every ``max_entries // 10`` inserts).
+
+    Database errors never fail an embedding call: the cache is bypassed
+    and the error counted.
+
+    Args:
+        inner: The provider to call on misses.
+        db: Database holding the ``embedding_cache`` table (created by init()).
+        max_entries: Size bound across all models.
+        model: Cache namespace, normally the embedding model name; defaults
+            to the provider's ``model`` attribute.
+
+    Raises:
+        ValueError: No model name was given and the provider has no ``model``
+            attribute (vectors of different models must never share keys).
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingProvider,
+        db: Database,
+        max_entries: int = 100_000,
+        model: str | None = None,
+    ):
+        self._inner = inner
+        self._db = db
+        if hasattr(inner, "model"):
+            self.model = inner.model
+        self.namespace = model or getattr(inner, "model", None)
+        if not self.namespace:
+            raise ValueError(
+                f"Cannot determine the embedding model of {type(inner).__name__} for the "
+                "persistent embedding cache; give the provider a `model` attribute"
+            )
+        self.max_entries = max_entries
+        self._evict_every = max(1, max_entries // 10)
+        self._inserted_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @property
+    def dims(self) -> int:
+        return self._inner.dims
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    async def embed(self, text_: str) -> list[float]:
+        return (await self.embed_batch([text_]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        hashes = {t: content_hash(t) for t in texts}
+        cached = await self._lookup(list(set(hashes.values())))
+
+        missing = list(dict.fromkeys(t for t in texts if hashes[t] not in cached))
+        self.hits += len(texts) - sum(1 for t in texts if hashes[t] not in cached)
+        self.misses += len(missing)
+        if missing:
+            vectors = await self._inner.embed_batch(missing)
+            fresh = {hashes[t]: list(v) for t, v in zip(missing, vectors)}
+            await self._store(fresh)
+            cached.update(fresh)
+        return [cached[hashes[t]] for t in texts]
+
+    async def _lookup(self, keys: list[str]) -> dict[str, list[float]]:
+        try:
+            async with self._db.engine.begin() as conn:
+                rows = (await conn.execute(
+                    text(f"""
+                        WITH hit AS (
+                            SELECT content_hash, embedding, last_used_at
+                            FROM embedding_cache
+                            WHERE model = :model AND dims = :dims
+                              AND content_hash = ANY(CAST(:keys AS varchar[]))
+                        ), touched AS (
+                            UPDATE embedding_cache e SET last_used_at = NOW()
+                            FROM hit
+                            WHERE e.model = :model AND e.dims = :dims
+                              AND e.content_hash = hit.content_hash
+                              AND hit.last_used_at < NOW() - INTERVAL '{_TOUCH_INTERVAL} seconds'
+                        )
+                        SELECT content_hash, embedding FROM hit
+                    """),
+                    {"model": self.namespace, "dims": self.dims, "keys": keys},
+                )).fetchall()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Embedding cache lookup failed: %s", e)
+            return {}
+        return {row.content_hash: list(row.embedding) for row in rows}
+
+    async def _store(self, vectors: dict[str, list[float]]) -> None:
+        try:
+            async with self._db.engine.begin() as conn:
+                await conn.execute(
+                    text("""
+                        INSERT INTO embedding_cache (model, dims, content_hash, embedding)
+                        VALUES (:model, :dims, :key, CAST(:embedding AS real[]))
+                        ON CONFLICT (model, dims, content_hash) DO NOTHING
+                    """),
+                    [
+                        {"model": self.namespace, "dims": self.dims, "key": key, "embedding": vector}
+                        for key, vector in vectors.items()
+                    ],
+                )
+                self.writes += len(vectors)
+                self._inserted_since_evict += len(vectors)
+                if self._inserted_since_evict >= self._evict_every:
+                    self._inserted_since_evict = 0
+                    result = await conn.execute(
+                        text("""
+                            DELETE FROM embedding_cache
+                            WHERE (model, dims, content_hash) IN (
+                                SELECT model, dims, content_hash FROM embedding_cache
+                                ORDER BY last_used_at DESC
+                                OFFSET :max_entries
+                            )
+                        """),
+                        {"max_entries": self.max_entries},
+                    )
+                    self.evictions += result.rowcount or 0
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Embedding cache write failed: %s", e)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/write/eviction/error counters of this process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "max_entries": self.max_entries,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
@@ -0,0 +1,124 @@
+"""Per-user graph entity dictionary - which known entities occur in a query."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from neuromem.services.pattern_matcher import PatternMatcher
+
+# Entities added since the matcher was built are scanned one by one until
+# there are this many, then the matcher is rebuilt with them folded in.
+_REBUILD_PENDING = 64
+
+
+def _recallable(node_id: str) -> bool:
+    """Node ids graph recall may match (the ``user`` placeholder and
+    single-character ids are never matched)."""
+    return node_id != "user" and len(node_id) > 1
+
+
+def match_entities(node_ids: Iterable[str], text: str) -> set[str]:
+    """Uncached ``EntityDictionary.match`` over an explicit id list."""
+    return PatternMatcher(n for n in node_ids if _recallable(n)).find(text)
+
+
+class _UserEntities:
+    __slots__ = ("ids", "matcher", "pending", "loaded_at")
+
+    def __init__(self, ids: set[str]):
+        self.ids = ids
+        self.matcher = PatternMatcher(ids)
+        self.pending: set[str] = set()
+        self.loaded_at = time.monotonic()
+
+
+class EntityDictionary:
+    """In-process cache of each user's graph node ids with a compiled matcher.
+
+    ``match`` answers "which of the user's entities occur in this text"
+    without a database round trip. A user's ids are loaded once (``load``),
+    kept current by ``add`` as nodes are committed in this process and
+    dropped by ``invalidate`` on deletes. Entries expire after ``ttl`` so
+    nodes written by other processes are picked up eventually.
+
+    Loads race with writes: take ``epoch(user_id)`` before querying the
+    node ids and pass it to ``load``; a load that overlapped an ``add`` or
+    ``invalidate`` for the user is discarded.
+
+    Args:
+        max_users: Users kept (LRU eviction). 0 disables caching.
+        ttl: Seconds before a user's entities are reloaded. 0 = no TTL.
+    """
+
+    def __init__(self, max_users: int = 1024, ttl: float = 300.0):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _UserEntities] = OrderedDict()
+        # Per-user epochs come from one clock; ``_floor`` covers users whose
+        # epoch was dropped by a full invalidation.
+        self._clock = 0
+        self._floor = 0
+        self._epochs: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def epoch(self, user_id: str) -> int:
+        """Change counter for the user's entities (see ``load``)."""
+        return max(self._epochs.get(user_id, 0), self._floor)
+
+    def _bump(self, user_id: str) -> None:
+        self._clock += 1
+        self._epochs[user_id] = self._clock
+
+    def match(self, user_id: str, text: str) -> set[str] | None:
+        """Entity ids occurring in ``text``, or None when the user is not loaded."""
+        entry = self._entries.get(user_id)
+        if entry is None or (self.ttl and time.monotonic() - entry.loaded_at > self.ttl):
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        found = entry.matcher.find(text)
+        found.update(node_id for node_id in entry.pending if node_id in text)
+        return found
+
+    def load(self, user_id: str, node_ids: Iterable[str], epoch: int) -> None:
+        """Install the user's full entity set, read while ``epoch`` was current."""
+        if self.max_users <= 0 or epoch != self.epoch(user_id):
+            return
+        self._entries[user_id] = _UserEntities({n for n in node_ids if _recallable(n)})
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def add(self, user_id: str, node_ids: Iterable[str]) -> None:
+        """Record committed new nodes for the user."""
+        self._bump(user_id)
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        new_ids = {n for n in node_ids if _recallable(n)} - entry.ids
+        if not new_ids:
+            return
+        entry.ids |= new_ids
+        entry.pending |= new_ids
+        if len(entry.pending) >= _REBUILD_PENDING:
+            entry.matcher = PatternMatcher(entry.ids)
+            entry.pending = set()
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Drop cached entities for one user (or all users)."""
+        if user_id is None:
+            self._clock += 1
+            self._floor = self._clock
+            self._entries.clear()
+            self._epochs.clear()
+            return
+        self._bump(user_id)
+        self._entries.pop(user_id, None)
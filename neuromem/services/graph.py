@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from typing import Any, Optional
 
-from sqlalchemy import delete, or_, select
+from sqlalchemy import delete, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from neuromem.models.graph import EdgeType, GraphEdge, GraphNode, NodeType
@@ -165,63 +165,214 @@ class GraphService:
         max_depth: int = 3,
         user_id: Optional[str] = None,
     ) -> list[dict]:
-        """Find shortest path between two nodes using BFS on relational tables."""
+        """Find a shortest path between two nodes (edges followed in both directions).
+
+        Bidirectional BFS: each step expands the smaller frontier by one hop
+        with a single set-based query, so a path of length d costs at most d
+        round trips regardless of how many nodes are visited.
+        """
         effective_user_id = self._effective_user_id(user_id)
 
         if not isinstance(max_depth, int) or max_depth < 1 or max_depth > 10:
             raise ValueError("max_depth must be an integer between 1 and 10")
 
-        visited = set()
-        queue = [(source_type.value, source_id, [])]
-        visited.add((source_type.value, source_id))
+        start = (source_type.value, source_id)
+        goal = (target_type.value, target_id)
+        if start == goal:
+            return [{"nodes": [{"type": start[0], "id": start[1]}], "rels": []}]
+
+        # node -> (depth, previous node, edge) per side; previous points back toward its root
+        forward: dict[tuple[str, str], tuple[int, tuple[str, str] | None, dict | None]] = {start: (0, None, None)}
+        backward: dict[tuple[str, str], tuple[int, tuple[str, str] | None, dict | None]] = {goal: (0, None, None)}
+        forward_frontier, backward_frontier = {start}, {goal}
+        forward_depth = backward_depth = 0
+
+        while forward_frontier and backward_frontier and forward_depth + backward_depth < max_depth:
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            visited, other = (forward, backward) if expand_forward else (backward, forward)
+            frontier = forward_frontier if expand_forward else backward_frontier
+            depth = (forward_depth if expand_forward else backward_depth) + 1
+
+            next_frontier: set[tuple[str, str]] = set()
+            for node, neighbor, edge in await self._expand_frontier(effective_user_id, frontier):
+                if neighbor not in visited:
+                    visited[neighbor] = (depth, node, edge)
+                    next_frontier.add(neighbor)
+
+            meets = next_frontier & other.keys()
+            if meets:
+                meet = min(meets, key=lambda n: other[n][0])
+                return [self._join_path(forward, backward, meet)]
+
+            if expand_forward:
+                forward_frontier, forward_depth = next_frontier, depth
+            else:
+                backward_frontier, backward_depth = next_frontier, depth
 
-        while queue:
-            current_type, current_id, path = queue.pop(0)
+        return []  # No path found
 
-            if current_type == target_type.value and current_id == target_id:
-                return [{"nodes": [step["node"] for step in path] + [{"type": current_type, "id": current_id}],
-                         "rels": [step["edge"] for step in path]}]
+    async def _expand_frontier(
+        self, user_id: str, frontier: set[tuple[str, str]],
+    ) -> list[tuple[tuple[str, str], tuple[str, str], dict]]:
+        """All edges touching ``frontier`` as (frontier node, neighbor, edge), one query."""
+        types, ids = zip(*frontier)
+        rows = (await self.db.execute(
+            text("""
+                WITH f(node_type, node_id) AS (
+                    SELECT * FROM unnest(CAST(:types AS text[]), CAST(:ids AS text[]))
+                )
+                SELECT TRUE AS outgoing, e.source_type, e.source_id, e.edge_type,
+                       e.target_type, e.target_id, e.properties
+                FROM f JOIN graph_edges e
+                  ON e.user_id = :uid AND e.source_type = f.node_type AND e.source_id = f.node_id
+                UNION ALL
+                SELECT FALSE, e.source_type, e.source_id, e.edge_type,
+                       e.target_type, e.target_id, e.properties
+                FROM f JOIN graph_edges e
+                  ON e.user_id = :uid AND e.target_type = f.node_type AND e.target_id = f.node_id
+            """),
+            {"uid": user_id, "types": list(types), "ids": list(ids)},
+        )).fetchall()
+        expanded = []
+        for row in rows:
+            source, target = (row.source_type, row.source_id), (row.target_type, row.target_id)
+            edge = {"type": row.edge_type, "props": row.properties}
+            expanded.append((source, target, edge) if row.outgoing else (target, source, edge))
+        return expanded
+
+    @staticmethod
+    def _join_path(forward: dict, backward: dict, meet: tuple[str, str]) -> dict:
+        """Stitch the two BFS trees at ``meet`` into a source -> target path."""
+        head: list[tuple[tuple[str, str], dict | None]] = []
+        node: tuple[str, str] | None = meet
+        while node is not None:
+            _, prev, edge = forward[node]
+            head.append((node, edge))
+            node = prev
+        head.reverse()  # source first; each entry carries the edge that reached it
+
+        nodes = [n for n, _ in head]
+        rels = [edge for _, edge in head[1:]]
+        node = meet
+        while True:
+            _, nxt, edge = backward[node]
+            if nxt is None:
+                break
+            nodes.append(nxt)
+            rels.append(edge)
+            node = nxt
+        return {"nodes": [{"type": t, "id": i} for t, i in nodes], "rels": rels}
+
+    async def k_hop_neighbors(
+        self,
+        node_type: NodeType,
+        node_id: str,
+        k: int = 2,
+        edge_types: list[EdgeType] | None = None,
+        limit: int = 100,
+        user_id: Optional[str] = None,
+    ) -> dict:
+        """Subgraph within ``k`` hops of a node (edges followed in both directions).
+
+        Traversal runs server-side as one recursive query; a second query
+        returns the edges among the reached nodes.
+
+        Returns:
+            {"nodes": [{"node_type", "node_id", "depth", "properties"}, ...],
+             "edges": [{"source_type", "source_id", "rel_type", "target_type",
+                        "target_id", "rel_props"}, ...]}
+            Nodes are ordered by hop distance (the start node has depth 0);
+            at most ``limit`` nodes besides the start node are returned.
+        """
+        effective_user_id = self._effective_user_id(user_id)
 
-            if len(path) >= max_depth:
-                continue
+        if not isinstance(k, int) or k < 1 or k > 10:
+            raise ValueError("k must be an integer between 1 and 10")
 
-            # Get outgoing edges
-            result = await self.db.execute(
-                select(GraphEdge).where(
-                    GraphEdge.user_id == effective_user_id,
-                    GraphEdge.source_type == current_type,
-                    GraphEdge.source_id == current_id,
+        params: dict[str, Any] = {
+            "uid": effective_user_id, "node_type": node_type.value, "node_id": node_id,
+            "k": k, "limit": limit + 1,
+        }
+        type_filter = ""
+        if edge_types:
+            type_filter = "AND edge_type = ANY(CAST(:edge_types AS text[]))"
+            params["edge_types"] = [et.value for et in edge_types]
+
+        # UNION keeps each (node, depth) once, bounding the walk by nodes * k
+        node_rows = (await self.db.execute(
+            text(f"""
+                WITH RECURSIVE walk(node_type, node_id, depth) AS (
+                    SELECT CAST(:node_type AS varchar), CAST(:node_id AS varchar), 0
+                    UNION
+                    SELECT CAST(n.node_type AS varchar), CAST(n.node_id AS varchar), w.depth + 1
+                    FROM walk w
+                    CROSS JOIN LATERAL (
+                        SELECT target_type AS node_type, target_id AS node_id FROM graph_edges
+                        WHERE user_id = :uid AND source_type = w.node_type
+                          AND source_id = w.node_id {type_filter}
+                        UNION ALL
+                        SELECT source_type, source_id FROM graph_edges
+                        WHERE user_id = :uid AND target_type = w.node_type
+                          AND target_id = w.node_id {type_filter}
+                    ) n
+                    WHERE w.depth < :k
+                ),
+                reached AS (
+                    SELECT node_type, node_id, MIN(depth) AS depth
+                    FROM walk
+                    GROUP BY node_type, node_id
+                    ORDER BY MIN(depth), node_type, node_id
+                    LIMIT :limit
                 )
-            )
-            for edge in result.scalars().all():
-                neighbor_key = (edge.target_type, edge.target_id)
-                if neighbor_key not in visited:
-                    visited.add(neighbor_key)
-                    new_path = path + [{
-                        "node": {"type": current_type, "id": current_id},
-                        "edge": {"type": edge.edge_type, "props": edge.properties},
-                    }]
-                    queue.append((edge.target_type, edge.target_id, new_path))
-
-            # Get incoming edges
-            result = await self.db.execute(
-                select(GraphEdge).where(
-                    GraphEdge.user_id == effective_user_id,
-                    GraphEdge.target_type == current_type,
-                    GraphEdge.target_id == current_id,
+                SELECT r.node_type, r.node_id, r.depth, gn.properties
+                FROM reached r
+                LEFT JOIN graph_nodes gn
+                  ON gn.user_id = :uid AND gn.node_type = r.node_type AND gn.node_id = r.node_id
+                ORDER BY r.depth, r.node_type, r.node_id
+            """),
+            params,
+        )).fetchall()
+
+        nodes = [
+            {"node_type": r.node_type, "node_id": r.node_id, "depth": r.depth, "properties": r.properties}
+            for r in node_rows
+        ]
+        if len(nodes) < 2:
+            return {"nodes": nodes, "edges": []}
+
+        edge_params: dict[str, Any] = {
+            "uid": effective_user_id,
+            "types": [n["node_type"] for n in nodes],
+            "ids": [n["node_id"] for n in nodes],
+        }
+        if edge_types:
+            edge_params["edge_types"] = params["edge_types"]
+        edge_rows = (await self.db.execute(
+            text(f"""
+                WITH r(node_type, node_id) AS (
+                    SELECT * FROM unnest(CAST(:types AS text[]), CAST(:ids AS text[]))
                 )
-            )
-            for edge in result.scalars().all():
-                neighbor_key = (edge.source_type, edge.source_id)
-                if neighbor_key not in visited:
-                    visited.add(neighbor_key)
-                    new_path = path + [{
-                        "node": {"type": current_type, "id": current_id},
-                        "edge": {"type": edge.edge_type, "props": edge.properties},
-                    }]
-                    queue.append((edge.source_type, edge.source_id, new_path))
-
-        return []  # No path found
+                SELECT source_type, source_id, edge_type, target_type, target_id, properties
+                FROM graph_edges e
+                JOIN r s ON s.node_type = e.source_type AND s.node_id = e.source_id
+                JOIN r t ON t.node_type = e.target_type AND t.node_id = e.target_id
+                WHERE e.user_id = :uid {type_filter}
+            """),
+            edge_params,
+        )).fetchall()
+
+        edges = []
+        for e in edge_rows:
+            props = e.properties or {}
+            edges.append({
+                "source_type": e.source_type,
+                "source_id": e.source_id,
+                "rel_type": props.get("relation_name") if e.edge_type == "CUSTOM" else e.edge_type,
+                "target_type": e.target_type,
+                "target_id": e.target_id,
+                "rel_props": props,
+            })
+        return {"nodes": nodes, "edges": edges}
 
     async def get_node(
         self,
@@ -6,7 +6,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import or_, select, text
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from neuromem.models.graph import EdgeType, GraphEdge, GraphNode, NodeType
@@ -66,6 +66,17 @@ def _normalize_node_id(name: str) -> str:
     return name.strip().lower().replace(" ", "_")
 
 
+def _validity_filter(params: dict[str, Any], as_of: datetime | None) -> str:
+    """SQL predicate on graph_edges validity columns (active now, or at ``as_of``)."""
+    if as_of is None:
+        return "valid_until IS NULL"
+    params["as_of"] = as_of
+    return (
+        "(valid_from IS NULL OR valid_from <= :as_of)"
+        " AND (valid_until IS NULL OR valid_until > :as_of)"
+    )
+
+
 def _resolve_node_type(type_str: str) -> NodeType:
     """Map an LLM-extracted type string to a NodeType enum."""
     return _NODE_TYPE_MAP.get(type_str.lower(), NodeType.ENTITY)
@@ -202,8 +213,8 @@ class GraphMemoryService:
     ) -> bool:
         """Store a single pre-parsed triple. Returns True if edge was created or updated."""
         content = triple.get("content", "")
-        confidence = triple.get("confidence", 1.0)
-        now = datetime.now(timezone.utc).isoformat()
+        confidence = float(triple.get("confidence", 1.0))
+        now = datetime.now(timezone.utc)
 
         action = await self._resolve_conflict(user_id, stype, sid, etype, otype, oid, content)
 
@@ -213,12 +224,7 @@ class GraphMemoryService:
         if action == "UPDATE":
             await self._invalidate_existing_edges(user_id, stype, sid, etype, now)
 
-        edge_props: dict[str, Any] = {
-            "content": content,
-            "confidence": confidence,
-            "valid_from": now,
-            "valid_until": None,
-        }
+        edge_props: dict[str, Any] = {"content": content}
         if etype == EdgeType.CUSTOM:
             edge_props["relation_name"] = relation
 
@@ -230,6 +236,9 @@ class GraphMemoryService:
             target_type=otype.value,
             target_id=oid,
             properties=edge_props,
+            valid_from=now,
+            valid_until=None,
+            confidence=confidence,
         ))
         return True
 
@@ -287,7 +296,7 @@ class GraphMemoryService:
                 GraphEdge.source_type == subject_type.value,
                 GraphEdge.source_id == subject_id,
                 GraphEdge.edge_type == edge_type.value,
-                text("(properties->>'valid_until') IS NULL"),
+                GraphEdge.valid_until.is_(None),
             )
         )
         active = result.scalars().all()
@@ -309,7 +318,7 @@ class GraphMemoryService:
         source_type: NodeType,
         source_id: str,
         edge_type: EdgeType,
-        now: str,
+        now: datetime,
     ) -> None:
         """Mark all active edges with given source+relation as invalid."""
         result = await self.db.execute(
@@ -318,12 +327,11 @@ class GraphMemoryService:
                 GraphEdge.source_type == source_type.value,
                 GraphEdge.source_id == source_id,
                 GraphEdge.edge_type == edge_type.value,
-                text("(properties->>'valid_until') IS NULL"),
+                GraphEdge.valid_until.is_(None),
             )
         )
         for edge in result.scalars().all():
-            props = edge.properties or {}
-            edge.properties = {**props, "valid_until": now}
+            edge.valid_until = now
 
     async def find_entity_facts(
         self,
@@ -338,66 +346,174 @@ class GraphMemoryService:
         Only returns edges where valid_until is None (active), or
         edges valid at the as_of time point for time-travel queries.
         """
-        node_id = _normalize_node_id(entity_name)
+        return await self.find_entities_facts(user_id, [entity_name], limit, as_of=as_of)
 
-        # Time-travel filter on graph edge properties
-        if as_of is not None:
-            time_filter = text(
-                "(properties->>'valid_from' IS NULL OR (properties->>'valid_from')::timestamptz <= :as_of)"
-                " AND (properties->>'valid_until' IS NULL OR (properties->>'valid_until')::timestamptz > :as_of)"
-            )
-        else:
-            time_filter = text("(properties->>'valid_until') IS NULL")
-
-        # Single query covers both outgoing and incoming edges
-        query = select(GraphEdge).where(
-            GraphEdge.user_id == user_id,
-            or_(GraphEdge.source_id == node_id, GraphEdge.target_id == node_id),
-            time_filter,
-        ).limit(limit)
-        if as_of is not None:
-            query = query.params(as_of=as_of)
-        result = await self.db.execute(query)
-        edges = result.scalars().all()
-
-        if not edges:
-            return []
-
-        # Batch-fetch node display names to replace raw IDs (e.g. UUIDs for user nodes)
-        all_node_ids = {e.source_id for e in edges} | {e.target_id for e in edges}
-        node_result = await self.db.execute(
-            select(GraphNode.node_id, GraphNode.properties).where(
-                GraphNode.user_id == user_id,
-                GraphNode.node_id.in_(all_node_ids),
-            )
-        )
-        node_name_map: dict[str, str] = {}
-        for row in node_result.fetchall():
-            props = row.properties or {}
-            name = props.get("name")
-            if name:
-                node_name_map[row.node_id] = name
+    async def find_entities_facts(
+        self,
+        user_id: str,
+        entity_names: list[str],
+        limit: int = 20,
+        as_of: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Active facts for several entities in one round trip.
+
+        Each entity contributes at most ``limit`` edges, as with
+        find_entity_facts. Facts come back in entity order; a fact reached
+        from two entities is returned once.
+        """
+        facts = await self.find_users_entities_facts({user_id: entity_names}, limit, as_of=as_of)
+        return facts[user_id]
+
+    async def find_users_entities_facts(
+        self,
+        entity_names_by_user: dict[str, list[str]],
+        limit: int = 20,
+        as_of: datetime | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """find_entities_facts() for several users' entities in one round trip.
 
-        results: list[dict[str, Any]] = []
-        for edge in edges:
-            props = edge.properties or {}
+        Returns:
+            {user_id: facts} with an entry for every user in the mapping.
+        """
+        results: dict[str, list[dict[str, Any]]] = {uid: [] for uid in entity_names_by_user}
+        user_ids: list[str] = []
+        node_ids: list[str] = []
+        for uid, names in entity_names_by_user.items():
+            for node_id in dict.fromkeys(_normalize_node_id(name) for name in names):
+                user_ids.append(uid)
+                node_ids.append(node_id)
+        if not node_ids:
+            return results
+
+        # Per-entity LATERAL covers outgoing and incoming edges; node display
+        # names (e.g. for UUID user nodes) are joined in the same statement
+        params: dict[str, Any] = {"user_ids": user_ids, "node_ids": node_ids, "limit": limit}
+        time_filter = _validity_filter(params, as_of)
+        rows = (await self.db.execute(
+            text(f"""
+                SELECT ent.user_id AS owner_id,
+                       e.source_type, e.source_id, e.edge_type, e.target_type, e.target_id,
+                       e.properties, e.valid_from, e.confidence,
+                       src.name AS source_name, tgt.name AS target_name
+                FROM unnest(CAST(:user_ids AS text[]), CAST(:node_ids AS text[]))
+                     WITH ORDINALITY AS ent(user_id, node_id, ord)
+                CROSS JOIN LATERAL (
+                    SELECT source_type, source_id, edge_type, target_type, target_id,
+                           properties, valid_from, confidence
+                    FROM graph_edges
+                    WHERE user_id = ent.user_id
+                      AND (source_id = ent.node_id OR target_id = ent.node_id)
+                      AND {time_filter}
+                    LIMIT :limit
+                ) e
+                LEFT JOIN LATERAL (
+                    SELECT properties->>'name' AS name FROM graph_nodes
+                    WHERE user_id = ent.user_id AND node_id = e.source_id AND properties ? 'name'
+                    LIMIT 1
+                ) src ON TRUE
+                LEFT JOIN LATERAL (
+                    SELECT properties->>'name' AS name FROM graph_nodes
+                    WHERE user_id = ent.user_id AND node_id = e.target_id AND properties ? 'name'
+                    LIMIT 1
+                ) tgt ON TRUE
+                ORDER BY ent.ord
+            """),
+            params,
+        )).fetchall()
+
+        seen: dict[str, set[tuple[str, str, str]]] = {uid: set() for uid in results}
+        for row in rows:
+            props = row.properties or {}
             # Use readable name if available, fall back to raw ID
-            subject = node_name_map.get(edge.source_id, edge.source_id)
-            obj = node_name_map.get(edge.target_id, edge.target_id)
+            subject = row.source_name or row.source_id
+            obj = row.target_name or row.target_id
             # Use original relation string for CUSTOM edges
-            if edge.edge_type == EdgeType.CUSTOM.value:
-                relation = props.get("relation_name") or edge.edge_type
+            if row.edge_type == EdgeType.CUSTOM.value:
+                relation = props.get("relation_name") or row.edge_type
             else:
-                relation = edge.edge_type
-            results.append({
+                relation = row.edge_type
+            key = (subject, relation, obj)
+            if key in seen[row.owner_id]:
+                continue
+            seen[row.owner_id].add(key)
+            results[row.owner_id].append({
                 "subject": subject,
-                "subject_type": edge.source_type,
+                "subject_type": row.source_type,
                 "relation": relation,
                 "object": obj,
-                "object_type": edge.target_type,
+                "object_type": row.target_type,
                 "content": props.get("content", ""),
-                "confidence": props.get("confidence", 1.0),
-                "valid_from": props.get("valid_from"),
+                "confidence": row.confidence if row.confidence is not None else 1.0,
+                "valid_from": row.valid_from.isoformat() if row.valid_from else None,
             })
 
         return results
+
+    async def spread_activation(
+        self,
+        user_id: str,
+        seed_names: list[str],
+        hops: int = 2,
+        decay: float = 0.5,
+        fanout: int = 5,
+        max_nodes: int = 20,
+        as_of: datetime | None = None,
+    ) -> dict[str, float]:
+        """Bounded spreading activation from seed entities, in one statement.
+
+        Seeds start at activation 1.0. Each hop passes ``activation * decay *
+        edge confidence`` along at most ``fanout`` edges per node (most
+        confident first, either direction, no revisits within a path).
+        Activation arriving over several paths is summed. The user's own
+        node is never entered: it links every fact and would activate all
+        of them. Work is bounded by ``len(seeds) * fanout ** hops`` rows.
+
+        Returns:
+            {node_id: activation} for at most ``max_nodes`` non-seed nodes,
+            strongest first.
+        """
+        seeds = list(dict.fromkeys(_normalize_node_id(name) for name in seed_names))
+        if not seeds or hops <= 0 or max_nodes <= 0:
+            return {}
+
+        params: dict[str, Any] = {
+            "uid": user_id, "user_node": user_id, "seeds": seeds, "hops": hops,
+            "decay": decay, "fanout": fanout, "max_nodes": max_nodes,
+        }
+        time_filter = _validity_filter(params, as_of)
+        rows = (await self.db.execute(
+            text(f"""
+                WITH RECURSIVE spread(node_id, hop, activation, path) AS (
+                    SELECT CAST(s AS varchar), 0, CAST(1.0 AS float8), ARRAY[CAST(s AS varchar)]
+                    FROM unnest(CAST(:seeds AS text[])) AS s
+                    UNION ALL
+                    SELECT nb.node_id, sp.hop + 1,
+                           sp.activation * :decay * nb.confidence, sp.path || nb.node_id
+                    FROM spread sp
+                    CROSS JOIN LATERAL (
+                        SELECT node_id, confidence FROM (
+                            SELECT CAST(target_id AS varchar) AS node_id,
+                                   CAST(COALESCE(confidence, 1.0) AS float8) AS confidence
+                            FROM graph_edges
+                            WHERE user_id = :uid AND source_id = sp.node_id AND {time_filter}
+                            UNION ALL
+                            SELECT CAST(source_id AS varchar), CAST(COALESCE(confidence, 1.0) AS float8)
+                            FROM graph_edges
+                            WHERE user_id = :uid AND target_id = sp.node_id AND {time_filter}
+                        ) edges
+                        WHERE edges.node_id <> :user_node AND NOT edges.node_id = ANY(sp.path)
+                        ORDER BY confidence DESC
+                        LIMIT :fanout
+                    ) nb
+                    WHERE sp.hop < :hops
+                )
+                SELECT node_id, SUM(activation) AS activation
+                FROM spread
+                WHERE hop > 0 AND NOT node_id = ANY(CAST(:seeds AS text[]))
+                GROUP BY node_id
+                ORDER BY SUM(activation) DESC, node_id
+                LIMIT :max_nodes
+            """),
+            params,
+        )).fetchall()
+        return {row.node_id: float(row.activation) for row in rows}
@@ -11,7 +11,8 @@ from sqlalchemy import and_, cast, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.types import Date
 
-from neuromem.models.memory import Memory
+from neuromem.db import mark_user_written
+from neuromem.models.memory import Memory, signal_columns
 from neuromem.providers.embedding import EmbeddingProvider
 
 logger = logging.getLogger(__name__)
@@ -283,6 +284,8 @@ class MemoryService:
 
         if metadata is not None:
             memory.metadata_ = metadata
+            for column, value in signal_columns(metadata).items():
+                setattr(memory, column, value)
 
         # Regenerate embedding if content changed
         if content_changed and self._embedding:
@@ -315,6 +318,7 @@ class MemoryService:
 
         stmt = delete(Memory).where(and_(*conditions))
         result = await self.db.execute(stmt)
+        mark_user_written(self.db, user_id)
         await self.db.flush()
         return result.rowcount
 
@@ -326,7 +330,7 @@ class MemoryService:
         """Delete a memory and its associated data by ID.
 
         Cascade-deletes related records from memory_history,
-        trait_evidence, and memory_sources tables.
+        trait_evidence, memory_sources and memory_links tables.
 
         Args:
             memory_id: UUID of the memory to delete
@@ -348,6 +352,9 @@ class MemoryService:
         await self.db.execute(text("DELETE FROM memory_sources WHERE memory_id = :mid"), {"mid": mid})
         # Also clean trait_evidence where this memory is the trait itself
         await self.db.execute(text("DELETE FROM trait_evidence WHERE trait_id = :mid"), {"mid": mid})
+        await self.db.execute(
+            text("DELETE FROM memory_links WHERE source_id = :mid OR target_id = :mid"), {"mid": mid},
+        )
 
         await self.db.delete(memory)
         await self.db.flush()
@@ -12,10 +12,11 @@ from sqlalchemy import text as sql_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from neuromem.models.conversation import Conversation
-from neuromem.models.memory import Memory
+from neuromem.models.memory import Memory, signal_columns
 from neuromem.providers.embedding import EmbeddingProvider
 from neuromem.providers.llm import LLMProvider
 from neuromem.services.kv import KVService
+from neuromem.services.pattern_matcher import PatternMatcher
 from neuromem.services.temporal import TemporalExtractor
 
 logger = logging.getLogger(__name__)
@@ -672,17 +673,13 @@ Return format (JSON only, no other content):
         "certain things", "various things",
     ]
 
+    _VAGUE_MATCHER = PatternMatcher(_VAGUE_PATTERNS_ZH + _VAGUE_PATTERNS_EN, ignore_case=True)
+
     def _is_vague(self, content: str) -> bool:
         """Check if a fact content is too vague to be useful."""
-        lower = content.lower()
-        for p in self._VAGUE_PATTERNS_ZH:
-            if p in content:
-                logger.debug("Filtered vague fact (zh): %s", content[:80])
-                return True
-        for p in self._VAGUE_PATTERNS_EN:
-            if p in lower:
-                logger.debug("Filtered vague fact (en): %s", content[:80])
-                return True
+        if self._VAGUE_MATCHER.search(content):
+            logger.debug("Filtered vague fact: %s", content[:80])
+            return True
         return False
 
     async def _store_facts(
@@ -832,6 +829,7 @@ Return format (JSON only, no other content):
                     content_hash=content_hash,
                     valid_at=now,
                     trait_context=context,
+                    **signal_columns(meta),
                 )
                 self.db.add(embedding_obj)
                 count += 1
@@ -964,6 +962,7 @@ Return format (JSON only, no other content):
                     content_hash=content_hash,
                     valid_at=episode_valid_from,
                     trait_context=context,
+                    **signal_columns(meta),
                 )
                 self.db.add(embedding_obj)
                 count += 1
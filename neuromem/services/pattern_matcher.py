@@ -0,0 +1,110 @@
+"""Multi-pattern substring matcher - one pass over the text for a whole pattern set."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+# Below this many patterns a plain ``pattern in text`` loop beats the
+# compiled automaton (measured on short recall queries and memory contents).
+_SCAN_THRESHOLD = 64
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    """Regex alternation laid out as a trie, longest continuation first.
+
+    Sharing prefixes keeps the work per text position proportional to the
+    matched depth rather than to the number of patterns (the goto function
+    of an Aho-Corasick automaton, run by the C regex engine).
+    """
+    trie: dict = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A pattern ends here: the longer continuation is optional (greedy)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """Finds which of a fixed set of substrings occur in a text.
+
+    Built once per pattern set. Large sets are compiled into a single
+    trie-shaped regex scanned with a zero-width lookahead, so overlapping
+    occurrences are all seen in one pass; the longest pattern starting at
+    each position is reported and the patterns that are prefixes of it are
+    implied. Small sets use a plain substring loop, which is faster there.
+
+    Args:
+        patterns: Substrings to look for. Empty strings are ignored.
+        ignore_case: Compare case-insensitively (``str.lower`` on both
+            sides). Results are still reported in their original spelling.
+    """
+
+    def __init__(self, patterns: Iterable[str], *, ignore_case: bool = False):
+        self._ignore_case = ignore_case
+        originals: dict[str, list[str]] = {}
+        for pattern in patterns:
+            if pattern:
+                key = pattern.lower() if ignore_case else pattern
+                variants = originals.setdefault(key, [])
+                if pattern not in variants:
+                    variants.append(pattern)
+        self._originals = {key: tuple(v) for key, v in originals.items()}
+        self._keys = tuple(self._originals)
+        self._regex: re.Pattern | None = None
+        self._implied: dict[str, tuple[str, ...]] = {}
+        if len(self._keys) >= _SCAN_THRESHOLD:
+            self._regex = re.compile(f"(?=({_trie_regex(self._keys)}))")
+            for key in self._keys:
+                self._implied[key] = tuple(
+                    o for end in range(1, len(key) + 1) if key[:end] in self._originals
+                    for o in self._originals[key[:end]]
+                )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def find(self, text: str) -> set[str]:
+        """Return the patterns occurring anywhere in ``text``."""
+        if not text or not self._keys:
+            return set()
+        if self._ignore_case:
+            text = text.lower()
+        if self._regex is None:
+            return {o for key in self._keys if key in text for o in self._originals[key]}
+        found: set[str] = set()
+        for key in set(self._regex.findall(text)):
+            found.update(self._implied[key])
+        return found
+
+    def search(self, text: str) -> bool:
+        """Return True if any pattern occurs in ``text``."""
+        if not text or not self._keys:
+            return False
+        if self._ignore_case:
+            text = text.lower()
+        if self._regex is None:
+            return any(key in text for key in self._keys)
+        return self._regex.search(text) is not None
+
+
+@lru_cache(maxsize=256)
+def compiled_matcher(patterns: frozenset[str], ignore_case: bool = False) -> PatternMatcher:
+    """Shared PatternMatcher for a pattern set, built on first use.
+
+    Pattern sets that change per call (e.g. the graph triples of one
+    recall) repeat often enough across queries to make this worthwhile.
+    Call ``compiled_matcher.cache_clear()`` to drop all entries.
+    """
+    return PatternMatcher(patterns, ignore_case=ignore_case)
@@ -0,0 +1,159 @@
+"""Recall result cache - per-user LRU with write-generation invalidation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a recall query for cache keying (case + whitespace insensitive)."""
+    return " ".join(query.split()).casefold()
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy a recall result so callers cannot mutate the cached entry.
+
+    Copies the top-level dict, its lists and the dicts inside those lists;
+    nested metadata is shared (recall never mutates it).
+    """
+    copied: dict = {}
+    for key, value in result.items():
+        if isinstance(value, list):
+            copied[key] = [dict(v) if isinstance(v, dict) else v for v in value]
+        elif isinstance(value, dict):
+            copied[key] = dict(value)
+        else:
+            copied[key] = value
+    return copied
+
+
+class RecallCache:
+    """In-process cache for recall() results.
+
+    Entries are keyed by ``(user_id, key)`` and tagged with the user's write
+    generation at the time the computation *started*. A lookup whose current
+    generation differs from the entry's is a miss, so any committed write for
+    the user invalidates all of that user's entries without scanning.
+
+    Concurrent identical lookups (same user, key and generation) are collapsed
+    into one computation (singleflight); followers await the leader's result.
+
+    Args:
+        max_size: Maximum number of cached results (LRU eviction).
+        ttl: Seconds before an entry expires regardless of writes. Recency
+            scores and relative time expressions ("yesterday") drift with the
+            wall clock, so entries should not live forever. 0 = no TTL.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # (user_id, key) -> (generation, stored_at, result)
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[int, float, dict]] = OrderedDict()
+        self._inflight: dict[tuple[str, Hashable, int], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str, key: Hashable, generation: int) -> dict | None:
+        """Return a copy of the cached result, or None (does not touch counters)."""
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        entry_gen, stored_at, result = entry
+        if entry_gen != generation or (self.ttl and time.monotonic() - stored_at > self.ttl):
+            del self._entries[(user_id, key)]
+            return None
+        self._entries.move_to_end((user_id, key))
+        return _copy_result(result)
+
+    def put(self, user_id: str, key: Hashable, generation: int, result: dict) -> None:
+        """Store a result computed at ``generation``."""
+        if self.max_size <= 0:
+            return
+        self._entries[(user_id, key)] = (generation, time.monotonic(), _copy_result(result))
+        self._entries.move_to_end((user_id, key))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self,
+        user_id: str,
+        key: Hashable,
+        generation: int,
+        compute: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Return a cached result or compute it once for all concurrent callers.
+
+        Args:
+            user_id: Owner of the result (entries are invalidated per user).
+            key: Hashable description of the query and its filters.
+            generation: The user's current write generation.
+            compute: Zero-arg coroutine factory producing the result.
+        """
+        cached = self.get(user_id, key, generation)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        flight_key = (user_id, key, generation)
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._run(flight_key, compute))
+            self._inflight[flight_key] = task
+        # shield: a cancelled caller must not cancel the computation shared by others
+        result = await asyncio.shield(task)
+        return _copy_result(result)
+
+    async def _run(
+        self,
+        flight_key: tuple[str, Hashable, int],
+        compute: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        user_id, key, generation = flight_key
+        try:
+            result = await compute()
+            # Partial (deadline-degraded) results must not be served later
+            if not result.get("degraded"):
+                self.put(user_id, key, generation, result)
+            return result
+        finally:
+            self._inflight.pop(flight_key, None)
+
+    def invalidate(self, user_id: str | None = None) -> int:
+        """Drop cached entries for one user (or all users). Returns count removed."""
+        if user_id is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        stale = [k for k in self._entries if k[0] == user_id]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
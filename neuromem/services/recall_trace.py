@@ -0,0 +1,61 @@
+"""Recall explain mode - per-request stage timings, candidate counts and query plans."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+_current_trace: ContextVar["RecallTrace | None"] = ContextVar("neuromem_recall_trace", default=None)
+
+
+class RecallTrace:
+    """Diagnostics collected while one recall runs.
+
+    Activated with ``tracing()``; code on the recall path looks it up with
+    ``current_trace()`` and records nothing when it returns None, so the
+    cost with explain off is one ContextVar lookup per stage/search.
+    Tasks spawned inside the traced block share the same trace object.
+
+    Args:
+        capture_plans: Also run ``EXPLAIN (ANALYZE, BUFFERS)`` for each
+            search statement (executes the statement a second time).
+    """
+
+    def __init__(self, capture_plans: bool = False):
+        self.capture_plans = capture_plans
+        self.timings_ms: dict[str, float] = {}
+        self.searches: list[dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record the wall-clock duration of the enclosed block as ``name``."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings_ms[name] = round((time.perf_counter() - t0) * 1000, 2)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "timings_ms": dict(self.timings_ms),
+            "searches": list(self.searches),
+        }
+
+
+def current_trace() -> RecallTrace | None:
+    """The trace of the recall running in this context, if explain is on."""
+    return _current_trace.get()
+
+
+@contextmanager
+def tracing(trace: RecallTrace):
+    """Make ``trace`` the current trace for the enclosed block."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
@@ -11,6 +11,7 @@ from typing import Optional
 from sqlalchemy import text as sql_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from neuromem.db import mark_user_written
 from neuromem.models.memory import Memory
 from neuromem.models.reflection_cycle import ReflectionCycle
 from neuromem.providers.embedding import EmbeddingProvider
@@ -453,8 +454,11 @@ class ReflectionService:
                     stats["traits_updated"] += 1
 
         # Step: Process memory links (Zettelkasten)
+        if llm_result.get("links"):
+            mark_user_written(self.db, user_id)
         for link in llm_result.get("links", []):
             await self._create_memory_link(
+                user_id,
                 source_id=link.get("source_id"),
                 target_id=link.get("target_id"),
                 relation=link.get("relation", "related"),
@@ -468,11 +472,13 @@ class ReflectionService:
 
     async def _create_memory_link(
         self,
+        user_id: str,
         source_id: str | None,
         target_id: str | None,
         relation: str = "related",
+        weight: float = 1.0,
     ) -> None:
-        """Create bidirectional link between two memories via metadata."""
+        """Create bidirectional link between two of the user's memories in memory_links."""
         if not source_id or not target_id:
             return
         try:
@@ -480,26 +486,20 @@ class ReflectionService:
             source_uuid = _uuid.UUID(source_id)
             target_uuid = _uuid.UUID(target_id)
 
-            _link_sql = sql_text(
-                "UPDATE memories "
-                "SET metadata = jsonb_set("
-                "  COALESCE(metadata, '{}'), "
-                "  '{related_memories}', "
-                "  COALESCE(metadata->'related_memories', '[]') || CAST(:link_json AS jsonb)"
-                ") "
-                "WHERE id = :id "
-                "AND NOT (COALESCE(metadata->'related_memories', '[]') @> CAST(:link_json AS jsonb))"
-            )
-
-            # Add target to source's related_memories
+            # Both directions in one statement; only memories owned by the user
             await self.db.execute(
-                _link_sql,
-                {"id": source_uuid, "link_json": json.dumps([{"id": target_id, "relation": relation}])},
-            )
-            # Add source to target's related_memories (reverse direction)
-            await self.db.execute(
-                _link_sql,
-                {"id": target_uuid, "link_json": json.dumps([{"id": source_id, "relation": relation}])},
+                sql_text(
+                    "INSERT INTO memory_links (source_id, target_id, user_id, relation, weight) "
+                    "SELECT s.id, t.id, :user_id, :relation, :weight "
+                    "FROM memories s JOIN memories t ON t.user_id = s.user_id "
+                    "WHERE s.user_id = :user_id "
+                    "AND ((s.id = :source AND t.id = :target) OR (s.id = :target AND t.id = :source)) "
+                    "ON CONFLICT (source_id, target_id) DO NOTHING"
+                ),
+                {
+                    "user_id": user_id, "relation": (relation or "related")[:50], "weight": weight,
+                    "source": source_uuid, "target": target_uuid,
+                },
             )
         except Exception as e:
             logger.warning("Failed to create memory link %s<->%s: %s", source_id, target_id, e)
@@ -508,7 +508,8 @@ class ReflectionService:
         """Mark prospective facts as historical when their event_time has passed."""
         result = await self.db.execute(
             sql_text(
-                "UPDATE memories SET metadata = jsonb_set(metadata, '{temporality}', '\"historical\"') "
+                "UPDATE memories SET metadata = jsonb_set(metadata, '{temporality}', '\"historical\"'), "
+                "temporality = 'historical' "
                 "WHERE user_id = :uid AND memory_type = 'fact' "
                 "AND metadata->>'temporality' = 'prospective' "
                 "AND (metadata->>'event_time') IS NOT NULL "
@@ -519,6 +520,7 @@ class ReflectionService:
         )
         rows = result.fetchall()
         if rows:
+            mark_user_written(self.db, user_id)
             logger.info("Expired %d prospective facts to historical for user=%s", len(rows), user_id)
         return len(rows)
 
@@ -633,18 +635,15 @@ class ReflectionService:
         if not questions:
             return await self._call_reflection_llm(new_memories, existing_traits)
 
-        # Stage 2: Retrieve evidence for each question (parallel)
-        import asyncio
+        # Stage 2: Retrieve evidence for all questions in one batched search
         from neuromem.services.search import SearchService
         search_svc = SearchService(self.db, self._embedding)
 
-        async def _search_question(q: str) -> list[dict]:
-            try:
-                return await search_svc.scored_search(user_id=user_id, query=q, limit=3)
-            except Exception:
-                return []
-
-        all_hits = await asyncio.gather(*[_search_question(q) for q in questions[:5]])
+        try:
+            all_hits = await search_svc.scored_search_many(user_id=user_id, queries=questions[:5], limit=3)
+        except Exception as e:
+            logger.warning("Two-stage reflection evidence search failed: %s", e)
+            all_hits = []
         evidence: list[dict] = []
         seen_ids: set[str] = set()
         for hits in all_hits:
@@ -821,6 +820,7 @@ class ReflectionService:
                     "source_ids": trait_item.get("source_ids", []),
                     "importance": int(trait_item.get("importance", 8)),
                 },
+                importance=int(trait_item.get("importance", 8)) / 10.0,
             )
             self.db.add(embedding_obj)
             stored.append(trait_item)
@@ -0,0 +1,170 @@
+"""Python-side reranking of recall candidates (requires numpy).
+
+SearchService.fetch_candidates() returns the vector/BM25 candidate set with
+raw scores and typed ranking features; a Reranker turns it into the final
+scored order. The default weights reproduce the ranking of the SQL scored
+search, so scoring can change per call without changing the candidate SQL.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+
+from neuromem.services.context import ContextService
+from neuromem.services.search import RRF_K
+
+
+@dataclass(frozen=True)
+class RerankWeights:
+    """Weight profile of the recall score.
+
+    score = prospective_penalty × min(relevance + bm25_hit_bonus, 1)
+            × (1 + recency + importance + access + trait_stage + emotion + context)
+
+    The defaults are the constants of the SQL scored search.
+    """
+
+    recency: float = 0.15
+    recency_protect_seconds: float = 604800.0
+    arousal_slowdown: float = 0.5
+    importance: float = 0.15
+    default_importance: float = 0.5
+    access: float = 0.10
+    access_saturation: int = 100
+    trait_stage: dict[str, float] = field(
+        default_factory=lambda: {"core": 0.25, "established": 0.15, "emerging": 0.05},
+    )
+    emotion: float = 0.10
+    context: float = ContextService.MAX_CONTEXT_BOOST
+    general_context: float = ContextService.GENERAL_CONTEXT_BOOST
+    bm25_hit_bonus: float = 0.05
+    prospective_penalty: float = 0.5
+
+
+class Reranker(ABC):
+    """Scores a fetched candidate set.
+
+    Implementations return ``(candidate, features)`` pairs in final order,
+    where ``features`` holds the scored_search() signal columns
+    (rrf_score, recency, importance, access_boost, emotion_match,
+    context_match, score).
+    """
+
+    @abstractmethod
+    def rank(
+        self,
+        candidates: Sequence[Any],
+        limit: int,
+        decay_rate: float,
+        weights: RerankWeights | None = None,
+        current_emotion: dict | None = None,
+        query_context: str | None = None,
+        context_confidence: float = 0.0,
+    ) -> list[tuple[Any, dict[str, float]]]:
+        ...
+
+
+def _column(candidates: Sequence[Any], name: str, default: float) -> np.ndarray:
+    return np.array(
+        [default if getattr(c, name) is None else float(getattr(c, name)) for c in candidates],
+        dtype=np.float64,
+    )
+
+
+class NumpyReranker(Reranker):
+    """Vectorized reranker: every signal is one array expression over the candidates.
+
+    Args:
+        weights: Default weight profile; ``rank(weights=...)`` overrides it
+            per call.
+    """
+
+    def __init__(self, weights: RerankWeights | None = None):
+        self.weights = weights or RerankWeights()
+
+    def rank(
+        self,
+        candidates: Sequence[Any],
+        limit: int,
+        decay_rate: float,
+        weights: RerankWeights | None = None,
+        current_emotion: dict | None = None,
+        query_context: str | None = None,
+        context_confidence: float = 0.0,
+    ) -> list[tuple[Any, dict[str, float]]]:
+        if not candidates:
+            return []
+        w = weights or self.weights
+
+        vector_score = _column(candidates, "vector_score", 0.0)
+        vector_rank = _column(candidates, "vector_rank", 0.0)
+        bm25_score = _column(candidates, "bm25_score", 0.0)
+        bm25_rank = _column(candidates, "bm25_rank", np.nan)
+        age = _column(candidates, "age_seconds", 0.0)
+        arousal = _column(candidates, "arousal", 0.0)
+        valence = _column(candidates, "valence", 0.0)
+        importance_raw = _column(candidates, "importance_raw", w.default_importance)
+        access_count = _column(candidates, "access_count", 0.0)
+        expired = np.array([bool(c.prospective_expired) for c in candidates])
+
+        rrf = 1.0 / (RRF_K + vector_rank) + np.where(
+            np.isnan(bm25_rank), 0.0, 1.0 / (RRF_K + np.nan_to_num(bm25_rank)),
+        )
+        recency = np.where(
+            age < w.recency_protect_seconds,
+            w.recency,
+            w.recency * np.exp(-age / (decay_rate * (1 + arousal * w.arousal_slowdown))),
+        )
+        importance = w.importance * importance_raw
+        access = w.access * np.minimum(
+            np.log(np.maximum(access_count, 0) + 1) / math.log(w.access_saturation + 1), 1.0,
+        )
+        trait = np.array([
+            w.trait_stage.get(c.trait_stage, 0.0) if c.memory_type == "trait" else 0.0
+            for c in candidates
+        ])
+
+        if current_emotion and isinstance(current_emotion, dict):
+            q_valence = float(current_emotion.get("valence", 0))
+            q_arousal = float(current_emotion.get("arousal", 0))
+            emotion = w.emotion * np.maximum(
+                0.0, 1.0 - np.sqrt((valence - q_valence) ** 2 + (arousal - q_arousal) ** 2) / 2.83,
+            )
+        else:
+            emotion = np.zeros(len(candidates))
+
+        if query_context and query_context != "general" and context_confidence > 0:
+            # Rounded like the literal inlined into the SQL fragment
+            match_bonus = round(w.context * context_confidence, 4)
+            general_bonus = round(w.general_context * context_confidence, 4)
+            context = np.array([
+                match_bonus if c.trait_context == query_context
+                else general_bonus if c.trait_context == "general" else 0.0
+                for c in candidates
+            ])
+        else:
+            context = np.zeros(len(candidates))
+
+        base = np.minimum(vector_score + np.where(bm25_score > 0, w.bm25_hit_bonus, 0.0), 1.0)
+        penalty = np.where(expired, w.prospective_penalty, 1.0)
+        score = penalty * base * (1.0 + recency + importance + access + trait + emotion + context)
+
+        # Stable on ties: equal scores keep vector order
+        order = np.argsort(-score, kind="stable")[:limit]
+        return [
+            (candidates[i], {
+                "rrf_score": float(rrf[i]),
+                "recency": float(recency[i]),
+                "importance": float(importance[i]),
+                "access_boost": float(access[i]),
+                "emotion_match": float(emotion[i]),
+                "context_match": float(context[i]),
+                "score": float(score[i]),
+            })
+            for i in order
+        ]
@@ -4,15 +4,24 @@ from __future__ import annotations
 
 import json
 import logging
+import math
+import time
+from collections import OrderedDict
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import neuromem.models as _models
 from neuromem.db import _is_encrypted
-from neuromem.models.memory import Memory
+from neuromem.models.memory import Memory, signal_columns
 from neuromem.providers.embedding import EmbeddingProvider
 from neuromem.services.context import ContextService
+from neuromem.services.recall_trace import current_trace
+
+if TYPE_CHECKING:
+    from neuromem.services.rerank import Reranker, RerankWeights
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +31,67 @@ DEFAULT_DECAY_RATE = 86400 * 30
 # RRF constant (standard value from the original paper)
 RRF_K = 60
 
+_VALID_CONTEXTS = {"work", "personal", "social", "learning", "general"}
+
+# HNSW ef_search bounds (pgvector accepts 1..1000)
+_MIN_EF_SEARCH = 40
+_MAX_EF_SEARCH = 1000
+# Max executions of one vector query while oversampling (no iterative scan)
+_MAX_SCAN_ATTEMPTS = 3
+# Coarse candidates per final candidate in binary-quantized prefilter mode
+_PREFILTER_OVERSAMPLE = 8
+
+
+class _ScanSelectivity:
+    """Per-user filter survival ratios learned from previous HNSW scans.
+
+    A filtered HNSW scan visits ~ef_search tuples and then drops those that fail
+    the WHERE clause (other users, invalidated rows, excluded types). The ratio
+    of surviving to visited tuples is remembered per user so the next query can
+    start with an ef_search large enough to yield ``candidate_limit`` rows.
+    When oversampling stops producing more rows the user's filtered set is
+    exhausted; that count is remembered (for ``hint_ttl`` seconds) to avoid
+    pointless retries for small users.
+    """
+
+    def __init__(self, max_users: int = 10000, hint_ttl: float = 300.0):
+        self.max_users = max_users
+        self.hint_ttl = hint_ttl
+        # user_id -> [survival_ratio, exhausted_count | None, exhausted_at]
+        self._users: OrderedDict[str, list] = OrderedDict()
+
+    def ratio(self, user_id: str) -> float:
+        entry = self._users.get(user_id)
+        return entry[0] if entry else 1.0
+
+    def exhausted_count(self, user_id: str) -> int | None:
+        entry = self._users.get(user_id)
+        if not entry or entry[1] is None or time.monotonic() - entry[2] > self.hint_ttl:
+            return None
+        return entry[1]
+
+    def observe(self, user_id: str, ef_search: int, returned: int, candidate_limit: int) -> None:
+        """Fold one scan result into the user's survival ratio."""
+        entry = self._users.get(user_id)
+        if entry is None:
+            entry = [1.0, None, 0.0]
+            self._users[user_id] = entry
+        self._users.move_to_end(user_id)
+        # A full result only bounds the ratio from below; a short one measures it
+        observed = returned / ef_search if ef_search else 1.0
+        if returned < candidate_limit or observed > entry[0]:
+            entry[0] = max(0.01, min(1.0, 0.7 * entry[0] + 0.3 * observed))
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def mark_exhausted(self, user_id: str, returned: int) -> None:
+        entry = self._users.setdefault(user_id, [1.0, None, 0.0])
+        entry[1] = returned
+        entry[2] = time.monotonic()
+
+
+_scan_selectivity = _ScanSelectivity()
+
 
 def _sanitize_bm25_query(query: str) -> str:
     """Sanitize query text for pg_search BM25 parser.
@@ -39,11 +109,45 @@ def _sanitize_bm25_query(query: str) -> str:
 
 
 class SearchService:
-    def __init__(self, db: AsyncSession, embedding: EmbeddingProvider, pg_search_available: bool = False, encryption=None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        embedding: EmbeddingProvider,
+        pg_search_available: bool = False,
+        encryption=None,
+        access_tracker=None,
+        pgvector_version: tuple[int, int] | None = None,
+        reranker: Reranker | None = None,
+        vector_prefilter: str | None = None,
+    ):
+        """
+        Args:
+            access_tracker: Optional AccessTracker. When set, access counts are
+                buffered and flushed in batches instead of being written by an
+                UPDATE at the end of every search.
+            pgvector_version: (major, minor) of the installed pgvector, as
+                detected by Database.init(). Enables per-query HNSW tuning:
+                ef_search from learned filter selectivity (>= 0.5) and
+                iterative index scans (>= 0.8). None disables tuning.
+            reranker: Optional Reranker. When set, scored_search() (and the
+                batched scored_search_many() / scored_search_users()) fetch
+                the candidate sets and score them in Python instead of in SQL.
+            vector_prefilter: ``"binary"`` scans the binary-quantized HNSW
+                index (see Database) for ``_PREFILTER_OVERSAMPLE`` × the
+                candidate limit and reranks those rows by exact halfvec cosine
+                distance. None scans the halfvec index directly.
+        """
         self.db = db
         self._embedding = embedding
         self._pg_search = pg_search_available if not encryption else False
         self._encryption = encryption
+        self._access_tracker = access_tracker
+        self._tune_hnsw = pgvector_version is not None and pgvector_version >= (0, 5)
+        self._iterative_scan = pgvector_version is not None and pgvector_version >= (0, 8)
+        self._reranker = reranker
+        self._vector_prefilter = vector_prefilter
+        # Vector candidate accounting for the most recent search/scored_search call
+        self.last_scan_stats: dict | None = None
 
     async def add_memory(
         self,
@@ -83,6 +187,7 @@ class SearchService:
             valid_from=valid_from or now,
             content_hash=content_hash,
             valid_at=valid_from or now,
+            **signal_columns(metadata),
         )
         self.db.add(record)
         await self.db.flush()
@@ -115,10 +220,18 @@ class SearchService:
         event_before: datetime | None = None,
         as_of: datetime | None = None,
         exclude_types: list[str] | None = None,
+        user_id_expr: str | None = None,
     ) -> str:
-        """Build common WHERE clause filters, mutating params dict."""
-        filters = "user_id = :user_id"
-        params["user_id"] = user_id
+        """Build common WHERE clause filters, mutating params dict.
+
+        ``user_id_expr`` replaces the ``:user_id`` bind parameter with a SQL
+        expression (e.g. a LATERAL column when searching several users).
+        """
+        if user_id_expr:
+            filters = f"user_id = {user_id_expr}"
+        else:
+            filters = "user_id = :user_id"
+            params["user_id"] = user_id
 
         if memory_type:
             filters += " AND memory_type = :memory_type"
@@ -157,30 +270,33 @@ class SearchService:
 
         return filters
 
-    def _build_bm25_cte(self, filters: str, candidate_limit: int) -> str:
-        """Build BM25 CTE SQL fragment (pg_search or tsvector fallback)."""
+    def _build_bm25_cte(
+        self, filters: str, candidate_limit: int, query_text_expr: str = ":query_text",
+        table: str = "memories",
+    ) -> str:
+        """Build BM25 CTE SQL fragment (pg_search or tsvector fallback) over ``table``."""
         if self._pg_search:
             return f"""
             bm25_ranked AS (
                 SELECT id,
                        paradedb.score(id) AS bm25_score,
                        ROW_NUMBER() OVER (ORDER BY paradedb.score(id) DESC) AS bm25_rank
-                FROM memories
+                FROM {table}
                 WHERE {filters}
-                  AND id @@@ paradedb.parse(:query_text)
+                  AND id @@@ paradedb.parse({query_text_expr})
                 ORDER BY bm25_score DESC
                 LIMIT {candidate_limit}
             )"""
         return f"""
             bm25_ranked AS (
                 SELECT id,
-                       ts_rank_cd(to_tsvector('simple', content), plainto_tsquery('simple', :query_text)) AS bm25_score,
+                       ts_rank_cd(to_tsvector('simple', content), plainto_tsquery('simple', {query_text_expr})) AS bm25_score,
                        ROW_NUMBER() OVER (
-                           ORDER BY ts_rank_cd(to_tsvector('simple', content), plainto_tsquery('simple', :query_text)) DESC
+                           ORDER BY ts_rank_cd(to_tsvector('simple', content), plainto_tsquery('simple', {query_text_expr})) DESC
                        ) AS bm25_rank
-                FROM memories
+                FROM {table}
                 WHERE {filters}
-                  AND to_tsvector('simple', content) @@ plainto_tsquery('simple', :query_text)
+                  AND to_tsvector('simple', content) @@ plainto_tsquery('simple', {query_text_expr})
                 ORDER BY bm25_score DESC
                 LIMIT {candidate_limit}
             )"""
@@ -220,6 +336,7 @@ class SearchService:
 
         candidate_limit = limit * 2 if self._pg_search else limit * 4
         bm25_cte = self._build_bm25_cte(filters, candidate_limit)
+        vector_source = self._vector_source(filters, candidate_limit, "CAST(:query_vec AS vector)")
 
         sql = text(
             f"""
@@ -227,8 +344,7 @@ class SearchService:
                 SELECT id, content, memory_type, metadata, created_at, extracted_timestamp,
                        1 - (embedding <=> CAST(:query_vec AS vector)) AS vector_score,
                        ROW_NUMBER() OVER (ORDER BY embedding <=> CAST(:query_vec AS vector)) AS vector_rank
-                FROM memories
-                WHERE {filters}
+                FROM {vector_source}
                 ORDER BY embedding <=> CAST(:query_vec AS vector)
                 LIMIT {candidate_limit}
             ),
@@ -238,7 +354,9 @@ class SearchService:
                    v.vector_score,
                    COALESCE(b.bm25_score, 0) AS bm25_score,
                    (1.0 / ({RRF_K} + v.vector_rank))
-                   + COALESCE(1.0 / ({RRF_K} + b.bm25_rank), 0) AS rrf_score
+                   + COALESCE(1.0 / ({RRF_K} + b.bm25_rank), 0) AS rrf_score,
+                   (SELECT COUNT(*) FROM vector_ranked) AS vector_candidates,
+                   (SELECT COUNT(*) FROM bm25_ranked) AS bm25_candidates
             FROM vector_ranked v
             LEFT JOIN bm25_ranked b ON v.id = b.id
             ORDER BY rrf_score DESC
@@ -246,8 +364,7 @@ class SearchService:
         """
         )
 
-        result = await self.db.execute(sql, params)
-        rows = result.fetchall()
+        rows = await self._execute_vector_query(sql, params, user_id, candidate_limit)
 
         results = [
             {
@@ -270,6 +387,161 @@ class SearchService:
 
         return results
 
+    async def search_conversations(
+        self,
+        user_ids: list[str],
+        query: str,
+        limit: int = 10,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list[dict]]:
+        """Hybrid search over raw conversation messages for one or more users.
+
+        Same shape as search(): a vector leg on the conversations halfvec
+        HNSW index and a BM25 (or tsvector) leg, fused by RRF. Each user gets
+        its own top-``limit`` messages through a LATERAL join over the user
+        list, so the whole set costs one round trip.
+
+        Returns:
+            {user_id: [{"id", "content", "role", "session_id", "created_at",
+            "metadata", "similarity", "bm25_score", "rrf_score"}, ...]} for
+            every user, best first. ``similarity`` is the cosine similarity.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        _, vector_str = await self._prepare_query_vector(query, query_embedding)
+
+        bm25_query = _sanitize_bm25_query(query) if self._pg_search else query
+        params: dict = {
+            "limit": limit, "query_text": bm25_query, "query_vec": vector_str, "user_ids": user_ids,
+        }
+        filters = "user_id = u.user_id"
+        candidate_limit = limit * 2 if self._pg_search else limit * 4
+        bm25_cte = self._build_bm25_cte(filters, candidate_limit, table="conversations")
+        sql = text(f"""
+            SELECT u.user_id AS owner_id, r.*
+            FROM unnest(CAST(:user_ids AS text[])) AS u(user_id)
+            CROSS JOIN LATERAL (
+                WITH vector_ranked AS (
+                    SELECT id, content, role, session_id, created_at, metadata,
+                           1 - (embedding <=> CAST(:query_vec AS vector)) AS vector_score,
+                           ROW_NUMBER() OVER (ORDER BY embedding <=> CAST(:query_vec AS vector)) AS vector_rank
+                    FROM conversations
+                    WHERE {filters} AND embedding IS NOT NULL
+                    ORDER BY embedding <=> CAST(:query_vec AS vector)
+                    LIMIT {candidate_limit}
+                ),
+                {bm25_cte}
+                SELECT v.id, v.content, v.role, v.session_id, v.created_at, v.metadata,
+                       v.vector_score,
+                       COALESCE(b.bm25_score, 0) AS bm25_score,
+                       (1.0 / ({RRF_K} + v.vector_rank))
+                       + COALESCE(1.0 / ({RRF_K} + b.bm25_rank), 0) AS rrf_score,
+                       (SELECT COUNT(*) FROM vector_ranked) AS vector_candidates,
+                       (SELECT COUNT(*) FROM bm25_ranked) AS bm25_candidates
+                FROM vector_ranked v
+                LEFT JOIN bm25_ranked b ON v.id = b.id
+                ORDER BY rrf_score DESC
+                LIMIT :limit
+            ) AS r
+            ORDER BY u.user_id, r.rrf_score DESC
+        """)
+
+        # Selectivity is learned separately from the same users' memory scans
+        scan_key = "conversations\x1f" + "\x1f".join(sorted(user_ids))
+        rows = await self._execute_vector_query(sql, params, scan_key, candidate_limit)
+
+        grouped: dict[str, list[dict]] = {uid: [] for uid in user_ids}
+        for row in rows:
+            grouped[row.owner_id].append({
+                "id": str(row.id),
+                "content": self._maybe_decrypt(row.content),
+                "role": row.role,
+                "session_id": row.session_id,
+                "created_at": row.created_at,
+                "metadata": row.metadata or {},
+                "similarity": round(float(row.vector_score), 4),
+                "bm25_score": round(float(row.bm25_score), 4),
+                "rrf_score": round(float(row.rrf_score), 4),
+            })
+        return grouped
+
+    async def _execute_vector_query(
+        self, sql, params: dict, user_id: str, candidate_limit: int,
+    ) -> list:
+        """Run a vector_ranked query, tuning the HNSW scan and oversampling as needed.
+
+        The query must expose ``vector_candidates`` (rows left in vector_ranked
+        after filtering). ef_search starts from the user's learned filter
+        survival ratio; without iterative index scans the query is re-run with
+        a larger ef_search while it returns fewer than ``candidate_limit``
+        candidates and each attempt still finds more. Accounting is stored in
+        ``self.last_scan_stats``.
+        """
+        # The index scan must surface the whole coarse set in prefilter mode
+        scan_limit = candidate_limit * _PREFILTER_OVERSAMPLE if self._vector_prefilter else candidate_limit
+        ef_search = min(
+            _MAX_EF_SEARCH,
+            max(_MIN_EF_SEARCH, math.ceil(scan_limit / _scan_selectivity.ratio(user_id))),
+        )
+        attempts = 0
+        scanned = 0
+        previous = -1
+        while True:
+            attempts += 1
+            if self._tune_hnsw:
+                await self.db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+                if self._iterative_scan:
+                    await self.db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+            rows = (await self.db.execute(sql, params)).fetchall()
+            # Batched statements report per query; the scarcest one drives tuning
+            returned = min(int(r.vector_candidates) for r in rows) if rows else 0
+            scanned += ef_search
+
+            if not self._tune_hnsw:
+                break
+            _scan_selectivity.observe(user_id, ef_search, returned, candidate_limit)
+            if returned >= candidate_limit or self._iterative_scan:
+                break
+            known = _scan_selectivity.exhausted_count(user_id)
+            if returned <= previous or (known is not None and returned >= known):
+                _scan_selectivity.mark_exhausted(user_id, returned)
+                break
+            if ef_search >= _MAX_EF_SEARCH or attempts >= _MAX_SCAN_ATTEMPTS:
+                break
+            previous = returned
+            ef_search = min(_MAX_EF_SEARCH, ef_search * 4)
+
+        self.last_scan_stats = {
+            "candidate_limit": candidate_limit,
+            "candidates_returned": returned,
+            # upper bound: index tuples the HNSW scan(s) could visit
+            "candidates_scanned": scanned,
+            "ef_search": ef_search,
+            "attempts": attempts,
+            "iterative_scan": self._iterative_scan,
+        }
+        logger.debug("vector scan[%s]: %s", user_id, self.last_scan_stats)
+        trace = current_trace()
+        if trace is not None:
+            await self._trace_search(trace, sql, params, user_id, rows)
+        return rows
+
+    async def _trace_search(self, trace, sql, params: dict, user_id: str, rows: list) -> None:
+        """Record candidate counts (and optionally the query plan) for explain mode."""
+        entry = {
+            "user_id": user_id,
+            **self.last_scan_stats,
+            # rows left in vector_ranked / bm25_ranked (scarcest query when batched)
+            "vector_candidates": self.last_scan_stats["candidates_returned"],
+            "bm25_candidates": min((int(getattr(r, "bm25_candidates", 0)) for r in rows), default=0),
+        }
+        if trace.capture_plans:
+            # Same transaction, so the SET LOCAL scan settings above still apply
+            plan = await self.db.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql.text), params)
+            entry["plan"] = "\n".join(r[0] for r in plan.fetchall())
+        trace.searches.append(entry)
+
     def _maybe_decrypt(self, content: str) -> str:
         """Decrypt content if encryption is enabled and value is encrypted."""
         if not self._encryption or not _is_encrypted(content):
@@ -281,6 +553,378 @@ class SearchService:
             logger.warning("Failed to decrypt search result content: %s", e)
             return content
 
+    def _scored_query_sql(
+        self,
+        filters: str,
+        candidate_limit: int,
+        emotion_bonus_sql: str,
+        context_bonus_sql: str,
+        query_vec_expr: str,
+        query_text_expr: str,
+        link_hops: int = 0,
+        link_fanout: int = 3,
+        user_id_expr: str = ":user_id",
+    ) -> str:
+        """Build the scored hybrid search statement for one query vector/text.
+
+        The query operands are SQL expressions so the same statement can run
+        standalone (bind parameters) or per row of a query list (LATERAL).
+        With ``link_hops`` > 0 the statement also walks memory_links from the
+        top ``:limit`` hits and appends the linked memories (owned by
+        ``user_id_expr``) as extra rows (``link_hop`` set, score columns NULL)
+        after the ranked ones.
+        """
+        vector_cte = self._scored_vector_cte(filters, candidate_limit, query_vec_expr) + ","
+        bm25_cte = self._build_bm25_cte(filters, candidate_limit, query_text_expr) + ","
+        ctes = f"""
+            {vector_cte}
+            {bm25_cte}
+            hybrid AS (
+                SELECT v.*,
+                       COALESCE(b.bm25_score, 0) AS bm25_score,
+                       -- RRF fusion as relevance signal
+                       (1.0 / ({RRF_K} + v.vector_rank))
+                       + COALESCE(1.0 / ({RRF_K} + b.bm25_rank), 0) AS rrf_score,
+                       -- recency_bonus: 0~0.15, with 7-day protection, arousal slows decay
+                       CASE
+                           WHEN v.age_seconds < 604800 THEN 0.15
+                           ELSE 0.15 * EXP(
+                               -v.age_seconds / (:decay_rate * (1 + COALESCE(v.arousal, 0) * 0.5))
+                           )
+                       END AS recency,
+                       -- importance_bonus: 0~0.15 (importance column is 0.1-1.0, default 0.5)
+                       0.15 * COALESCE(v.importance_raw, 0.5) AS importance_bonus,
+                       -- access_boost: 0~0.10, logarithmic based on access_count
+                       0.10 * LEAST(LN(GREATEST(v.access_count, 0) + 1) / LN(101), 1.0) AS access_boost
+                FROM vector_ranked v
+                LEFT JOIN bm25_ranked b ON v.id = b.id
+            )"""
+        scored_select = f"""
+            SELECT id, content, memory_type, metadata, created_at, extracted_timestamp,
+                   access_count, last_accessed_at, trait_stage, trait_context,
+                   vector_score AS relevance,
+                   bm25_score,
+                   rrf_score,
+                   recency,
+                   importance_bonus AS importance,
+                   access_boost,
+                   -- emotion_match_bonus: 0~0.10
+                   {emotion_bonus_sql} AS emotion_match,
+                   -- context_match_bonus: 0~0.10
+                   {context_bonus_sql} AS context_match,
+                   -- final score: prospective_penalty × base_relevance × (1 + recency + importance + access_boost + trait_boost + emotion_match)
+                   CASE
+                       WHEN temporality = 'prospective'
+                            AND event_time IS NOT NULL
+                            AND event_time < NOW()
+                       THEN 0.5
+                       ELSE 1.0
+                   END
+                   *
+                   LEAST(vector_score + CASE WHEN bm25_score > 0 THEN 0.05 ELSE 0 END, 1.0)
+                   * (1.0
+                      + recency
+                      + importance_bonus
+                      + access_boost
+                      + CASE
+                          WHEN memory_type = 'trait' THEN
+                              CASE trait_stage
+                                  WHEN 'core'        THEN 0.25
+                                  WHEN 'established' THEN 0.15
+                                  WHEN 'emerging'    THEN 0.05
+                                  ELSE 0
+                              END
+                          ELSE 0
+                        END
+                      + {emotion_bonus_sql}
+                      + {context_bonus_sql}
+                   ) AS score,
+                   (SELECT COUNT(*) FROM vector_ranked) AS vector_candidates,
+                   (SELECT COUNT(*) FROM bm25_ranked) AS bm25_candidates
+            FROM hybrid
+            ORDER BY score DESC
+            LIMIT :limit"""
+        if not link_hops:
+            return f"WITH {ctes}\n{scored_select}"
+        link_ctes = self._link_walk_ctes("SELECT id FROM ranked", link_hops, link_fanout)
+        return f"""
+            WITH RECURSIVE {ctes},
+            ranked AS ({scored_select}
+            ),
+            {link_ctes}
+            SELECT ranked.*, NULL::int AS link_hop, NULL::float8 AS link_weight FROM ranked
+            UNION ALL
+            SELECT m.id, m.content, m.memory_type, m.metadata, m.created_at, m.extracted_timestamp,
+                   m.access_count, m.last_accessed_at, m.trait_stage, m.trait_context,
+                   NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+                   (SELECT COUNT(*) FROM vector_ranked), (SELECT COUNT(*) FROM bm25_ranked),
+                   lk.link_hop, lk.link_weight
+            FROM linked lk
+            JOIN memories m ON m.id = lk.id AND m.user_id = {user_id_expr}
+            ORDER BY link_hop NULLS FIRST, score DESC, link_weight DESC
+        """
+
+    @staticmethod
+    def _link_walk_ctes(seed_sql: str, link_hops: int, link_fanout: int) -> str:
+        """``link_walk`` / ``linked`` CTEs: memories reachable from the seed ids.
+
+        Each hop follows at most ``link_fanout`` of a memory's links (highest
+        weight first); weights multiply along a path. ``linked`` keeps each
+        reachable non-seed memory once (shortest hop, best weight), capped at
+        ``link_fanout * link_hops`` rows. Must run under WITH RECURSIVE.
+        """
+        return f"""
+            link_walk(id, hop, weight) AS (
+                SELECT l.target_id, 1, l.weight
+                FROM ({seed_sql}) AS seed
+                CROSS JOIN LATERAL (
+                    SELECT target_id, weight FROM memory_links
+                    WHERE source_id = seed.id
+                    ORDER BY weight DESC
+                    LIMIT {link_fanout}
+                ) l
+                UNION ALL
+                SELECT l.target_id, w.hop + 1, w.weight * l.weight
+                FROM link_walk w
+                CROSS JOIN LATERAL (
+                    SELECT target_id, weight FROM memory_links
+                    WHERE source_id = w.id
+                    ORDER BY weight DESC
+                    LIMIT {link_fanout}
+                ) l
+                WHERE w.hop < {link_hops}
+            ),
+            linked AS (
+                SELECT id, MIN(hop) AS link_hop, MAX(weight) AS link_weight
+                FROM link_walk
+                WHERE id NOT IN ({seed_sql})
+                GROUP BY id
+                ORDER BY MIN(hop), MAX(weight) DESC
+                LIMIT {link_fanout * link_hops}
+            )"""
+
+    async def linked_memories(
+        self,
+        user_id: str,
+        seed_ids: list[str],
+        link_hops: int = 1,
+        link_fanout: int = 3,
+    ) -> list[dict]:
+        """Memories reachable from ``seed_ids`` over memory_links, in one statement.
+
+        Used where link expansion cannot be folded into the search statement
+        (Python reranking, streaming recall).
+        """
+        if not seed_ids or link_hops <= 0:
+            return []
+        link_ctes = self._link_walk_ctes(
+            "SELECT unnest(CAST(:seed_ids AS uuid[])) AS id", link_hops, link_fanout,
+        )
+        rows = (await self.db.execute(
+            text(f"""
+                WITH RECURSIVE {link_ctes}
+                SELECT m.id, m.content, m.memory_type, m.metadata, m.created_at,
+                       lk.link_hop, lk.link_weight
+                FROM linked lk
+                JOIN memories m ON m.id = lk.id AND m.user_id = :user_id
+                ORDER BY lk.link_hop, lk.link_weight DESC
+            """),
+            {"user_id": user_id, "seed_ids": list(seed_ids)},
+        )).fetchall()
+        return [self._linked_row_to_dict(row) for row in rows]
+
+    async def linked_memories_users(
+        self,
+        seed_ids_by_user: dict[str, list[str]],
+        link_hops: int = 1,
+        link_fanout: int = 3,
+    ) -> dict[str, list[dict]]:
+        """linked_memories() for several users' seeds in one statement.
+
+        The walk runs once per user through a LATERAL join, so each user
+        keeps its own ``link_fanout * link_hops`` cap.
+
+        Returns:
+            {user_id: linked_memories()-shaped list} for every user in the mapping.
+        """
+        grouped: dict[str, list[dict]] = {uid: [] for uid in seed_ids_by_user}
+        owners = [uid for uid, ids in seed_ids_by_user.items() for _ in ids]
+        seed_ids = [sid for ids in seed_ids_by_user.values() for sid in ids]
+        if not seed_ids or link_hops <= 0:
+            return grouped
+        link_ctes = self._link_walk_ctes(
+            "SELECT s.id FROM unnest(CAST(:seed_ids AS uuid[]), CAST(:seed_owners AS text[]))"
+            " AS s(id, owner_id) WHERE s.owner_id = u.user_id",
+            link_hops, link_fanout,
+        )
+        rows = (await self.db.execute(
+            text(f"""
+                SELECT u.user_id AS owner_id, r.*
+                FROM unnest(CAST(:user_ids AS text[])) AS u(user_id)
+                CROSS JOIN LATERAL (
+                    WITH RECURSIVE {link_ctes}
+                    SELECT m.id, m.content, m.memory_type, m.metadata, m.created_at,
+                           lk.link_hop, lk.link_weight
+                    FROM linked lk
+                    JOIN memories m ON m.id = lk.id AND m.user_id = u.user_id
+                ) AS r
+                ORDER BY u.user_id, r.link_hop, r.link_weight DESC
+            """),
+            {"user_ids": list(dict.fromkeys(owners)), "seed_ids": seed_ids, "seed_owners": owners},
+        )).fetchall()
+        for row in rows:
+            grouped[row.owner_id].append(self._linked_row_to_dict(row))
+        return grouped
+
+    def _vector_source(self, filters: str, candidate_limit: int, query_vec_expr: str) -> str:
+        """FROM source of a vector_ranked CTE.
+
+        Without a prefilter this is the filtered memories table, ordered by
+        the caller through the halfvec HNSW index. In binary prefilter mode
+        it is a coarse candidate set taken from the binary-quantized index
+        by Hamming distance; the caller's ORDER BY then reranks it exactly.
+        """
+        if self._vector_prefilter != "binary":
+            return f"memories WHERE {filters}"
+        dims = _models._embedding_dims
+        return f"""(
+                    SELECT * FROM memories
+                    WHERE {filters}
+                    ORDER BY binary_quantize(embedding)::bit({dims})
+                             <~> binary_quantize({query_vec_expr})::bit({dims})
+                    LIMIT {candidate_limit * _PREFILTER_OVERSAMPLE}
+                ) AS coarse"""
+
+    def _scored_vector_cte(self, filters: str, candidate_limit: int, query_vec_expr: str) -> str:
+        """vector_ranked CTE carrying the typed ranking features of each candidate."""
+        vector_source = self._vector_source(filters, candidate_limit, query_vec_expr)
+        return f"""
+            vector_ranked AS (
+                SELECT id, content, memory_type, metadata, created_at, extracted_timestamp,
+                       access_count, last_accessed_at, trait_stage, trait_context,
+                       importance AS importance_raw, event_time, arousal, valence, temporality,
+                       EXTRACT(EPOCH FROM (NOW() - COALESCE(event_time, created_at))) AS age_seconds,
+                       1 - (embedding <=> {query_vec_expr}) AS vector_score,
+                       ROW_NUMBER() OVER (ORDER BY embedding <=> {query_vec_expr}) AS vector_rank
+                FROM {vector_source}
+                ORDER BY embedding <=> {query_vec_expr}
+                LIMIT {candidate_limit}
+            )"""
+
+    def _candidate_query_sql(
+        self, filters: str, candidate_limit: int, query_vec_expr: str, query_text_expr: str,
+    ) -> str:
+        """Unscored candidate statement: raw vector/BM25 scores and ranking features.
+
+        Its text depends only on the filters and candidate_limit, never on
+        weights, emotion or context, which are applied by the Reranker.
+        """
+        vector_cte = self._scored_vector_cte(filters, candidate_limit, query_vec_expr) + ","
+        bm25_cte = self._build_bm25_cte(filters, candidate_limit, query_text_expr)
+        return f"""
+            WITH {vector_cte}
+            {bm25_cte}
+            SELECT v.id, v.content, v.memory_type, v.metadata, v.created_at, v.extracted_timestamp,
+                   v.access_count, v.last_accessed_at, v.trait_stage, v.trait_context,
+                   v.importance_raw, v.arousal, v.valence, v.age_seconds,
+                   v.vector_score, v.vector_rank,
+                   COALESCE(b.bm25_score, 0) AS bm25_score, b.bm25_rank,
+                   (v.temporality = 'prospective'
+                    AND v.event_time IS NOT NULL
+                    AND v.event_time < NOW()) AS prospective_expired,
+                   (SELECT COUNT(*) FROM vector_ranked) AS vector_candidates,
+                   (SELECT COUNT(*) FROM bm25_ranked) AS bm25_candidates
+            FROM vector_ranked v
+            LEFT JOIN bm25_ranked b ON v.id = b.id
+            ORDER BY v.vector_rank
+        """
+
+    def _scored_search_filters(
+        self,
+        params: dict,
+        user_id: str,
+        memory_type: str | None,
+        event_after: datetime | None,
+        event_before: datetime | None,
+        exclude_types: list[str] | None,
+        as_of: datetime | None,
+        created_after: datetime | None,
+        created_before: datetime | None,
+    ) -> str:
+        filters = self._build_base_filters(
+            params, user_id=user_id, memory_type=memory_type,
+            created_after=created_after, created_before=created_before,
+            event_after=event_after, event_before=event_before,
+            as_of=as_of, exclude_types=exclude_types,
+        )
+        # Exclude inactive trait stages from search results
+        return filters + " AND NOT (memory_type = 'trait' AND trait_stage IN ('trend', 'candidate', 'dissolved'))"
+
+    async def fetch_candidates(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 5,
+        memory_type: str | None = None,
+        query_embedding: list[float] | None = None,
+        event_after: datetime | None = None,
+        event_before: datetime | None = None,
+        exclude_types: list[str] | None = None,
+        as_of: datetime | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> list:
+        """Fetch the scored_search() candidate set without scoring it.
+
+        Rows carry ids, raw vector/BM25 scores and ranks, and the typed ranking
+        features (age_seconds, importance_raw, arousal, valence, access_count,
+        trait_stage, trait_context, prospective_expired). The set does not
+        depend on weights, emotion or context, so callers can cache it and
+        rescore it with rerank_candidates().
+        """
+        _, vector_str = await self._prepare_query_vector(query, query_embedding)
+
+        bm25_query = _sanitize_bm25_query(query) if self._pg_search else query
+        params: dict = {"query_text": bm25_query, "query_vec": vector_str}
+        filters = self._scored_search_filters(
+            params, user_id, memory_type, event_after, event_before,
+            exclude_types, as_of, created_after, created_before,
+        )
+
+        candidate_limit = limit * 2 if self._pg_search else limit * 4
+        sql = text(self._candidate_query_sql(
+            filters, candidate_limit,
+            query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+        ))
+        return await self._execute_vector_query(sql, params, user_id, candidate_limit)
+
+    def rerank_candidates(
+        self,
+        candidates: list,
+        limit: int = 5,
+        decay_rate: float = DEFAULT_DECAY_RATE,
+        weights: RerankWeights | None = None,
+        current_emotion: dict | None = None,
+        query_context: str | None = None,
+        context_confidence: float = 0.0,
+    ) -> list[dict]:
+        """Score fetch_candidates() rows into scored_search()-shaped results.
+
+        Uses the service's reranker, or a NumpyReranker when none is set.
+        """
+        reranker = self._reranker
+        if reranker is None:
+            from neuromem.services.rerank import NumpyReranker
+            reranker = NumpyReranker()
+        if query_context and query_context not in _VALID_CONTEXTS:
+            query_context = None
+        ranked = reranker.rank(
+            candidates, limit, decay_rate, weights=weights,
+            current_emotion=current_emotion,
+            query_context=query_context, context_confidence=context_confidence,
+        )
+        return [self._candidate_to_dict(row, features) for row, features in ranked]
+
     async def scored_search(
         self,
         user_id: str,
@@ -298,13 +942,19 @@ class SearchService:
         current_emotion: dict | None = None,
         query_context: str | None = None,
         context_confidence: float = 0.0,
+        weights: RerankWeights | None = None,
+        link_hops: int = 0,
+        link_fanout: int = 3,
     ) -> list[dict]:
         """Cosine-based scored search with BM25 hybrid and recency/importance bonuses.
 
         Score = base_relevance × (1 + recency_bonus + importance_bonus)
         - base_relevance: min(cosine_similarity + bm25_hit*0.05, 1.0)
         - recency_bonus: 0~0.15, exponential decay with emotional arousal slowdown
-        - importance_bonus: 0~0.15, from metadata importance (1-10), default 0.5
+        - importance_bonus: 0~0.15, from the importance column (metadata importance / 10), default 0.5
+
+        Ranking signals (event_time, importance, arousal, valence, temporality)
+        are read from typed columns; recency is computed once per candidate.
 
         Args:
             query_embedding: Optional pre-computed embedding to avoid recomputation
@@ -313,43 +963,358 @@ class SearchService:
             as_of: Time-travel query — return memories valid at this point in time.
             created_after: Filter by created_at >= this datetime.
             created_before: Filter by created_at <= this datetime.
+            weights: Optional RerankWeights profile. When given, or when the
+                service has a reranker, the candidates are scored in Python
+                (fetch_candidates() + rerank_candidates()); default weights
+                give the same order as the SQL scoring.
+            link_hops: Zettelkasten expansion depth over memory_links. When
+                > 0, memories linked from the hits are appended after them
+                (``"source": "linked"``), fetched by the same statement.
+            link_fanout: Links followed per memory and hop.
         """
+        if self._reranker is not None or weights is not None:
+            candidates = await self.fetch_candidates(
+                user_id, query, limit, memory_type=memory_type,
+                query_embedding=query_embedding,
+                event_after=event_after, event_before=event_before,
+                exclude_types=exclude_types, as_of=as_of,
+                created_after=created_after, created_before=created_before,
+            )
+            results = self.rerank_candidates(
+                candidates, limit, decay_rate, weights=weights,
+                current_emotion=current_emotion,
+                query_context=query_context, context_confidence=context_confidence,
+            )
+            if results:
+                await self._update_access_tracking(user_id, [r["id"] for r in results])
+            return results + await self.linked_memories(
+                user_id, [r["id"] for r in results], link_hops, link_fanout,
+            )
+
         _, vector_str = await self._prepare_query_vector(query, query_embedding)
 
         bm25_query = _sanitize_bm25_query(query) if self._pg_search else query
         params: dict = {"limit": limit, "decay_rate": decay_rate, "query_text": bm25_query, "query_vec": vector_str}
 
+        filters = self._scored_search_filters(
+            params, user_id, memory_type, event_after, event_before,
+            exclude_types, as_of, created_after, created_before,
+        )
+
+        emotion_bonus_sql = self._emotion_bonus_sql(current_emotion)
+        context_bonus_sql = self._context_bonus_sql(params, query_context, context_confidence)
+
+        candidate_limit = limit * 2 if self._pg_search else limit * 4
+        sql = text(self._scored_query_sql(
+            filters, candidate_limit, emotion_bonus_sql, context_bonus_sql,
+            query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+            link_hops=link_hops, link_fanout=link_fanout,
+        ))
+
+        rows = await self._execute_vector_query(sql, params, user_id, candidate_limit)
+
+        results = [
+            self._scored_row_to_dict(row) for row in rows
+            if getattr(row, "link_hop", None) is None
+        ]
+
+        # Update access tracking
+        if results:
+            await self._update_access_tracking(user_id, [r["id"] for r in results])
+
+        if link_hops:
+            results += [self._linked_row_to_dict(row) for row in rows if row.link_hop is not None]
+        return results
+
+    async def scored_search_many(
+        self,
+        user_id: str,
+        queries: list[str],
+        limit: int = 5,
+        memory_type: str | None = None,
+        decay_rate: float = DEFAULT_DECAY_RATE,
+        query_embeddings: list[list[float]] | None = None,
+        exclude_types: list[str] | None = None,
+        as_of: datetime | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        current_emotion: dict | None = None,
+        query_contexts: list[tuple[str | None, float]] | None = None,
+    ) -> list[list[dict]]:
+        """scored_search() for several queries in one statement.
+
+        Query vectors are computed with a single embed_batch() call (unless
+        ``query_embeddings`` is given) and the scored hybrid search runs once
+        per query through a LATERAL join over the query list, so N queries
+        cost one round trip. Filters are shared by all queries; event-time
+        ranges are not supported here (use scored_search()). With a reranker
+        the statement returns each query's candidate set and the reranker
+        scores it, as in scored_search().
+
+        Args:
+            query_embeddings: Optional pre-computed embeddings, one per query.
+            query_contexts: Optional (query_context, context_confidence) per
+                query, as accepted by scored_search().
+
+        Returns:
+            One scored_search()-shaped result list per query, in input order.
+        """
+        if not queries:
+            return []
+        if query_embeddings is None:
+            query_embeddings = await self._embedding.embed_batch(list(queries))
+        if len(query_embeddings) != len(queries):
+            raise ValueError("query_embeddings must have one vector per query")
+        vector_strs = [
+            (await self._prepare_query_vector(q, emb))[1]
+            for q, emb in zip(queries, query_embeddings)
+        ]
+
+        contexts: list[str | None] = []
+        confidences: list[float] = []
+        for i in range(len(queries)):
+            ctx, conf = query_contexts[i] if query_contexts else (None, 0.0)
+            if ctx not in _VALID_CONTEXTS or ctx == "general" or conf <= 0:
+                ctx, conf = None, 0.0
+            contexts.append(ctx)
+            confidences.append(float(conf))
+
+        params: dict = {
+            "limit": limit,
+            "decay_rate": decay_rate,
+            "query_vecs": vector_strs,
+            "query_texts": [_sanitize_bm25_query(q) if self._pg_search else q for q in queries],
+            "query_contexts": contexts,
+            "context_confidences": confidences,
+        }
         filters = self._build_base_filters(
             params, user_id=user_id, memory_type=memory_type,
             created_after=created_after, created_before=created_before,
-            event_after=event_after, event_before=event_before,
             as_of=as_of, exclude_types=exclude_types,
         )
+        filters += " AND NOT (memory_type = 'trait' AND trait_stage IN ('trend', 'candidate', 'dissolved'))"
+        candidate_limit = limit * 2 if self._pg_search else limit * 4
 
-        # Exclude inactive trait stages from search results
+        if self._reranker is not None:
+            # Same candidate sets in one statement, scored in Python like scored_search()
+            del params["limit"], params["decay_rate"], params["query_contexts"], params["context_confidences"]
+            per_query_sql = self._candidate_query_sql(
+                filters, candidate_limit,
+                query_vec_expr="CAST(q.query_vec AS vector)", query_text_expr="q.query_text",
+            )
+            sql = text(f"""
+                SELECT q.qi, r.*
+                FROM unnest(
+                    CAST(:query_vecs AS text[]),
+                    CAST(:query_texts AS text[])
+                ) WITH ORDINALITY AS q(query_vec, query_text, qi)
+                CROSS JOIN LATERAL ({per_query_sql}) AS r
+                ORDER BY q.qi, r.vector_rank
+            """)
+            rows = await self._execute_vector_query(sql, params, user_id, candidate_limit)
+            candidates: list[list] = [[] for _ in queries]
+            for row in rows:
+                candidates[int(row.qi) - 1].append(row)
+            grouped = [
+                self.rerank_candidates(
+                    candidates[i], limit, decay_rate,
+                    current_emotion=current_emotion,
+                    query_context=contexts[i], context_confidence=confidences[i],
+                )
+                for i in range(len(queries))
+            ]
+        else:
+            grouped = await self._scored_many_in_sql(
+                user_id, len(queries), params, filters, candidate_limit, current_emotion,
+            )
+
+        hit_ids = list(dict.fromkeys(r["id"] for results in grouped for r in results))
+        if hit_ids:
+            await self._update_access_tracking(user_id, hit_ids)
+
+        return grouped
+
+    async def _scored_many_in_sql(
+        self,
+        user_id: str,
+        n_queries: int,
+        params: dict,
+        filters: str,
+        candidate_limit: int,
+        current_emotion: dict | None,
+    ) -> list[list[dict]]:
+        """SQL-scored body of scored_search_many()."""
+        context_bonus_sql = (
+            f"CASE"
+            f"  WHEN q.query_context IS NULL THEN 0"
+            f"  WHEN trait_context = q.query_context"
+            f"  THEN {ContextService.MAX_CONTEXT_BOOST} * q.context_confidence"
+            f"  WHEN trait_context = 'general'"
+            f"  THEN {ContextService.GENERAL_CONTEXT_BOOST} * q.context_confidence"
+            f"  ELSE 0"
+            f" END"
+        )
+        per_query_sql = self._scored_query_sql(
+            filters, candidate_limit, self._emotion_bonus_sql(current_emotion), context_bonus_sql,
+            query_vec_expr="CAST(q.query_vec AS vector)", query_text_expr="q.query_text",
+        )
+        sql = text(f"""
+            SELECT q.qi, r.*
+            FROM unnest(
+                CAST(:query_vecs AS text[]),
+                CAST(:query_texts AS text[]),
+                CAST(:query_contexts AS text[]),
+                CAST(:context_confidences AS float8[])
+            ) WITH ORDINALITY AS q(query_vec, query_text, query_context, context_confidence, qi)
+            CROSS JOIN LATERAL ({per_query_sql}) AS r
+            ORDER BY q.qi, r.score DESC
+        """)
+
+        rows = await self._execute_vector_query(sql, params, user_id, candidate_limit)
+
+        grouped: list[list[dict]] = [[] for _ in range(n_queries)]
+        for row in rows:
+            grouped[int(row.qi) - 1].append(self._scored_row_to_dict(row))
+        return grouped
+
+    async def scored_search_users(
+        self,
+        user_ids: list[str],
+        query: str,
+        limit: int = 5,
+        memory_type: str | None = None,
+        decay_rate: float = DEFAULT_DECAY_RATE,
+        query_embedding: list[float] | None = None,
+        event_after: datetime | None = None,
+        event_before: datetime | None = None,
+        exclude_types: list[str] | None = None,
+        as_of: datetime | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        current_emotion: dict | None = None,
+        query_context: str | None = None,
+        context_confidence: float = 0.0,
+        link_hops: int = 0,
+        link_fanout: int = 3,
+    ) -> dict[str, list[dict]]:
+        """scored_search() for one query across several users in one statement.
+
+        The scored hybrid search runs once per user through a LATERAL join
+        over the user list, so each user keeps its own candidate pool,
+        ranking and ``limit`` while the whole set costs one round trip.
+        With a reranker each user's candidate pool is scored by it, as in
+        scored_search(). ``link_hops`` / ``link_fanout``: see scored_search();
+        the walk runs inside the same statement (one more, shared by all
+        users, with a reranker).
+
+        Returns:
+            {user_id: scored_search()-shaped result list} for every user.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        _, vector_str = await self._prepare_query_vector(query, query_embedding)
+
+        bm25_query = _sanitize_bm25_query(query) if self._pg_search else query
+        params: dict = {
+            "limit": limit, "decay_rate": decay_rate, "query_text": bm25_query,
+            "query_vec": vector_str, "user_ids": user_ids,
+        }
+        filters = self._build_base_filters(
+            params, user_id="", memory_type=memory_type,
+            created_after=created_after, created_before=created_before,
+            event_after=event_after, event_before=event_before,
+            as_of=as_of, exclude_types=exclude_types,
+            user_id_expr="u.user_id",
+        )
         filters += " AND NOT (memory_type = 'trait' AND trait_stage IN ('trend', 'candidate', 'dissolved'))"
 
-        # Emotion matching bonus SQL fragment
+        candidate_limit = limit * 2 if self._pg_search else limit * 4
+        if self._reranker is not None:
+            # Same candidate pools in one statement, scored in Python like scored_search()
+            del params["limit"], params["decay_rate"]
+            per_user_sql = self._candidate_query_sql(
+                filters, candidate_limit,
+                query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+            )
+            order_by = "r.vector_rank"
+        else:
+            per_user_sql = self._scored_query_sql(
+                filters, candidate_limit,
+                self._emotion_bonus_sql(current_emotion),
+                self._context_bonus_sql(params, query_context, context_confidence),
+                query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+                link_hops=link_hops, link_fanout=link_fanout, user_id_expr="u.user_id",
+            )
+            order_by = "r.link_hop NULLS FIRST, r.score DESC, r.link_weight DESC" if link_hops else "r.score DESC"
+        sql = text(f"""
+            SELECT u.user_id AS owner_id, r.*
+            FROM unnest(CAST(:user_ids AS text[])) AS u(user_id)
+            CROSS JOIN LATERAL ({per_user_sql}) AS r
+            ORDER BY u.user_id, {order_by}
+        """)
+
+        # Selectivity is learned for the user set as a whole
+        rows = await self._execute_vector_query(sql, params, "\x1f".join(sorted(user_ids)), candidate_limit)
+
+        grouped: dict[str, list[dict]] = {uid: [] for uid in user_ids}
+        if self._reranker is not None:
+            candidates: dict[str, list] = {uid: [] for uid in user_ids}
+            for row in rows:
+                candidates[row.owner_id].append(row)
+            for uid, user_rows in candidates.items():
+                grouped[uid] = self.rerank_candidates(
+                    user_rows, limit, decay_rate,
+                    current_emotion=current_emotion,
+                    query_context=query_context, context_confidence=context_confidence,
+                )
+        else:
+            for row in rows:
+                if getattr(row, "link_hop", None) is None:
+                    grouped[row.owner_id].append(self._scored_row_to_dict(row))
+
+        for uid, results in grouped.items():
+            if results:
+                await self._update_access_tracking(uid, [r["id"] for r in results])
+
+        if not link_hops:
+            return grouped
+        if self._reranker is not None:
+            linked = await self.linked_memories_users(
+                {uid: [r["id"] for r in results] for uid, results in grouped.items()},
+                link_hops, link_fanout,
+            )
+        else:
+            linked = {uid: [] for uid in user_ids}
+            for row in rows:
+                if row.link_hop is not None:
+                    linked[row.owner_id].append(self._linked_row_to_dict(row))
+        return {uid: results + linked[uid] for uid, results in grouped.items()}
+
+    @staticmethod
+    def _emotion_bonus_sql(current_emotion: dict | None) -> str:
+        """Emotion matching bonus SQL fragment (0~0.10)."""
         if current_emotion and isinstance(current_emotion, dict):
             q_valence = float(current_emotion.get("valence", 0))
             q_arousal = float(current_emotion.get("arousal", 0))
-            emotion_bonus_sql = (
+            return (
                 f"0.10 * GREATEST(0, 1.0 - SQRT("
-                f"  POWER(COALESCE((metadata->'emotion'->>'valence')::float, 0) - {q_valence}, 2)"
-                f"  + POWER(COALESCE((metadata->'emotion'->>'arousal')::float, 0) - {q_arousal}, 2)"
+                f"  POWER(COALESCE(valence, 0) - {q_valence}, 2)"
+                f"  + POWER(COALESCE(arousal, 0) - {q_arousal}, 2)"
                 f") / 2.83)"
             )
-        else:
-            emotion_bonus_sql = "0"
+        return "0"
 
-        # Context matching bonus SQL fragment
-        _VALID_CONTEXTS = {"work", "personal", "social", "learning", "general"}
+    @staticmethod
+    def _context_bonus_sql(params: dict, query_context: str | None, context_confidence: float) -> str:
+        """Context matching bonus SQL fragment, mutating params dict."""
         if query_context and query_context not in _VALID_CONTEXTS:
             query_context = None
         if query_context and query_context != "general" and context_confidence > 0:
             max_context_boost = ContextService.MAX_CONTEXT_BOOST
             general_context_boost = ContextService.GENERAL_CONTEXT_BOOST
-            context_bonus_sql = (
+            params["query_context"] = query_context
+            return (
                 f"CASE"
                 f"  WHEN trait_context = :query_context"
                 f"  THEN {max_context_boost * context_confidence:.4f}"
@@ -358,131 +1323,60 @@ class SearchService:
                 f"  ELSE 0"
                 f" END"
             )
-            params["query_context"] = query_context
-        else:
-            context_bonus_sql = "0"
+        return "0"
 
-        candidate_limit = limit * 2 if self._pg_search else limit * 4
-        bm25_cte = self._build_bm25_cte(filters, candidate_limit) + ","
+    def _scored_row_to_dict(self, row) -> dict:
+        return {
+            "id": str(row.id),
+            "content": self._maybe_decrypt(row.content),
+            "memory_type": row.memory_type,
+            "metadata": row.metadata,
+            "created_at": row.created_at,
+            "extracted_timestamp": row.extracted_timestamp,
+            "relevance": round(float(row.relevance), 4),
+            "bm25_score": round(float(row.bm25_score), 4),
+            "rrf_score": round(float(row.rrf_score), 4),
+            "recency": round(float(row.recency), 4),
+            "importance": round(float(row.importance), 4),
+            "access_boost": round(float(row.access_boost), 4),
+            "emotion_match": round(float(row.emotion_match), 4),
+            "context_match": round(float(row.context_match), 4),
+            "score": round(float(row.score), 4),
+        }
 
-        sql = text(
-            f"""
-            WITH vector_ranked AS (
-                SELECT id, content, memory_type, metadata, created_at, extracted_timestamp,
-                       access_count, last_accessed_at, trait_stage, trait_context,
-                       1 - (embedding <=> CAST(:query_vec AS vector)) AS vector_score,
-                       ROW_NUMBER() OVER (ORDER BY embedding <=> CAST(:query_vec AS vector)) AS vector_rank
-                FROM memories
-                WHERE {filters}
-                ORDER BY embedding <=> CAST(:query_vec AS vector)
-                LIMIT {candidate_limit}
-            ),
-            {bm25_cte}
-            hybrid AS (
-                SELECT v.*,
-                       COALESCE(b.bm25_score, 0) AS bm25_score,
-                       -- RRF fusion as relevance signal
-                       (1.0 / ({RRF_K} + v.vector_rank))
-                       + COALESCE(1.0 / ({RRF_K} + b.bm25_rank), 0) AS rrf_score
-                FROM vector_ranked v
-                LEFT JOIN bm25_ranked b ON v.id = b.id
-            )
-            SELECT id, content, memory_type, metadata, created_at, extracted_timestamp,
-                   access_count, last_accessed_at, trait_stage, trait_context,
-                   vector_score AS relevance,
-                   bm25_score,
-                   rrf_score,
-                   -- recency_bonus: 0~0.15, with 7-day protection
-                   CASE
-                       WHEN EXTRACT(EPOCH FROM (NOW() - COALESCE((metadata->>'event_time')::timestamp, created_at))) < 604800
-                       THEN 0.15
-                       ELSE 0.15 * EXP(
-                           -EXTRACT(EPOCH FROM (NOW() - COALESCE((metadata->>'event_time')::timestamp, created_at)))
-                           / (:decay_rate * (1 + COALESCE((metadata->'emotion'->>'arousal')::float, 0) * 0.5))
-                       )
-                   END AS recency,
-                   -- importance_bonus: 0~0.15
-                   0.15 * COALESCE((metadata->>'importance')::float / 10.0, 0.5) AS importance,
-                   -- access_boost: 0~0.10, logarithmic based on access_count
-                   0.10 * LEAST(LN(GREATEST(access_count, 0) + 1) / LN(101), 1.0) AS access_boost,
-                   -- emotion_match_bonus: 0~0.10
-                   {emotion_bonus_sql} AS emotion_match,
-                   -- context_match_bonus: 0~0.10
-                   {context_bonus_sql} AS context_match,
-                   -- final score: prospective_penalty × base_relevance × (1 + recency + importance + access_boost + trait_boost + emotion_match)
-                   CASE
-                       WHEN metadata->>'temporality' = 'prospective'
-                            AND (metadata->>'event_time') IS NOT NULL
-                            AND (metadata->>'event_time')::timestamp < NOW()
-                       THEN 0.5
-                       ELSE 1.0
-                   END
-                   *
-                   LEAST(vector_score + CASE WHEN bm25_score > 0 THEN 0.05 ELSE 0 END, 1.0)
-                   * (1.0
-                      + CASE
-                          WHEN EXTRACT(EPOCH FROM (NOW() - COALESCE((metadata->>'event_time')::timestamp, created_at))) < 604800
-                          THEN 0.15
-                          ELSE 0.15 * EXP(
-                              -EXTRACT(EPOCH FROM (NOW() - COALESCE((metadata->>'event_time')::timestamp, created_at)))
-                              / (:decay_rate * (1 + COALESCE((metadata->'emotion'->>'arousal')::float, 0) * 0.5))
-                          )
-                        END
-                      + 0.15 * COALESCE((metadata->>'importance')::float / 10.0, 0.5)
-                      + 0.10 * LEAST(LN(GREATEST(access_count, 0) + 1) / LN(101), 1.0)
-                      + CASE
-                          WHEN memory_type = 'trait' THEN
-                              CASE trait_stage
-                                  WHEN 'core'        THEN 0.25
-                                  WHEN 'established' THEN 0.15
-                                  WHEN 'emerging'    THEN 0.05
-                                  ELSE 0
-                              END
-                          ELSE 0
-                        END
-                      + {emotion_bonus_sql}
-                      + {context_bonus_sql}
-                   ) AS score
-            FROM hybrid
-            ORDER BY score DESC
-            LIMIT :limit
-        """
-        )
-
-        result = await self.db.execute(sql, params)
-        rows = result.fetchall()
-
-        results = [
-            {
-                "id": str(row.id),
-                "content": self._maybe_decrypt(row.content),
-                "memory_type": row.memory_type,
-                "metadata": row.metadata,
-                "created_at": row.created_at,
-                "extracted_timestamp": row.extracted_timestamp,
-                "relevance": round(float(row.relevance), 4),
-                "bm25_score": round(float(row.bm25_score), 4),
-                "rrf_score": round(float(row.rrf_score), 4),
-                "recency": round(float(row.recency), 4),
-                "importance": round(float(row.importance), 4),
-                "access_boost": round(float(row.access_boost), 4),
-                "emotion_match": round(float(row.emotion_match), 4),
-                "context_match": round(float(row.context_match), 4),
-                "score": round(float(row.score), 4),
-            }
-            for row in rows
-        ]
+    def _linked_row_to_dict(self, row) -> dict:
+        return {
+            "id": str(row.id),
+            "content": self._maybe_decrypt(row.content),
+            "memory_type": row.memory_type,
+            "metadata": row.metadata,
+            "created_at": row.created_at,
+            # Below any ranked hit; decays with distance and link weight
+            "score": round(0.03 * float(row.link_weight) / row.link_hop, 4),
+            "source": "linked",
+            "link_hop": row.link_hop,
+        }
 
-        # Update access tracking
-        if results:
-            await self._update_access_tracking(user_id, [r["id"] for r in results])
-
-        return results
+    def _candidate_to_dict(self, row, features: dict[str, float]) -> dict:
+        return {
+            "id": str(row.id),
+            "content": self._maybe_decrypt(row.content),
+            "memory_type": row.memory_type,
+            "metadata": row.metadata,
+            "created_at": row.created_at,
+            "extracted_timestamp": row.extracted_timestamp,
+            "relevance": round(float(row.vector_score), 4),
+            "bm25_score": round(float(row.bm25_score), 4),
+            **{name: round(value, 4) for name, value in features.items()},
+        }
 
     async def _update_access_tracking(self, user_id: str, ids: list[str]) -> None:
         """Update access_count and last_accessed_at for retrieved memories."""
         if not ids:
             return
+        if self._access_tracker is not None:
+            self._access_tracker.record(user_id, ids)
+            return
         try:
             placeholders = ", ".join(f":id_{i}" for i in range(len(ids)))
             params = {f"id_{i}": id_ for i, id_ in enumerate(ids)}
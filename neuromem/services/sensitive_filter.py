@@ -1,5 +1,7 @@
 """Sensitive content filter for trait creation."""
 
+from neuromem.services.pattern_matcher import PatternMatcher
+
 # Categories that should never be inferred as traits
 SENSITIVE_TRAIT_CATEGORIES = frozenset({
     "mental_health",       # 心理健康、精神状态
@@ -31,8 +33,9 @@ _SENSITIVE_KEYWORDS = {
     "drug abuse", "alcoholism", "gambling", "assault",
 }
 
+_SENSITIVE_MATCHER = PatternMatcher(_SENSITIVE_KEYWORDS, ignore_case=True)
+
 
 def is_sensitive_trait(content: str) -> bool:
     """Check if trait content touches a sensitive category."""
-    lower = content.lower()
-    return any(kw in lower for kw in _SENSITIVE_KEYWORDS)
+    return _SENSITIVE_MATCHER.search(content)
@@ -18,6 +18,7 @@ from neuromem.models.memory_history import MemoryHistory
 from neuromem.models.trait_evidence import TraitEvidence
 from neuromem.providers.embedding import EmbeddingProvider
 from neuromem.providers.llm import LLMProvider
+from neuromem.providers.scheduler import llm_priority
 from neuromem.services.sensitive_filter import is_sensitive_trait
 
 logger = logging.getLogger(__name__)
@@ -539,14 +540,15 @@ class TraitEngine:
         )
 
         try:
-            result_text = await llm.chat(
-                messages=[
-                    {"role": "system", "content": "你是一个用户特质矛盾分析系统。只返回 JSON。"},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=1024,
-            )
+            with llm_priority("maintenance"):
+                result_text = await llm.chat(
+                    messages=[
+                        {"role": "system", "content": "你是一个用户特质矛盾分析系统。只返回 JSON。"},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=1024,
+                )
             parsed = self._parse_json(result_text)
         except Exception as e:
             logger.error("resolve_contradiction LLM failed: %s", e, exc_info=True)
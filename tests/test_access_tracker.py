@@ -0,0 +1,165 @@
+"""Tests for deferred, batched access-count tracking."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import text
+
+from neuromem.services.access_tracker import AccessTracker
+
+
+class _RecordingDB:
+    """Minimal Database stand-in that records flush statements."""
+
+    def __init__(self, fail: int = 0):
+        self.executed: list[dict] = []
+        self.track_writes: list[bool] = []
+        self.fail = fail  # number of upcoming flushes that raise
+
+    @asynccontextmanager
+    async def session(self, track_writes: bool = True):
+        self.track_writes.append(track_writes)
+        db = self
+
+        class _Session:
+            async def execute(self, stmt, params):
+                if db.fail:
+                    db.fail -= 1
+                    raise ConnectionError("database unavailable")
+                db.executed.append(params)
+
+        yield _Session()
+
+
+# ---------------------------------------------------------------------------
+# Unit tests: buffering and flushing
+# ---------------------------------------------------------------------------
+
+
+class TestAccessTrackerBuffer:
+    @pytest.mark.asyncio
+    async def test_record_does_no_io(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=0)
+        tracker.record("u1", ["a", "b"])
+        tracker.record("u1", ["a"])
+        assert len(tracker) == 2
+        assert db.executed == []
+
+    @pytest.mark.asyncio
+    async def test_flush_aggregates_counts_in_one_statement(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=0)
+        tracker.record("u1", ["a", "b"])
+        tracker.record("u1", ["a"])
+        tracker.record("u2", ["c"])
+
+        assert await tracker.flush() == 3
+        assert len(db.executed) == 1
+        params = db.executed[0]
+        counts = dict(zip(params["ids"], params["counts"]))
+        assert counts == {"a": 2, "b": 1, "c": 1}
+        assert dict(zip(params["ids"], params["user_ids"]))["c"] == "u2"
+        assert db.track_writes == [False]
+        assert len(tracker) == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_flush_is_noop(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=0)
+        assert await tracker.flush() == 0
+        assert db.executed == []
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts_for_next_flush(self):
+        db = _RecordingDB(fail=1)
+        tracker = AccessTracker(db, flush_interval=0)
+        tracker.record("u1", ["a", "b"])
+        first_ts = tracker._buffer["a"][2]
+
+        session = db.session
+
+        @asynccontextmanager
+        async def _session(track_writes=True):
+            tracker.record("u1", ["a"])  # recorded while the failing write is in flight
+            async with session(track_writes) as s:
+                yield s
+
+        db.session = _session
+        assert await tracker.flush() == 0
+        assert len(tracker) == 2
+        latest_ts = tracker._buffer["a"][2]
+        assert latest_ts >= first_ts
+
+        db.session = session
+        assert await tracker.flush() == 2
+        params = db.executed[0]
+        assert dict(zip(params["ids"], params["counts"])) == {"a": 2, "b": 1}
+        assert dict(zip(params["ids"], params["ts"]))["a"] == latest_ts
+        assert len(tracker) == 0
+
+    @pytest.mark.asyncio
+    async def test_overflow_triggers_early_flush(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=0, max_buffer_size=3)
+        tracker.record("u1", ["a", "b"])
+        await asyncio.sleep(0)
+        assert db.executed == []
+        tracker.record("u1", ["c"])
+        await asyncio.sleep(0)
+        assert len(db.executed) == 1
+        assert len(tracker) == 0
+
+    @pytest.mark.asyncio
+    async def test_periodic_flush(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=0.01)
+        tracker.record("u1", ["a"])
+        await asyncio.sleep(0.05)
+        assert len(db.executed) == 1
+        await tracker.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_remaining(self):
+        db = _RecordingDB()
+        tracker = AccessTracker(db, flush_interval=60)
+        tracker.record("u1", ["a", "b"])
+        await tracker.close()
+        assert len(db.executed) == 1
+        assert sorted(db.executed[0]["ids"]) == ["a", "b"]
+
+
+# ---------------------------------------------------------------------------
+# Integration: recall no longer writes synchronously
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.requires_db
+class TestAccessTrackerIntegration:
+    @pytest.mark.asyncio
+    async def test_recall_access_counts_flushed_in_batch(self, nm):
+        user = "access_tracker_u1"
+        record = await nm._add_memory(user_id=user, content="I enjoy hiking in the Alps")
+
+        for _ in range(3):
+            await nm.recall(user, "hiking in the Alps")
+
+        async with nm._db.session() as session:
+            row = (await session.execute(
+                text("SELECT access_count FROM memories WHERE id = :id"),
+                {"id": str(record.id)},
+            )).fetchone()
+        assert row.access_count == 0  # still buffered
+
+        await nm._access_tracker.flush()
+
+        async with nm._db.session() as session:
+            row = (await session.execute(
+                text("SELECT access_count, last_accessed_at FROM memories WHERE id = :id"),
+                {"id": str(record.id)},
+            )).fetchone()
+        assert row.access_count == 3
+        assert row.last_accessed_at is not None
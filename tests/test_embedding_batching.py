@@ -0,0 +1,134 @@
+"""Tests for the embedding micro-batching coalescer."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from neuromem import NeuroMemory
+from neuromem.providers.batching import BatchingEmbedding, current_batch
+from neuromem.providers.embedding import EmbeddingProvider
+
+_UNREACHABLE_URL = "postgresql+asyncpg://x:y@localhost:1/z"
+
+
+class _RecordingEmbedding(EmbeddingProvider):
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.delay = delay
+        self.fail = fail
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def dims(self) -> int:
+        return 2
+
+    async def embed(self, text: str) -> list[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("provider down")
+            return [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+        finally:
+            self.running -= 1
+
+
+class TestBatchingEmbedding:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        inner = _RecordingEmbedding()
+        batcher = BatchingEmbedding(inner, max_batch_size=32, max_wait_ms=5)
+        texts = ["a", "bb", "ccc", "bb"]
+        vectors = await asyncio.gather(*(batcher.embed(t) for t in texts))
+
+        assert inner.batches == [["a", "bb", "ccc"]]  # duplicates embedded once
+        assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 2.0]
+        assert vectors[1] == vectors[3]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_sent_without_waiting(self):
+        inner = _RecordingEmbedding()
+        batcher = BatchingEmbedding(inner, max_batch_size=2, max_wait_ms=10_000)
+        vectors = await asyncio.wait_for(
+            asyncio.gather(*(batcher.embed(t) for t in ["a", "b", "c", "d"])), timeout=1,
+        )
+        assert inner.batches == [["a", "b"], ["c", "d"]]
+        assert len(vectors) == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        batcher = BatchingEmbedding(_RecordingEmbedding(fail=True), max_wait_ms=1)
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_batch(self):
+        inner = _RecordingEmbedding()
+        batcher = BatchingEmbedding(inner, max_wait_ms=20)
+        doomed = asyncio.ensure_future(batcher.embed("gone"))
+        kept = asyncio.ensure_future(batcher.embed("kept"))
+        await asyncio.sleep(0)
+        doomed.cancel()
+        assert (await kept)[0] == 4.0
+        assert inner.batches == [["kept"]]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_cap(self):
+        inner = _RecordingEmbedding(delay=0.01)
+        batcher = BatchingEmbedding(inner, max_batch_size=1, max_in_flight=2)
+        await asyncio.gather(*(batcher.embed(str(i)) for i in range(6)))
+        await asyncio.gather(*(batcher.embed_batch([str(i)]) for i in range(6)))
+        assert len(inner.batches) == 12
+        assert inner.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_stats_visible_to_inner(self):
+        seen = []
+
+        class _Spy(_RecordingEmbedding):
+            async def embed_batch(self, texts):
+                seen.append(current_batch())
+                return await super().embed_batch(texts)
+
+        batcher = BatchingEmbedding(_Spy(), max_wait_ms=1)
+        await asyncio.gather(batcher.embed("a"), batcher.embed("b"))
+        await batcher.embed_batch(["direct"])
+        assert seen[0]["coalesced"] == 2 and seen[0]["queue_ms"] >= 0
+        assert seen[1] is None
+        assert current_batch() is None
+
+    @pytest.mark.asyncio
+    async def test_drain(self):
+        inner = _RecordingEmbedding()
+        batcher = BatchingEmbedding(inner, max_wait_ms=10_000)
+        pending = asyncio.ensure_future(batcher.embed("a"))
+        await asyncio.sleep(0)
+        await batcher.drain()
+        assert pending.done() and inner.batches == [["a"]]
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_callback_reports_batch_size_and_queue_delay(self, mock_llm):
+        events = []
+        inner = _RecordingEmbedding()
+        nm = NeuroMemory(
+            database_url=_UNREACHABLE_URL, embedding=inner, llm=mock_llm,
+            on_embedding_call=events.append, embedding_batch_wait_ms=1,
+        )
+        await asyncio.gather(*(nm._embedding.embed(t) for t in ["x", "yy", "zzz"]))
+
+        assert inner.batches == [["x", "yy", "zzz"]]
+        assert len(events) == 1
+        assert events[0]["text_count"] == 3 and events[0]["coalesced"] == 3
+        assert "queue_ms" in events[0] and events[0]["success"]
@@ -39,8 +39,8 @@ async def test_store_triple_creates_nodes_and_edge(db_session):
     assert edges[0].edge_type == "WORKS_AT"
     assert edges[0].source_id == "u1"
     assert edges[0].target_id == "google"
-    assert edges[0].properties["valid_from"] is not None
-    assert edges[0].properties["valid_until"] is None
+    assert edges[0].valid_from is not None
+    assert edges[0].valid_until is None
 
 
 @pytest.mark.asyncio
@@ -100,8 +100,8 @@ async def test_conflict_resolution_update(db_session):
     google_edge = [e for e in edges if e.target_id == "google"][0]
     meta_edge = [e for e in edges if e.target_id == "meta"][0]
 
-    assert google_edge.properties["valid_until"] is not None  # invalidated
-    assert meta_edge.properties["valid_until"] is None  # active
+    assert google_edge.valid_until is not None  # invalidated
+    assert meta_edge.valid_until is None  # active
 
 
 @pytest.mark.asyncio
@@ -166,3 +166,55 @@ async def test_custom_relation_stored(db_session):
     edges = (await db_session.execute(select(GraphEdge))).scalars().all()
     assert edges[0].edge_type == "CUSTOM"
     assert edges[0].properties["relation_name"] == "manages"
+
+
+@pytest.mark.asyncio
+async def test_time_travel_uses_typed_columns(db_session):
+    """as_of queries see the edge that was active at that time."""
+    from datetime import datetime, timedelta, timezone
+
+    svc = GraphMemoryService(db_session)
+    await svc.store_triples("u1", [{
+        "subject": "user", "subject_type": "user", "relation": "works_at",
+        "object": "Google", "object_type": "organization",
+        "content": "在 Google 工作", "confidence": 0.8,
+    }])
+    await db_session.flush()
+    between = datetime.now(timezone.utc)
+    await svc.store_triples("u1", [{
+        "subject": "user", "subject_type": "user", "relation": "works_at",
+        "object": "Meta", "object_type": "organization",
+        "content": "在 Meta 工作", "confidence": 0.9,
+    }])
+    await db_session.flush()
+
+    current = await svc.find_entity_facts("u1", "u1")
+    assert [(f["object"], f["confidence"]) for f in current] == [("Meta", pytest.approx(0.9))]
+    past = await svc.find_entity_facts("u1", "u1", as_of=between)
+    assert [f["object"] for f in past] == ["Google"]
+    assert await svc.find_entity_facts("u1", "u1", as_of=between - timedelta(days=1)) == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_from_properties(db_session):
+    """Edges written before the typed columns get them from properties."""
+    from sqlalchemy import select, text
+
+    from neuromem.db import GRAPH_EDGE_BACKFILL_SQL
+
+    db_session.add(GraphEdge(
+        user_id="u1", source_type="User", source_id="u1", edge_type="WORKS_AT",
+        target_type="Organization", target_id="google",
+        properties={
+            "content": "legacy", "confidence": 0.7,
+            "valid_from": "2024-01-01T00:00:00+00:00", "valid_until": "2024-06-01T00:00:00+00:00",
+        },
+    ))
+    await db_session.flush()
+    await db_session.execute(text(GRAPH_EDGE_BACKFILL_SQL))
+
+    edge = (await db_session.execute(
+        select(GraphEdge).execution_options(populate_existing=True)
+    )).scalars().one()
+    assert edge.valid_from.year == 2024 and edge.valid_until.month == 6
+    assert edge.confidence == pytest.approx(0.7)
@@ -0,0 +1,114 @@
+"""Tests for set-based graph traversal (bidirectional find_path, k_hop_neighbors)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from neuromem.models.graph import EdgeType, NodeType
+from neuromem.services.graph import GraphService
+
+TEST_USER_ID = "traversal-user"
+
+
+def _edge(src: str, dst: str, edge_type: str = "KNOWS") -> SimpleNamespace:
+    return SimpleNamespace(
+        source_type="Entity", source_id=src, edge_type=edge_type,
+        target_type="Entity", target_id=dst, properties={"via": f"{src}-{dst}"},
+    )
+
+
+def _graph_session(scripted_session, edges):
+    """Session answering frontier-expansion queries from an in-memory edge list."""
+
+    def _expand(sql, params):
+        frontier = set(zip(params["types"], params["ids"]))
+        rows = []
+        for e in edges:
+            if (e.source_type, e.source_id) in frontier:
+                rows.append(SimpleNamespace(outgoing=True, **vars(e)))
+            if (e.target_type, e.target_id) in frontier:
+                rows.append(SimpleNamespace(outgoing=False, **vars(e)))
+        return rows
+
+    return scripted_session(respond=_expand)
+
+
+def _path_ids(result):
+    return [n["id"] for n in result[0]["nodes"]]
+
+
+class TestFindPath:
+    @pytest.mark.asyncio
+    async def test_shortest_path_through_both_directions(self, scripted_session):
+        # a -> b -> c <- d -> e, plus a longer detour a -> x -> y -> z -> e
+        edges = [_edge("a", "b"), _edge("b", "c"), _edge("d", "c"), _edge("d", "e"),
+                 _edge("a", "x"), _edge("x", "y"), _edge("y", "z"), _edge("z", "w")]
+        session = _graph_session(scripted_session, edges)
+        svc = GraphService(session, user_id=TEST_USER_ID)
+
+        result = await svc.find_path(NodeType.ENTITY, "a", NodeType.ENTITY, "e", max_depth=4)
+        assert _path_ids(result) == ["a", "b", "c", "d", "e"]
+        assert [r["props"]["via"] for r in result[0]["rels"]] == ["a-b", "b-c", "d-c", "d-e"]
+        # one query per hop, not two per visited node
+        assert len(session.statements) == 4
+
+    @pytest.mark.asyncio
+    async def test_depth_limit(self, scripted_session):
+        session = _graph_session(scripted_session, [_edge("a", "b"), _edge("b", "c"), _edge("c", "d")])
+        svc = GraphService(session, user_id=TEST_USER_ID)
+        assert await svc.find_path(NodeType.ENTITY, "a", NodeType.ENTITY, "d", max_depth=2) == []
+        result = await svc.find_path(NodeType.ENTITY, "a", NodeType.ENTITY, "d", max_depth=3)
+        assert _path_ids(result) == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_same_node_and_disconnected(self, scripted_session):
+        session = _graph_session(scripted_session, [_edge("a", "b"), _edge("c", "d")])
+        svc = GraphService(session, user_id=TEST_USER_ID)
+        same = await svc.find_path(NodeType.ENTITY, "a", NodeType.ENTITY, "a")
+        assert same == [{"nodes": [{"type": "Entity", "id": "a"}], "rels": []}]
+        assert len(session.statements) == 0
+        assert await svc.find_path(NodeType.ENTITY, "a", NodeType.ENTITY, "d", max_depth=5) == []
+
+    @pytest.mark.asyncio
+    async def test_hub_expands_smaller_side(self, scripted_session):
+        # source is a hub with many neighbors; the target side is expanded instead
+        edges = [_edge("hub", f"n{i}") for i in range(50)] + [_edge("n7", "t")]
+        session = _graph_session(scripted_session, edges)
+        svc = GraphService(session, user_id=TEST_USER_ID)
+        result = await svc.find_path(NodeType.ENTITY, "hub", NodeType.ENTITY, "t", max_depth=3)
+        assert _path_ids(result) == ["hub", "n7", "t"]
+        assert len(session.statements) == 2
+
+
+class TestKHopValidation:
+    @pytest.mark.asyncio
+    async def test_invalid_k(self, scripted_session):
+        svc = GraphService(_graph_session(scripted_session, []), user_id=TEST_USER_ID)
+        with pytest.raises(ValueError, match="k must be"):
+            await svc.k_hop_neighbors(NodeType.ENTITY, "a", k=0)
+
+
+@pytest.mark.requires_db
+class TestKHopNeighbors:
+    @pytest.mark.asyncio
+    async def test_subgraph_within_k_hops(self, db_session):
+        svc = GraphService(db_session, user_id=TEST_USER_ID)
+        for node in ("a", "b", "c", "d"):
+            await svc.create_node(NodeType.ENTITY, node, {"name": node.upper()})
+        await svc.create_edge(NodeType.ENTITY, "a", EdgeType.KNOWS, NodeType.ENTITY, "b")
+        await svc.create_edge(NodeType.ENTITY, "c", EdgeType.KNOWS, NodeType.ENTITY, "b")
+        await svc.create_edge(NodeType.ENTITY, "c", EdgeType.WORKS_AT, NodeType.ENTITY, "d")
+        await db_session.flush()
+
+        two_hops = await svc.k_hop_neighbors(NodeType.ENTITY, "a", k=2)
+        assert [(n["node_id"], n["depth"]) for n in two_hops["nodes"]] == [("a", 0), ("b", 1), ("c", 2)]
+        assert two_hops["nodes"][1]["properties"] == {"name": "B"}
+        assert {(e["source_id"], e["target_id"]) for e in two_hops["edges"]} == {("a", "b"), ("c", "b")}
+
+        knows_only = await svc.k_hop_neighbors(NodeType.ENTITY, "a", k=3, edge_types=[EdgeType.KNOWS])
+        assert [n["node_id"] for n in knows_only["nodes"]] == ["a", "b", "c"]
+
+        limited = await svc.k_hop_neighbors(NodeType.ENTITY, "a", k=3, limit=1)
+        assert [n["node_id"] for n in limited["nodes"]] == ["a", "b"]
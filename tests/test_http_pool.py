@@ -0,0 +1,177 @@
+"""Tests for the pooled keep-alive HTTP client used by the API providers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from neuromem import NeuroMemory
+from neuromem.providers.openai_llm import OpenAILLM
+from neuromem.providers.siliconflow import SiliconFlowEmbedding
+
+_UNREACHABLE_URL = "postgresql+asyncpg://x:y@localhost:1/z"
+
+
+class _StubServer:
+    """Minimal HTTP/1.1 keep-alive server answering embeddings and chat requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.open = 0
+        self.peak_open = 0
+        self.requests = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.open += 1
+        self.peak_open = max(self.peak_open, self.open)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))) or b"{}")
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                if request_line.split()[1].endswith(b"/embeddings"):
+                    payload = {"data": [
+                        {"index": i, "embedding": [float(len(t)), 1.0]} for i, t in enumerate(body["input"])
+                    ]}
+                else:
+                    payload = {"choices": [{"message": {"content": "ok"}}]}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.open -= 1
+            writer.close()
+
+
+class TestPooledProviders:
+    @pytest.mark.asyncio
+    async def test_sequential_calls_reuse_one_connection(self):
+        stub = _StubServer()
+        async with stub as url:
+            embedding = SiliconFlowEmbedding(api_key="k", base_url=url, dimensions=2)
+            for text in ["a", "bb", "ccc"]:
+                assert (await embedding.embed(text))[0] == float(len(text))
+            llm = OpenAILLM(api_key="k", base_url=url)
+            assert await llm.chat([{"role": "user", "content": "hi"}]) == "ok"
+            await embedding.aclose()
+            await llm.aclose()
+        assert stub.requests == 4
+        assert stub.connections == 2  # one pooled connection per provider
+
+    @pytest.mark.asyncio
+    async def test_burst_bounded_by_max_connections(self):
+        stub = _StubServer(delay=0.01)
+        async with stub as url:
+            embedding = SiliconFlowEmbedding(api_key="k", base_url=url, max_connections=3)
+            await asyncio.gather(*(embedding.embed(str(i)) for i in range(12)))
+            await embedding.aclose()
+        assert stub.requests == 12
+        assert stub.peak_open <= 3
+
+    @pytest.mark.asyncio
+    async def test_aclose_then_reuse(self):
+        stub = _StubServer()
+        async with stub as url:
+            embedding = SiliconFlowEmbedding(api_key="k", base_url=url)
+            await embedding.embed("a")
+            await embedding.aclose()
+            await embedding.embed("b")  # transparently reopens the pool
+            await embedding.aclose()
+        assert stub.connections == 2
+
+    def test_new_event_loop_gets_new_client(self):
+        embedding = SiliconFlowEmbedding(api_key="k", base_url="http://127.0.0.1:1/v1")
+
+        async def _client():
+            return embedding._http.get()
+
+        assert asyncio.run(_client()) is not asyncio.run(_client())
+
+    @pytest.mark.asyncio
+    async def test_neuromemory_close_releases_pools(self):
+        llm = OpenAILLM(api_key="k")
+        embedding = SiliconFlowEmbedding(api_key="k")
+        nm = NeuroMemory(database_url=_UNREACHABLE_URL, embedding=embedding, llm=llm)
+        llm_client, embedding_client = llm._http.get(), embedding._http.get()
+        await nm.close()
+        assert llm_client.is_closed and embedding_client.is_closed
+
+
+async def _per_call_client(url: str, i: int) -> None:
+    """What the providers did before pooling: a new AsyncClient per request."""
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        resp = await client.post(f"{url}/embeddings", json={"model": "m", "input": [str(i)]})
+        resp.raise_for_status()
+
+
+class TestConnectionReuse:
+    @pytest.mark.asyncio
+    async def test_pooled_client_opens_one_connection_per_call_site(self):
+        calls = 20
+        pooled_stub, per_call_stub = _StubServer(), _StubServer()
+        async with pooled_stub as url:
+            embedding = SiliconFlowEmbedding(api_key="k", base_url=url)
+            for i in range(calls):
+                await embedding.embed(str(i))
+            await embedding.aclose()
+        async with per_call_stub as url:
+            for i in range(calls):
+                await _per_call_client(url, i)
+
+        assert pooled_stub.requests == per_call_stub.requests == calls
+        assert pooled_stub.connections == 1
+        assert per_call_stub.connections == calls
+
+
+@pytest.mark.benchmark
+class TestPerformance:
+    """Local stub server benchmark: pooled client vs a new AsyncClient per call."""
+
+    @pytest.mark.asyncio
+    async def test_pooled_client_faster_than_client_per_call(self):
+        calls = 40
+        stub = _StubServer()
+        async with stub as url:
+            embedding = SiliconFlowEmbedding(api_key="k", base_url=url)
+            await embedding.embed("warmup")
+
+            start = time.perf_counter()
+            for i in range(calls):
+                await embedding.embed(str(i))
+            pooled = time.perf_counter() - start
+            await embedding.aclose()
+
+            start = time.perf_counter()
+            for i in range(calls):
+                await _per_call_client(url, i)
+            per_call = time.perf_counter() - start
+
+        assert pooled * 2 < per_call, f"pooled {pooled:.4f}s vs per-call client {per_call:.4f}s"
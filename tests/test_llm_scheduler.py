@@ -0,0 +1,187 @@
+"""Tests for the LLM scheduler: rate limits, concurrency, priorities and retries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from neuromem import NeuroMemory
+from neuromem.providers.llm import LLMProvider
+from neuromem.providers.scheduler import LLMScheduler, current_priority, llm_priority
+
+_UNREACHABLE_URL = "postgresql+asyncpg://x:y@localhost:1/z"
+
+_MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://llm/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+class _ScriptedLLM(LLMProvider):
+    """Fails with the queued errors first, then answers; records call order."""
+
+    def __init__(self, errors: list[Exception] | None = None, delay: float = 0.0):
+        self.errors = list(errors or [])
+        self.delay = delay
+        self.calls: list[str] = []
+        self.running = 0
+        self.peak = 0
+
+    async def chat(self, messages, temperature=0.1, max_tokens=2048) -> str:
+        self.calls.append(messages[0]["content"])
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            return "ok"
+        finally:
+            self.running -= 1
+
+
+async def _run(scheduler: LLMScheduler, llm: _ScriptedLLM, content: str = "hi", info=None):
+    messages = [{"role": "user", "content": content}]
+    return await scheduler.run(lambda: llm.chat(messages), messages, 16, info)
+
+
+class TestPriority:
+    def test_default_and_nested(self):
+        assert current_priority() == "extraction"
+        with llm_priority("reflection"):
+            with llm_priority("maintenance"):
+                assert current_priority() == "maintenance"
+            assert current_priority() == "reflection"
+        assert current_priority() == "extraction"
+
+    def test_unknown_priority(self):
+        with pytest.raises(ValueError):
+            with llm_priority("urgent"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_queued_calls_served_by_priority(self):
+        llm = _ScriptedLLM(delay=0.01)
+        scheduler = LLMScheduler(max_concurrency=1)
+
+        async def _call(priority, content):
+            with llm_priority(priority):
+                return await _run(scheduler, llm, content)
+
+        blocker = asyncio.ensure_future(_run(scheduler, llm, "first"))
+        await asyncio.sleep(0)
+        await asyncio.gather(
+            _call("maintenance", "m1"), _call("reflection", "r1"),
+            _call("maintenance", "m2"), _call("extraction", "e1"),
+        )
+        await blocker
+        assert llm.calls == ["first", "e1", "r1", "m1", "m2"]
+
+
+class TestLimits:
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        llm = _ScriptedLLM(delay=0.01)
+        scheduler = LLMScheduler(max_concurrency=2)
+        await asyncio.gather(*(_run(scheduler, llm) for _ in range(6)))
+        assert llm.peak == 2
+        assert scheduler.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute(self):
+        llm = _ScriptedLLM()
+        # One request every 50 ms, with 2 left in the bucket
+        scheduler = LLMScheduler(requests_per_minute=1200, max_concurrency=0)
+        scheduler._request_level = 2
+        start = time.monotonic()
+        await asyncio.gather(*(_run(scheduler, llm) for _ in range(4)))
+        assert time.monotonic() - start >= 0.09
+        assert len(llm.calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_tokens_per_minute_refunds_unused_completion(self):
+        scheduler = LLMScheduler(tokens_per_minute=6000, max_concurrency=0)
+        await _run(scheduler, _ScriptedLLM(), info={})
+        # "hi" costs 0 + 16 reserved tokens; "ok" used 0, so all 16 came back
+        assert scheduler._token_level == pytest.approx(6000, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_queue(self):
+        llm = _ScriptedLLM(delay=0.02)
+        scheduler = LLMScheduler(max_concurrency=1)
+        running = asyncio.ensure_future(_run(scheduler, llm, "a"))
+        await asyncio.sleep(0)
+        doomed = asyncio.ensure_future(_run(scheduler, llm, "b"))
+        kept = asyncio.ensure_future(_run(scheduler, llm, "c"))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"]["extraction"] == 2
+        doomed.cancel()
+        assert await kept == "ok" and await running == "ok"
+        assert llm.calls == ["a", "c"]
+        assert scheduler.stats()["running"] == 0
+
+
+class TestRetry:
+    @pytest.mark.asyncio
+    async def test_retries_rate_limit_and_reports(self):
+        llm = _ScriptedLLM(errors=[_status_error(429, {"retry-after": "0.01"}), _status_error(503)])
+        scheduler = LLMScheduler(retry_base_delay=0.01)
+        info = {}
+        assert await _run(scheduler, llm, info=info) == "ok"
+        assert info["retries"] == 2 and info["priority"] == "extraction"
+        assert info["queue_ms"] >= 10
+        stats = scheduler.stats()
+        assert stats["retries"] == 2 and stats["rate_limited"] == 1 and stats["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_raises_immediately(self):
+        llm = _ScriptedLLM(errors=[_status_error(400)])
+        scheduler = LLMScheduler(retry_base_delay=0.01)
+        with pytest.raises(httpx.HTTPStatusError):
+            await _run(scheduler, llm)
+        assert len(llm.calls) == 1 and scheduler.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        llm = _ScriptedLLM(errors=[RuntimeError("Too Many Requests")] * 5)
+        scheduler = LLMScheduler(max_retries=2, retry_base_delay=0.001)
+        with pytest.raises(RuntimeError):
+            await _run(scheduler, llm)
+        assert len(llm.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_queue(self):
+        llm = _ScriptedLLM(errors=[_status_error(429, {"retry-after": "0.05"})])
+        scheduler = LLMScheduler(max_concurrency=0)
+        first = asyncio.ensure_future(_run(scheduler, llm, "a"))
+        await asyncio.sleep(0.01)  # first call hit the 429
+        start = time.monotonic()
+        await _run(scheduler, llm, "b")
+        assert time.monotonic() - start >= 0.03
+        await first
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_callback_receives_scheduler_fields(self, mock_embedding):
+        events = []
+        llm = _ScriptedLLM(errors=[_status_error(502)])
+        nm = NeuroMemory(
+            database_url=_UNREACHABLE_URL, embedding=mock_embedding, llm=llm,
+            on_llm_call=events.append, llm_max_concurrency=1,
+        )
+        nm._llm_scheduler.retry_base_delay = 0.001
+        with llm_priority("reflection"):
+            assert await nm._llm.chat(_MESSAGES) == "ok"
+
+        assert len(events) == 1
+        assert events[0]["priority"] == "reflection" and events[0]["retries"] == 1
+        assert events[0]["success"] and "queue_ms" in events[0]
+        stats = nm.llm_scheduler_stats()
+        assert stats["granted"]["reflection"] == 2 and stats["retries"] == 1
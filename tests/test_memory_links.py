@@ -0,0 +1,106 @@
+"""Tests for the memory_links table and the Zettelkasten walk in recall."""
+
+from __future__ import annotations
+
+import pytest
+
+from neuromem import NeuroMemory
+from neuromem.services.search import SearchService
+
+_UNREACHABLE_URL = "postgresql+asyncpg://x:y@localhost:1/z"
+
+
+class TestLinkWalkSql:
+    def test_no_hops_keeps_plain_statement(self, mock_embedding):
+        sql = SearchService(None, mock_embedding)._scored_query_sql(
+            "user_id = :user_id", 40, "0", "0",
+            query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+        )
+        assert "RECURSIVE" not in sql and "memory_links" not in sql
+
+    def test_walk_folded_into_scored_statement(self, mock_embedding):
+        sql = SearchService(None, mock_embedding)._scored_query_sql(
+            "user_id = :user_id", 40, "0", "0",
+            query_vec_expr="CAST(:query_vec AS vector)", query_text_expr=":query_text",
+            link_hops=2, link_fanout=4,
+        )
+        assert sql.lstrip().startswith("WITH RECURSIVE")
+        assert "FROM (SELECT id FROM ranked) AS seed" in sql
+        assert "LIMIT 4\n" in sql  # per-memory fan-out
+        assert "WHERE w.hop < 2" in sql
+        assert "LIMIT 8\n" in sql  # fanout * hops overall
+        assert "ORDER BY link_hop NULLS FIRST" in sql
+
+
+class TestScoredSearchLinks:
+    @pytest.mark.asyncio
+    async def test_linked_rows_follow_hits(self, mock_embedding, scripted_session, memory_row):
+        rows = [
+            memory_row("a", content="likes tea", score=1.1),
+            memory_row("b", content="tea farm visit", score=None, link_hop=1, link_weight=0.8),
+            memory_row("c", content="kyoto trip", score=None, link_hop=2, link_weight=0.5),
+        ]
+        session = scripted_session(rows)
+        results = await SearchService(session, mock_embedding).scored_search("u1", "tea", limit=1, link_hops=2)
+
+        assert [r["id"] for r in results] == ["a", "b", "c"]
+        assert "source" not in results[0]
+        assert results[1]["source"] == "linked" and results[1]["link_hop"] == 1
+        assert results[0]["score"] > results[1]["score"] > results[2]["score"]
+        # one round trip for hits and links
+        assert sum("memory_links" in sql for sql in session.sqls) == 1
+
+    @pytest.mark.asyncio
+    async def test_linked_memories_binds_seed_ids(self, mock_embedding, scripted_session, memory_row):
+        session = scripted_session([memory_row("b", content="tea farm visit", link_hop=1, link_weight=1.0)])
+        svc = SearchService(session, mock_embedding)
+
+        assert await svc.linked_memories("u1", []) == []
+        [row] = await svc.linked_memories("u1", ["a"], link_hops=1)
+        sql, params = session.statements[0]
+        assert "unnest(CAST(:seed_ids AS uuid[]))" in sql
+        assert params == {"user_id": "u1", "seed_ids": ["a"]}
+        assert row["id"] == "b" and row["score"] == 0.03
+
+
+class TestRecallLinks:
+    @pytest.fixture
+    def links_nm(self, mock_embedding, mock_llm):
+        return NeuroMemory(
+            database_url=_UNREACHABLE_URL, embedding=mock_embedding, llm=mock_llm,
+            link_hops=2, link_fanout=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_recall_splits_linked_rows(self, links_nm, monkeypatch):
+        seen = {}
+
+        async def _vector(*args, **kwargs):
+            seen["link_hops"] = kwargs.get("link_hops")
+            return [
+                {"id": "a", "content": "likes tea", "score": 0.9, "metadata": {}},
+                {"id": "b", "content": "tea farm visit", "score": 0.03, "metadata": {}, "source": "linked", "link_hop": 1},
+            ]
+
+        async def _prepare(query, decay_rate, event_after, event_before):
+            return [0.0], None, None, 1.0, "general", 0.0
+
+        async def _profile(user_id):
+            return {"facts": {}, "traits": [], "recent_mood": None}
+
+        monkeypatch.setattr(links_nm, "_prepare_recall", _prepare)
+        monkeypatch.setattr(links_nm, "_fetch_vector_memories", _vector)
+        monkeypatch.setattr(links_nm, "profile_view", _profile)
+
+        result = await links_nm.recall("alice", "tea")
+        assert seen["link_hops"] == 2
+        assert [r["id"] for r in result["vector_results"]] == ["a"]
+        merged = {m["content"]: m for m in result["merged"]}
+        assert set(merged) == {"likes tea", "tea farm visit"}
+
+    @pytest.mark.asyncio
+    async def test_disabled_skips_walk(self, mock_embedding, mock_llm):
+        nm = NeuroMemory(
+            database_url=_UNREACHABLE_URL, embedding=mock_embedding, llm=mock_llm, link_hops=0,
+        )
+        assert await nm._fetch_linked_memories("alice", [{"id": "a", "content": "x"}]) == []
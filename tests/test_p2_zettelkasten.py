@@ -10,6 +10,7 @@ from sqlalchemy import text
 from neuromem.models.memory import Memory
 from neuromem.providers.llm import LLMProvider
 from neuromem.services.reflection import ReflectionService
+from neuromem.services.search import SearchService
 
 
 class MockZettelLLM(LLMProvider):
@@ -60,22 +61,18 @@ async def test_reflection_creates_memory_links(db_session, mock_embedding):
     await svc.reflect(user_id="u_zett", force=True)
 
     # Check bidirectional links
+    rows = (await db_session.execute(
+        text("SELECT source_id, target_id, relation FROM memory_links WHERE user_id = 'u_zett'"),
+    )).fetchall()
+    links = {(str(r.source_id), str(r.target_id)): r.relation for r in rows}
+    assert links == {(id0, id1): "same_topic", (id1, id0): "same_topic"}
+
+    # Links no longer live in memory metadata
     row0 = (await db_session.execute(
         text("SELECT metadata FROM memories WHERE id = :id"),
         {"id": mems[0].id},
     )).first()
-    row1 = (await db_session.execute(
-        text("SELECT metadata FROM memories WHERE id = :id"),
-        {"id": mems[1].id},
-    )).first()
-
-    assert row0 is not None
-    related0 = row0.metadata.get("related_memories", [])
-    assert any(r["id"] == id1 for r in related0), f"Expected link to {id1} in {related0}"
-
-    assert row1 is not None
-    related1 = row1.metadata.get("related_memories", [])
-    assert any(r["id"] == id0 for r in related1), f"Expected link to {id0} in {related1}"
+    assert "related_memories" not in row0.metadata
 
 
 @pytest.mark.asyncio
@@ -115,20 +112,20 @@ async def test_recall_expands_linked_memories(db_session, mock_embedding):
     await db_session.flush()
 
     # Set up link: A -> B
-    id_b = str(mem_b.id)
     await db_session.execute(
-        text("UPDATE memories SET metadata = jsonb_set(metadata, '{related_memories}', CAST(:links AS jsonb)) WHERE id = :id"),
-        {"id": mem_a.id, "links": json.dumps([{"id": id_b, "relation": "elaborates"}])},
+        text(
+            "INSERT INTO memory_links (source_id, target_id, user_id, relation) "
+            "VALUES (:a, :b, 'u_expand', 'elaborates')"
+        ),
+        {"a": mem_a.id, "b": mem_b.id},
     )
     await db_session.commit()
 
-    # This test needs a full NeuroMemory instance for recall
-    # For now just verify the link data is stored correctly
-    row = (await db_session.execute(
-        text("SELECT metadata FROM memories WHERE id = :id"),
-        {"id": mem_a.id},
-    )).first()
-    assert row is not None
-    related = row.metadata.get("related_memories", [])
-    assert len(related) == 1
-    assert related[0]["id"] == id_b
+    svc = SearchService(db_session, mock_embedding)
+    linked = await svc.linked_memories("u_expand", [str(mem_a.id)])
+    assert [(r["id"], r["source"], r["link_hop"]) for r in linked] == [(str(mem_b.id), "linked", 1)]
+
+    # Folded into the scored search statement
+    results = await svc.scored_search("u_expand", content_a, limit=1, link_hops=1)
+    assert results[0]["id"] == str(mem_a.id)
+    assert results[1:] and results[1]["id"] == str(mem_b.id) and results[1]["source"] == "linked"
@@ -0,0 +1,106 @@
+"""Tests for the multi-pattern substring matcher."""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from neuromem.services import pattern_matcher as pm
+from neuromem.services.pattern_matcher import PatternMatcher, compiled_matcher
+from neuromem.services.sensitive_filter import is_sensitive_trait
+
+
+def _naive(patterns, text, ignore_case=False):
+    if ignore_case:
+        text = text.lower()
+    return {p for p in patterns if p and (p.lower() if ignore_case else p) in text}
+
+
+@pytest.fixture(params=["scan", "automaton"])
+def strategy(request, monkeypatch):
+    """Run each test against both the substring loop and the compiled regex."""
+    monkeypatch.setattr(pm, "_SCAN_THRESHOLD", 10**6 if request.param == "scan" else 1)
+    return request.param
+
+
+class TestPatternMatcher:
+    def test_overlapping_and_prefix_patterns(self, strategy):
+        patterns = ["pull", "pull request", "request", "quest", "st"]
+        found = PatternMatcher(patterns).find("open a pull request today")
+        assert found == {"pull", "pull request", "request", "quest", "st"}
+
+    def test_ignore_case_reports_original_spelling(self, strategy):
+        m = PatternMatcher(["API", "CI", "deploy"], ignore_case=True)
+        assert m.find("the api needs a ci fix") == {"API", "CI"}
+        assert m.search("Deploy now")
+        assert not m.search("nothing here")
+
+    def test_cjk_and_empty(self, strategy):
+        m = PatternMatcher(["代码", "项目", ""])
+        assert len(m) == 2
+        assert m.find("这个项目的代码") == {"代码", "项目"}
+        assert m.find("") == set()
+        assert PatternMatcher([]).find("anything") == set()
+
+    def test_matches_naive_scan(self, strategy):
+        rng = random.Random(7)
+        alphabet = "abcde 中文"
+        for _ in range(200):
+            patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(20)]
+            text = "".join(rng.choice(alphabet + "ABC") for _ in range(rng.randint(0, 40)))
+            for ignore_case in (False, True):
+                m = PatternMatcher(patterns, ignore_case=ignore_case)
+                expected = _naive(patterns, text, ignore_case)
+                assert m.find(text) == expected
+                assert m.search(text) == bool(expected)
+
+    def test_compiled_matcher_is_shared(self):
+        terms = frozenset({"alice", "google"})
+        assert compiled_matcher(terms) is compiled_matcher(terms)
+        assert compiled_matcher(terms) is not compiled_matcher(terms, ignore_case=True)
+
+
+class TestCallSites:
+    def test_sensitive_trait(self):
+        assert is_sensitive_trait("User mentions Depression often")
+        assert is_sensitive_trait("用户提到年薪")
+        assert not is_sensitive_trait("用户喜欢喝茶")
+
+
+def _entity_set():
+    rng = random.Random(0)
+    entities = [f"entity_{i}_{rng.randint(0, 10**6)}" for i in range(2000)]
+    text = f"met {entities[17]} and {entities[1999]} at the office " * 3
+    return entities, text
+
+
+class TestLargeSet:
+    def test_large_set_matches_substring_loop(self):
+        entities, text = _entity_set()
+        found = PatternMatcher(entities).find(text)
+        assert found == {e for e in entities if e in text} == {entities[17], entities[1999]}
+
+
+@pytest.mark.benchmark
+class TestPerformance:
+    """Microbenchmark: entity-sized pattern sets against the per-pattern loop."""
+
+    def test_large_set_faster_than_substring_loop(self):
+        entities, text = _entity_set()
+        matcher = PatternMatcher(entities)
+        iterations = 200
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            found = matcher.find(text)
+        compiled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            expected = {e for e in entities if e in text}
+        naive = time.perf_counter() - start
+
+        assert found == expected == {entities[17], entities[1999]}
+        assert compiled * 3 < naive, f"matcher {compiled:.4f}s vs loop {naive:.4f}s"
@@ -0,0 +1,170 @@
+"""Tests for the local embedding provider: worker-thread batching and the shared model registry."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+from neuromem.providers import sentence_transformer
+from neuromem.providers.sentence_transformer import (
+    SentenceTransformerEmbedding,
+    get_model,
+    loaded_models,
+)
+
+
+class _FakeModel:
+    """Stands in for a SentenceTransformer: blocking encode() of `delay` seconds."""
+
+    delay = 0.0
+    fail = False
+    loads: list[tuple[str, dict]] = []
+
+    def __init__(self, name, **kwargs):
+        time.sleep(self.delay)  # loading weights
+        _FakeModel.loads.append((name, kwargs))
+        self.name = name
+        self.calls: list[list[str]] = []
+        self.threads: set[str] = set()
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)  # a forward pass holds the calling thread
+        if self.fail:
+            raise RuntimeError("out of memory")
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def fake_st(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = _FakeModel
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setattr(_FakeModel, "delay", 0.0)
+    monkeypatch.setattr(_FakeModel, "fail", False)
+    monkeypatch.setattr(_FakeModel, "loads", [])
+    monkeypatch.setattr(sentence_transformer, "_models", {})
+    monkeypatch.setattr(sentence_transformer, "_load_locks", {})
+    return _FakeModel
+
+
+class TestSentenceTransformerEmbedding:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self, fake_st):
+        embedding = SentenceTransformerEmbedding(max_wait_ms=5)
+        single, batch = await asyncio.gather(
+            embedding.embed("a"),
+            embedding.embed_batch(["bb", "ccc"]),
+        )
+        assert embedding._get_model().calls == [["a", "bb", "ccc"]]
+        assert single == [1.0, 1.0, 0.5]
+        assert [v[0] for v in batch] == [2.0, 3.0]
+        assert all(name.startswith("neuromem-embedding") for name in embedding._get_model().threads)
+        await embedding.aclose()
+
+    @pytest.mark.asyncio
+    async def test_requests_arriving_while_busy_are_batched(self, fake_st):
+        fake_st.delay = 0.05
+        embedding = SentenceTransformerEmbedding(max_batch_size=4, max_wait_ms=0)
+        first = asyncio.ensure_future(embedding.embed("first"))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(first, *(embedding.embed(str(i)) for i in range(6)))
+        assert embedding._get_model().calls == [["first"], ["0", "1", "2", "3"], ["4", "5"]]
+        await embedding.aclose()
+
+    @pytest.mark.asyncio
+    async def test_embed_array_is_float16(self, fake_st):
+        embedding = SentenceTransformerEmbedding()
+        array = await embedding.embed_array(["a", "bb"])
+        assert array.dtype == np.float16 and array.shape == (2, 3)
+        assert (await embedding.embed_array([])).shape == (0, 3)
+        assert await embedding.embed_batch([]) == []
+        await embedding.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self, fake_st):
+        fake_st.fail = True
+        embedding = SentenceTransformerEmbedding(max_wait_ms=5)
+        results = await asyncio.gather(
+            embedding.embed("a"), embedding.embed_batch(["b"]), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        await embedding.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_then_reuse(self, fake_st):
+        embedding = SentenceTransformerEmbedding()
+        await embedding.embed("a")
+        await embedding.aclose()
+        assert embedding._executor is None
+        assert (await embedding.embed("bb"))[0] == 2.0
+        await embedding.aclose()
+
+    def test_new_event_loop(self, fake_st):
+        embedding = SentenceTransformerEmbedding()
+        assert asyncio.run(embedding.embed("a"))[0] == 1.0
+        assert asyncio.run(embedding.embed("bb"))[0] == 2.0
+
+
+class TestModelRegistry:
+    @pytest.mark.asyncio
+    async def test_instances_share_one_model(self, fake_st):
+        first = SentenceTransformerEmbedding(model="m")
+        second = SentenceTransformerEmbedding(model="m")
+        other = SentenceTransformerEmbedding(model="n")
+        await asyncio.gather(first.embed("a"), second.embed("b"), other.embed("c"))
+        assert first._get_model() is second._get_model() is not other._get_model()
+        assert sorted(name for name, _ in fake_st.loads) == ["m", "n"]
+        assert sorted(loaded_models()) == ["m", "n"]
+
+    @pytest.mark.asyncio
+    async def test_loaded_lazily_and_warmup_off_loop(self, fake_st):
+        embedding = SentenceTransformerEmbedding(model="m", dims=3)
+        assert embedding.dims == 3 and fake_st.loads == []
+        await embedding.warmup()
+        assert loaded_models() == ["m"]
+        threads = embedding._get_model().threads
+        assert threads and all(name.startswith("neuromem-embedding") for name in threads)
+        await embedding.aclose()
+
+    def test_dims_loads_model_without_hint(self, fake_st):
+        assert SentenceTransformerEmbedding(model="m").dims == 3
+        assert loaded_models() == ["m"]
+
+    def test_concurrent_first_use_loads_once(self, fake_st):
+        fake_st.delay = 0.02
+        threads = [threading.Thread(target=get_model, args=("m",)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(fake_st.loads) == 1
+
+    def test_mmap(self, fake_st):
+        get_model("m", mmap=True)
+        assert fake_st.loads == [
+            ("m", {"model_kwargs": {"low_cpu_mem_usage": True, "use_safetensors": True}}),
+        ]
+
+
+class TestOffEventLoop:
+    @pytest.mark.asyncio
+    async def test_encode_runs_on_worker_thread(self, fake_st):
+        embedding = SentenceTransformerEmbedding(max_wait_ms=0)
+        await asyncio.gather(*(embedding.embed(str(i)) for i in range(3)))
+        await embedding.embed_array(["x"])
+        await embedding.aclose()
+
+        threads = embedding._get_model().threads
+        assert threads and all(name.startswith("neuromem-embedding") for name in threads)
+        assert threading.current_thread().name not in threads
@@ -0,0 +1,149 @@
+"""Tests for typed ranking-signal columns (event_time/importance/arousal/valence/temporality)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from neuromem.db import SIGNAL_BACKFILL_SQLS
+from neuromem.models.memory import signal_columns
+from neuromem.services.search import SearchService
+
+_ZERO_VEC = "[" + ",".join(["0"] * 1024) + "]"
+
+
+# ---------------------------------------------------------------------------
+# Unit tests: metadata -> column values
+# ---------------------------------------------------------------------------
+
+
+class TestSignalColumns:
+    def test_full_metadata(self):
+        cols = signal_columns({
+            "importance": 8,
+            "event_time": "2025-03-01",
+            "temporality": "prospective",
+            "emotion": {"valence": -0.4, "arousal": 0.7, "label": "anxious"},
+        })
+        assert cols["importance"] == pytest.approx(0.8)
+        assert cols["event_time"] == datetime(2025, 3, 1, tzinfo=timezone.utc)
+        assert cols["temporality"] == "prospective"
+        assert cols["valence"] == pytest.approx(-0.4)
+        assert cols["arousal"] == pytest.approx(0.7)
+
+    def test_defaults_when_missing(self):
+        cols = signal_columns(None)
+        assert cols == {
+            "importance": 0.5,
+            "event_time": None,
+            "arousal": None,
+            "valence": None,
+            "temporality": None,
+        }
+
+    def test_string_numbers_and_offsets(self):
+        cols = signal_columns({
+            "importance": "6",
+            "event_time": "2025-03-01T10:00:00+08:00",
+            "emotion": {"arousal": "0.5"},
+        })
+        assert cols["importance"] == pytest.approx(0.6)
+        assert cols["event_time"].utcoffset().total_seconds() == 8 * 3600
+        assert cols["arousal"] == pytest.approx(0.5)
+
+    def test_malformed_values_become_none(self):
+        cols = signal_columns({
+            "importance": "high",
+            "event_time": "next week",
+            "emotion": "happy",
+        })
+        assert cols["importance"] == 0.5
+        assert cols["event_time"] is None
+        assert cols["arousal"] is None
+        assert cols["valence"] is None
+
+
+# ---------------------------------------------------------------------------
+# Integration: writes, backfill, scoring
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_add_memory_populates_columns(db_session, mock_embedding):
+    svc = SearchService(db_session, mock_embedding)
+    record = await svc.add_memory(
+        user_id="sig_u1", content="conference next month",
+        metadata={"importance": 9, "temporality": "prospective", "event_time": "2025-01-01",
+                  "emotion": {"valence": 0.5, "arousal": 0.6}},
+    )
+    await db_session.commit()
+
+    row = (await db_session.execute(
+        text("SELECT importance, event_time, arousal, valence, temporality FROM memories WHERE id = :id"),
+        {"id": str(record.id)},
+    )).fetchone()
+    assert row.importance == pytest.approx(0.9)
+    assert row.event_time is not None
+    assert row.arousal == pytest.approx(0.6)
+    assert row.valence == pytest.approx(0.5)
+    assert row.temporality == "prospective"
+
+
+@pytest.mark.asyncio
+async def test_backfill_from_metadata(db_session):
+    meta = ('{"importance": 7, "event_time": "2025-06-01", "temporality": "current", '
+            '"emotion": {"valence": -0.2, "arousal": 0.4}}')
+    await db_session.execute(
+        text("INSERT INTO memories (id, user_id, content, memory_type, metadata, embedding) "
+             "VALUES (gen_random_uuid(), 'sig_bf', 'legacy row', 'fact', "
+             "CAST(:meta AS jsonb), CAST(:vec AS halfvec))"),
+        {"meta": meta, "vec": _ZERO_VEC},
+    )
+    await db_session.execute(
+        text("INSERT INTO memories (id, user_id, content, memory_type, metadata, embedding) "
+             "VALUES (gen_random_uuid(), 'sig_bf', 'malformed row', 'fact', "
+             "CAST(:meta AS jsonb), CAST(:vec AS halfvec))"),
+        {"meta": '{"importance": "high", "emotion": {"arousal": "n/a"}}', "vec": _ZERO_VEC},
+    )
+    await db_session.flush()
+
+    for sql in SIGNAL_BACKFILL_SQLS:
+        await db_session.execute(text(sql))
+
+    rows = {
+        r.content: r for r in (await db_session.execute(text(
+            "SELECT content, importance, event_time, arousal, valence, temporality "
+            "FROM memories WHERE user_id = 'sig_bf'"
+        ))).fetchall()
+    }
+    legacy = rows["legacy row"]
+    assert legacy.importance == pytest.approx(0.7)
+    assert legacy.event_time is not None
+    assert legacy.arousal == pytest.approx(0.4)
+    assert legacy.valence == pytest.approx(-0.2)
+    assert legacy.temporality == "current"
+
+    malformed = rows["malformed row"]
+    assert malformed.importance == pytest.approx(0.5)
+    assert malformed.arousal is None
+
+    # A second init finds nothing out of sync (no full-table rewrite per startup)
+    for sql in SIGNAL_BACKFILL_SQLS:
+        assert (await db_session.execute(text(sql))).rowcount == 0
+
+
+@pytest.mark.asyncio
+async def test_scoring_reads_importance_column(db_session, mock_embedding):
+    """Scoring follows the typed column, not the raw metadata."""
+    svc = SearchService(db_session, mock_embedding)
+    low = await svc.add_memory(user_id="sig_u2", content="likes tea", metadata={"importance": 9})
+    await db_session.commit()
+    await db_session.execute(
+        text("UPDATE memories SET importance = 0.1 WHERE id = :id"), {"id": str(low.id)},
+    )
+    await db_session.commit()
+
+    results = await svc.scored_search(user_id="sig_u2", query="likes tea")
+    assert results[0]["importance"] == pytest.approx(0.015, abs=1e-4)
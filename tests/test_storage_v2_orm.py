@@ -424,8 +424,12 @@ async def test_memory_source_composite_pk_unique(db_session):
 
 @pytest.mark.asyncio
 async def test_all_auxiliary_tables_created(db_session):
-    """TC-O13: trait_evidence, memory_history, reflection_cycles, memory_sources all exist."""
-    tables = ["trait_evidence", "memory_history", "reflection_cycles", "memory_sources"]
+    """TC-O13: trait_evidence, memory_history, reflection_cycles, memory_sources, memory_links,
+    embedding_cache all exist."""
+    tables = [
+        "trait_evidence", "memory_history", "reflection_cycles", "memory_sources", "memory_links",
+        "embedding_cache",
+    ]
     for table_name in tables:
         result = await db_session.execute(
             text("SELECT to_regclass(:t) IS NOT NULL"),